@@ -0,0 +1,83 @@
+# algorithms/batch.py
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+from navigation_system.models.routing_graph import RoutingGraph
+from navigation_system.models.csr_graph import CSRGraph
+from navigation_system.algorithms.pathfinding import shortest_path_tree, tree_path
+
+
+def normalize_pairs(pairs: Iterable) -> List[Tuple]:
+    """
+    Accept [start, end] lists or {'start': ..., 'end': ...} dicts and return (start, end) tuples.
+
+    Raises:
+        ValueError: if a pair is neither, or its start or end is missing or not a node id
+    """
+    normalized = []
+    for i, pair in enumerate(pairs):
+        if isinstance(pair, dict):
+            start_id, end_id = pair.get('start'), pair.get('end')
+        elif isinstance(pair, (list, tuple)) and len(pair) == 2:
+            start_id, end_id = pair
+        else:
+            raise ValueError(f"Pair {i} is not a [start, end] list or a {{start, end}} object")
+        if start_id is None or end_id is None:
+            raise ValueError(f"Pair {i} is missing its start or end")
+        if not isinstance(start_id, (str, int)) or not isinstance(end_id, (str, int)):
+            raise ValueError(f"Pair {i} has a start or end that is not a node id")
+        normalized.append((start_id, end_id))
+    return normalized
+
+
+def group_by_origin(pairs: Sequence[Tuple]) -> Dict:
+    """Map each origin to the (index, destination) pairs that start there, in first-seen order"""
+    groups = {}
+    for i, (start_id, end_id) in enumerate(pairs):
+        groups.setdefault(start_id, []).append((i, end_id))
+    return groups
+
+
+def route_batch(
+    graph: Union[RoutingGraph, CSRGraph],
+    pairs: Iterable,
+    prefer_hallways: bool = True,
+    has_keycard: bool = False
+) -> Iterator[Dict]:
+    """
+    Route many origin/destination pairs against one graph snapshot.
+
+    Pairs sharing an origin are answered by a single one-to-many Dijkstra that stops
+    once all of that origin's destinations are settled. Results are yielded one at a
+    time (grouped by origin), each tagged with the index of its pair in the input.
+
+    Yields:
+        Dicts with index, start, end, success and either path/distance/non_hallway or error
+    """
+    csr = graph if isinstance(graph, CSRGraph) else graph.csr
+    pairs = normalize_pairs(pairs)
+
+    for start_id, destinations in group_by_origin(pairs).items():
+        if start_id not in csr:
+            for i, end_id in destinations:
+                yield {'index': i, 'start': start_id, 'end': end_id, 'success': False,
+                       'error': 'Invalid start or end node'}
+            continue
+
+        start = csr.index[start_id]
+        targets = {csr.index[end_id] for _, end_id in destinations if end_id in csr}
+        if targets:
+            non_hallway, distance, parent, _ = shortest_path_tree(
+                csr, start, prefer_hallways, has_keycard, targets=targets)
+
+        for i, end_id in destinations:
+            result = {'index': i, 'start': start_id, 'end': end_id}
+            if end_id not in csr:
+                result.update(success=False, error='Invalid start or end node')
+            else:
+                path = tree_path(parent, start, csr.index[end_id])
+                if path:
+                    end = csr.index[end_id]
+                    result.update(success=True, path=[csr.ids[j] for j in path],
+                                  distance=distance[end], non_hallway=non_hallway[end])
+                else:
+                    result.update(success=False, error='No path found')
+            yield result
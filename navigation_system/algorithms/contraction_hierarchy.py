@@ -0,0 +1,328 @@
+# algorithms/contraction_hierarchy.py
+import heapq
+import json
+import struct
+import sys
+from array import array
+from typing import Dict, List, Optional, Tuple
+from navigation_system.models.csr_graph import CSRGraph, HALLWAY, KEYCARD, id_type
+from navigation_system.algorithms.route_table import Profile
+
+MAGIC = b"NAVCHRC1"
+
+# Access profiles built by default: public and keycard, both preferring hallways as a_star does
+CH_PROFILES: List[Profile] = [(True, False), (True, True)]
+
+# Nodes a witness search may settle before giving up and keeping the shortcut
+WITNESS_SETTLE_LIMIT = 60
+
+# (non_hallway_count, distance), compared lexicographically like a_star's costs
+Cost = Tuple[int, float]
+
+
+def _profile_edges(graph: CSRGraph, profile: Profile) -> List[Dict[int, Tuple[int, float, int]]]:
+    """{neighbor: (non_hallway, distance, middle)} per node, cheapest edge per pair, middle -1"""
+    prefer_hallways, has_keycard = profile
+    skip = 0 if has_keycard else KEYCARD
+    edges = [{} for _ in range(len(graph))]
+    for i in range(len(graph)):
+        for k in range(graph.offsets[i], graph.offsets[i + 1]):
+            flag, j = graph.flags[k], graph.targets[k]
+            if flag & skip or j == i:
+                continue
+            cost = (1 if prefer_hallways and not flag & HALLWAY else 0, graph.weights[k], -1)
+            if j not in edges[i] or cost[:2] < edges[i][j][:2]:
+                edges[i][j] = cost
+    return edges
+
+
+class ProfileHierarchy:
+    """
+    Contraction hierarchy of one access profile.
+
+    `rank[i]` is node i's contraction order. The upward graph is stored in CSR form:
+    the edges of node i lead to higher-ranked nodes, each with its
+    (non_hallway_count, distance) cost and the node it shortcuts over (-1 for an
+    original edge). Edges are undirected, so one upward graph serves both
+    directions of a query.
+    """
+
+    FIELDS = (('rank', 'i'), ('offsets', 'q'), ('targets', 'i'), ('non_hallway', 'i'),
+              ('distance', 'd'), ('middle', 'i'))
+
+    def __init__(self, rank: array, offsets: array, targets: array, non_hallway: array,
+                 distance: array, middle: array):
+        self.rank = rank
+        self.offsets = offsets
+        self.targets = targets
+        self.non_hallway = non_hallway
+        self.distance = distance
+        self.middle = middle
+
+    @classmethod
+    def build(cls, graph: CSRGraph, profile: Profile) -> "ProfileHierarchy":
+        """
+        Contract every node of graph, least important first.
+
+        Importance is the edge difference (shortcuts a contraction would add minus the
+        edges it removes) plus the number of already contracted neighbours, kept up to
+        date lazily. Contracting v adds a shortcut u-w for a pair of its neighbours
+        unless a witness search finds a route u-w avoiding v that is no more expensive.
+        """
+        n = len(graph)
+        edges = _profile_edges(graph, profile)
+        contracted = bytearray(n)
+        deleted_neighbors = [0] * n
+        rank = array('i', [0]) * n
+        upward: List[List[Tuple[int, int, float, int]]] = [[] for _ in range(n)]
+
+        def witness_costs(source: int, avoid: int, limit: Cost) -> Dict[int, Cost]:
+            best = {source: (0, 0.0)}
+            heap = [(0, 0.0, source)]
+            settled = 0
+            while heap and settled < WITNESS_SETTLE_LIMIT:
+                non_hallway, distance, current = heapq.heappop(heap)
+                if (non_hallway, distance) > best[current]:
+                    continue
+                if (non_hallway, distance) > limit:
+                    break
+                settled += 1
+                for neighbor, (edge_non_hallway, edge_distance, _) in edges[current].items():
+                    if neighbor == avoid:
+                        continue
+                    cost = (non_hallway + edge_non_hallway, distance + edge_distance)
+                    if neighbor not in best or cost < best[neighbor]:
+                        best[neighbor] = cost
+                        heapq.heappush(heap, (cost[0], cost[1], neighbor))
+            return best
+
+        def shortcuts(v: int) -> List[Tuple[int, int, int, float]]:
+            """(u, w, non_hallway, distance) shortcuts needed to contract v"""
+            neighbors = list(edges[v].items())
+            needed = []
+            for a, (u, (u_non_hallway, u_distance, _)) in enumerate(neighbors):
+                limit = max(((u_non_hallway + w_non_hallway, u_distance + w_distance)
+                             for w, (w_non_hallway, w_distance, _) in neighbors[a + 1:]), default=None)
+                if limit is None:
+                    break
+                witnesses = witness_costs(u, v, limit)
+                for w, (w_non_hallway, w_distance, _) in neighbors[a + 1:]:
+                    via = (u_non_hallway + w_non_hallway, u_distance + w_distance)
+                    witness = witnesses.get(w)
+                    if witness is None or witness > via:
+                        needed.append((u, w, via[0], via[1]))
+            return needed
+
+        queue = [(len(shortcuts(v)) - len(edges[v]), v) for v in range(n)]
+        heapq.heapify(queue)
+        order = 0
+        while queue:
+            _, v = heapq.heappop(queue)
+            if contracted[v]:
+                continue
+            # Lazy update: re-queue v if its importance grew past the next candidate's
+            needed = shortcuts(v)
+            importance = len(needed) - len(edges[v]) + deleted_neighbors[v]
+            if queue and importance > queue[0][0]:
+                heapq.heappush(queue, (importance, v))
+                continue
+
+            for u, w, non_hallway, distance in needed:
+                known = edges[u].get(w)
+                if known is None or (non_hallway, distance) < known[:2]:
+                    edges[u][w] = (non_hallway, distance, v)
+                    edges[w][u] = (non_hallway, distance, v)
+            for u, (non_hallway, distance, middle) in edges[v].items():
+                upward[v].append((u, non_hallway, distance, middle))
+                del edges[u][v]
+                deleted_neighbors[u] += 1
+            edges[v] = {}
+            contracted[v] = 1
+            rank[v] = order
+            order += 1
+
+        offsets, targets = array('q', [0]), array('i')
+        non_hallway, distance, middle = array('i'), array('d'), array('i')
+        for v in range(n):
+            for u, edge_non_hallway, edge_distance, edge_middle in upward[v]:
+                targets.append(u)
+                non_hallway.append(edge_non_hallway)
+                distance.append(edge_distance)
+                middle.append(edge_middle)
+            offsets.append(len(targets))
+        return cls(rank, offsets, targets, non_hallway, distance, middle)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def query(self, start: int, goal: int) -> Optional[Tuple[Cost, List[int]]]:
+        """
+        Cheapest route between two node indices.
+
+        Runs the upward search from both ends, interleaved, stopping a side once its
+        smallest queued cost can no longer beat the best meeting node; the route over
+        the meeting node is then unpacked shortcut by shortcut.
+
+        Returns:
+            ((non_hallway_count, distance), node indices), or None if unreachable
+        """
+        if start == goal:
+            return (0, 0.0), [start]
+        offsets, targets, non_hallway, distance = self.offsets, self.targets, self.non_hallway, self.distance
+        best = ({start: (0, 0.0, -1)}, {goal: (0, 0.0, -1)})
+        settled = ({}, {})
+        heaps = ([(0, 0.0, start)], [(0, 0.0, goal)])
+        meeting, meeting_cost = -1, None
+
+        side = 0
+        while heaps[0] or heaps[1]:
+            if not heaps[side] or (heaps[1 - side] and heaps[1 - side][0][:2] < heaps[side][0][:2]):
+                side = 1 - side
+            heap = heaps[side]
+            current_non_hallway, current_distance, current = heapq.heappop(heap)
+            if meeting_cost is not None and (current_non_hallway, current_distance) >= meeting_cost:
+                heap.clear()  # nothing left on this side can improve the route
+                continue
+            if current in settled[side]:
+                continue
+            settled[side][current] = best[side][current]
+            other = best[1 - side].get(current)
+            if other is not None:
+                cost = (current_non_hallway + other[0], current_distance + other[1])
+                if meeting_cost is None or cost < meeting_cost:
+                    meeting, meeting_cost = current, cost
+            for k in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[k]
+                cost = (current_non_hallway + non_hallway[k], current_distance + distance[k])
+                known = best[side].get(neighbor)
+                if known is None or cost < known[:2]:
+                    best[side][neighbor] = (cost[0], cost[1], current)
+                    heapq.heappush(heap, (cost[0], cost[1], neighbor))
+
+        if meeting_cost is None:
+            return None
+        halves = []
+        for side in (0, 1):
+            chain = [meeting]
+            while best[side][chain[-1]][2] != -1:
+                chain.append(best[side][chain[-1]][2])
+            halves.append(chain)
+        chain = halves[0][::-1] + halves[1][1:]  # start ... meeting ... goal, over upward edges
+        route = [start]
+        for a, b in zip(chain, chain[1:]):
+            self._unpack(a, b, route)
+        return meeting_cost, route
+
+    def _edge_middle(self, a: int, b: int) -> int:
+        low, high = (a, b) if self.rank[a] < self.rank[b] else (b, a)
+        targets = self.targets
+        for k in range(self.offsets[low], self.offsets[low + 1]):
+            if targets[k] == high:
+                return self.middle[k]
+        raise KeyError((a, b))
+
+    def _unpack(self, a: int, b: int, route: List[int]) -> None:
+        """Append the original nodes after a on the (shortcut) edge a-b, ending with b"""
+        stack = [(a, b)]
+        while stack:
+            a, b = stack.pop()
+            middle = self._edge_middle(a, b)
+            if middle == -1:
+                route.append(b)
+            else:
+                stack.append((middle, b))
+                stack.append((a, middle))
+
+
+class ContractionHierarchy:
+    """
+    Contraction hierarchies of a routing graph, one per access profile.
+
+    Preprocessing orders the nodes by importance and adds shortcut edges so that a
+    cheapest route always climbs to its most important node and descends again;
+    a point-to-point query is then two small upward searches instead of an A* over
+    the building. Costs are a_star's (non_hallway_count, distance), so routes cost
+    what a_star finds. Like RouteTable, it is built offline (tools/
+    build_contraction_hierarchy.py) for one graph version and ignored once the graph
+    changes, or if its node ids are of another type than the graph's.
+    """
+
+    def __init__(self, ids: List, profiles: Dict[Profile, ProfileHierarchy], version: Optional[str] = None):
+        self.ids = ids
+        self.id_type = id_type(ids)
+        self.index = {node_id: i for i, node_id in enumerate(ids)}
+        self.profiles = profiles
+        self.version = version
+
+    @classmethod
+    def build(cls, graph: CSRGraph, profiles: Optional[List[Profile]] = None) -> "ContractionHierarchy":
+        """Contract graph once per (prefer_hallways, has_keycard) profile (public and keycard by default)"""
+        return cls(list(graph.ids), {profile: ProfileHierarchy.build(graph, profile)
+                                     for profile in (profiles or CH_PROFILES)}, version=graph.version)
+
+    def matches(self, graph: CSRGraph) -> bool:
+        """Check whether the hierarchies were built for this graph: same version and same id type"""
+        return self.version == graph.version and self.id_type == graph.id_type
+
+    def covers(self, prefer_hallways: bool = True, has_keycard: bool = False) -> bool:
+        return (bool(prefer_hallways), bool(has_keycard)) in self.profiles
+
+    def lookup(self, start_id, end_id, prefer_hallways: bool = True,
+               has_keycard: bool = False) -> Optional[List]:
+        """
+        Route between two nodes.
+
+        Returns:
+            The path as a list of node ids, [] if the end is unreachable, or None if
+            a node or the profile is not covered
+        """
+        if start_id not in self.index or end_id not in self.index or not self.covers(prefer_hallways, has_keycard):
+            return None
+        found = self.profiles[(bool(prefer_hallways), bool(has_keycard))].query(self.index[start_id],
+                                                                               self.index[end_id])
+        if found is None:
+            return []
+        return [self.ids[i] for i in found[1]]
+
+    def save(self, filename: str) -> None:
+        """Write the hierarchies to disk: magic, JSON header, then each profile's arrays"""
+        header = json.dumps({
+            'version': self.version,
+            'id_type': self.id_type,
+            'ids': self.ids,
+            'profiles': [[list(profile), {name: len(getattr(hierarchy, name)) for name, _ in ProfileHierarchy.FIELDS}]
+                         for profile, hierarchy in self.profiles.items()],
+            'byteorder': sys.byteorder,
+        }).encode()
+        with open(filename, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<I', len(header)))
+            f.write(header)
+            for hierarchy in self.profiles.values():
+                for name, _ in ProfileHierarchy.FIELDS:
+                    getattr(hierarchy, name).tofile(f)
+
+    @classmethod
+    def load(cls, filename: str) -> "ContractionHierarchy":
+        """Read hierarchies written by save()"""
+        with open(filename, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{filename} is not a contraction hierarchy file")
+            header_length, = struct.unpack('<I', f.read(4))
+            header = json.loads(f.read(header_length))
+            ids = header['ids']
+            if header.get('id_type', id_type(ids)) != id_type(ids):
+                raise ValueError(f"{filename} has {id_type(ids)} node ids but its header says {header['id_type']}")
+
+            profiles = {}
+            for profile, lengths in header['profiles']:
+                arrays = {}
+                for name, code in ProfileHierarchy.FIELDS:
+                    values = array(code)
+                    values.fromfile(f, lengths[name])
+                    if header['byteorder'] != sys.byteorder:
+                        values.byteswap()
+                    arrays[name] = values
+                profiles[tuple(profile)] = ProfileHierarchy(**arrays)
+        return cls(ids, profiles, version=header['version'])
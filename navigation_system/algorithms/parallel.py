@@ -0,0 +1,203 @@
+# algorithms/parallel.py
+import multiprocessing
+import os
+from array import array
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from navigation_system.models.csr_graph import CSRGraph, array_layout
+from navigation_system.algorithms.pathfinding import shortest_path_tree
+from navigation_system.algorithms.batch import normalize_pairs, group_by_origin, route_batch
+from navigation_system.algorithms.route_table import RouteTable, Profile, PROFILES, next_hop_column
+
+# Graph attached by each worker process in _init_worker
+_worker_graph: Optional[CSRGraph] = None
+_worker_memory = None
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing block; the owning process stays responsible for unlinking it"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13, workers share the owner's resource tracker
+        return shared_memory.SharedMemory(name=name)
+
+
+class SharedCSRGraph:
+    """
+    Copy of a CSRGraph's numeric arrays in one shared memory block.
+
+    Workers attach to the block by name and view the arrays in place, so the graph is
+    shipped once per pool instead of being pickled with every task. Only the owner
+    unlinks the block, in close().
+    """
+
+    def __init__(self, graph: CSRGraph):
+        layout, size = array_layout(graph)
+        self.memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for field, (typecode, offset, length) in layout.items():
+            data = array(typecode, getattr(graph, field)).tobytes()
+            self.memory.buf[offset:offset + len(data)] = data
+
+        self.meta = {
+            'name': self.memory.name,
+            'layout': layout,
+            'ids': graph.ids,
+            'types': graph.types,
+            'version': graph.version,
+        }
+
+    def close(self) -> None:
+        self.memory.close()
+        self.memory.unlink()
+
+    @staticmethod
+    def view(meta: Dict, memory: shared_memory.SharedMemory) -> CSRGraph:
+        """Build a CSRGraph whose arrays are zero-copy views into the shared block"""
+        return CSRGraph.from_buffer(memory.buf, meta['layout'], meta['ids'], meta['types'], meta['version'])
+
+
+def _init_worker(meta: Dict) -> None:
+    global _worker_graph, _worker_memory
+    _worker_memory = _attach(meta['name'])
+    _worker_graph = SharedCSRGraph.view(meta, _worker_memory)
+
+
+def _distance_rows(task: Tuple[List, List, bool, bool]) -> List[List[float]]:
+    origin_ids, destination_ids, prefer_hallways, has_keycard = task
+    graph = _worker_graph
+    destinations = [graph.index[node_id] for node_id in destination_ids]
+    rows = []
+    for origin_id in origin_ids:
+        _, distance, _, _ = shortest_path_tree(graph, graph.index[origin_id], prefer_hallways, has_keycard,
+                                               targets=set(destinations))
+        rows.append([distance[j] for j in destinations])
+    return rows
+
+
+def _route_rows(task: Tuple[List, bool, bool]) -> List[Dict]:
+    pairs, prefer_hallways, has_keycard = task
+    return list(route_batch(_worker_graph, pairs, prefer_hallways, has_keycard))
+
+
+def _next_hop_columns(task: Tuple[List[int], Profile]) -> bytes:
+    targets, profile = task
+    table = array('i')
+    for target in targets:
+        table.extend(next_hop_column(_worker_graph, target, profile))
+    return table.tobytes()
+
+
+def _chunks(items: Sequence, count: int) -> List[Sequence]:
+    """Split items into at most count contiguous, order-preserving chunks"""
+    if not items:
+        return []
+    count = max(1, min(count, len(items)))
+    size = -(-len(items) // count)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+class RouteWorkerPool:
+    """
+    Process pool for CPU-bound routing jobs over a shared, read-only graph.
+
+    Work is sharded by origin (or destination for route tables) into contiguous
+    chunks and results are reassembled in input order, so the output does not
+    depend on the number of processes.
+
+    Usage:
+        with RouteWorkerPool(routing_graph.csr, processes=4) as pool:
+            matrix = pool.distance_matrix(rooms, rooms)
+    """
+
+    def __init__(self, graph: CSRGraph, processes: Optional[int] = None):
+        self.graph = graph
+        self.processes = processes or os.cpu_count() or 1
+        self._shared = None
+        self._pool = None
+        if self.processes > 1:
+            self._shared = SharedCSRGraph(graph)
+            self._pool = multiprocessing.Pool(self.processes, initializer=_init_worker,
+                                              initargs=(self._shared.meta,))
+
+    def __enter__(self) -> "RouteWorkerPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        if self._shared is not None:
+            self._shared.close()
+            self._shared = None
+
+    def _map(self, fn, tasks: List) -> List:
+        if self._pool is None:
+            global _worker_graph
+            previous, _worker_graph = _worker_graph, self.graph
+            try:
+                return [fn(task) for task in tasks]
+            finally:
+                _worker_graph = previous
+        return self._pool.map(fn, tasks)
+
+    def distance_matrix(self, origin_ids: Sequence, destination_ids: Sequence,
+                        prefer_hallways: bool = True, has_keycard: bool = False) -> List[List[float]]:
+        """
+        Shortest path distances from every origin to every destination.
+
+        Distances are along the route a_star would pick for the profile (so with
+        prefer_hallways they are not necessarily the shortest possible walk).
+        Unreachable pairs are infinite.
+        """
+        origin_ids = list(origin_ids)
+        destination_ids = list(destination_ids)
+        missing = [node_id for node_id in origin_ids + destination_ids if node_id not in self.graph]
+        if missing:
+            raise KeyError(f"Nodes not in graph: {missing[:5]}")
+
+        tasks = [(chunk, destination_ids, prefer_hallways, has_keycard)
+                 for chunk in _chunks(origin_ids, self.processes * 4)]
+        return [row for rows in self._map(_distance_rows, tasks) for row in rows]
+
+    def route_batch(self, pairs: Iterable, prefer_hallways: bool = True,
+                    has_keycard: bool = False) -> List[Dict]:
+        """Route many pairs, sharding origins across workers; results are in input order"""
+        pairs = normalize_pairs(pairs)
+        origin_groups = list(group_by_origin(pairs).items())
+
+        tasks = []
+        for chunk in _chunks(origin_groups, self.processes * 4):
+            chunk_pairs = [(start_id, end_id) for start_id, destinations in chunk for _, end_id in destinations]
+            indices = [i for _, destinations in chunk for i, _ in destinations]
+            tasks.append((indices, (chunk_pairs, prefer_hallways, has_keycard)))
+
+        results = [None] * len(pairs)
+        shard_results = self._map(_route_rows, [task for _, task in tasks])
+        for (indices, _), rows in zip(tasks, shard_results):
+            for row in rows:
+                row['index'] = indices[row['index']]
+                results[row['index']] = row
+        return results
+
+    def build_route_table(self, target_ids: Optional[Iterable] = None,
+                          profiles: Optional[List[Profile]] = None) -> RouteTable:
+        """Parallel equivalent of RouteTable.build, sharding destinations across workers"""
+        graph = self.graph
+        profiles = list(profiles or PROFILES)
+        if target_ids is None:
+            targets = list(range(len(graph)))
+        else:
+            targets = [graph.index[node_id] for node_id in target_ids if node_id in graph]
+
+        next_hops = {}
+        for profile in profiles:
+            tasks = [(list(chunk), profile) for chunk in _chunks(targets, self.processes * 4)]
+            table = array('i')
+            for data in self._map(_next_hop_columns, tasks):
+                table.frombytes(data)
+            next_hops[profile] = table
+        return RouteTable(list(graph.ids), targets, profiles, next_hops, version=graph.version)
@@ -1,165 +1,637 @@
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 import heapq
-from navigation_system.models.node import NavigationGraph, Node
+import threading
+import time
+from array import array
+from navigation_system.models.node import NavigationGraph, Node, MIN_FLOOR_CHANGE_COST
+from navigation_system.models.routing_graph import RoutingGraph
+from navigation_system.models.csr_graph import CSRGraph, HALLWAY, KEYCARD
+from navigation_system.models.floor_partitions import FloorPartitions
+from navigation_system.models.cluster_hierarchy import ClusterHierarchy
+from navigation_system.models.landmarks import LandmarkTable, Landmarks
 
 def heuristic(node: Node, goal: Node) -> float:
-    """Euclidean distance heuristic"""
-    return ((float(node.x) - float(goal.x))**2 + (float(node.y) - float(goal.y))**2)**0.5
+    """Euclidean distance plus the cheapest possible cost of the floors between the nodes"""
+    return ((float(node.x) - float(goal.x))**2 + (float(node.y) - float(goal.y))**2)**0.5 + \
+        abs(int(node.layer) - int(goal.layer)) * MIN_FLOOR_CHANGE_COST
+
+def _routing_graph(graph: Union[NavigationGraph, RoutingGraph], edges_data: Optional[List[Dict]]) -> RoutingGraph:
+    """Use a prebuilt RoutingGraph when given one, otherwise build a throwaway one from edges_data"""
+    if edges_data is None and isinstance(graph, RoutingGraph):
+        return graph
+    return RoutingGraph(graph, edges_data or [])
+
+def _goal_non_hallway_bound(goal_edges_hallway: List) -> int:
+    """
+    Lower bound on the non-hallway edges left to walk from any node but the goal.
+
+    Every route ends with an edge into the goal; when none of those is a hallway (e.g.
+    the goal is a room) at least one more non-hallway edge is unavoidable. Adding this
+    to the first cost component keeps A* goal-directed under the lexicographic cost:
+    without it every node one non-hallway edge from the start is settled before the
+    goal, whatever floor it is on.
+    """
+    return 0 if any(goal_edges_hallway) else 1
+
+class SearchStats:
+    """
+    Counters of route searches: queries, nodes expanded and time spent.
+
+    Pass one to a_star (or bidirectional_a_star) to record every query on it; it can
+    be shared by concurrent requests. `last` holds the latest query's
+    (expanded, seconds).
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.expanded = 0
+        self.seconds = 0.0
+        self.last: Tuple[int, float] = (0, 0.0)
+        self._lock = threading.Lock()
+
+    def record(self, expanded: int, seconds: float) -> None:
+        with self._lock:
+            self.queries += 1
+            self.expanded += expanded
+            self.seconds += seconds
+            self.last = (expanded, seconds)
+
+    def stats(self) -> Dict:
+        """Totals and per-query means"""
+        with self._lock:
+            return {
+                'queries': self.queries,
+                'expanded': self.expanded,
+                'seconds': self.seconds,
+                'mean_expanded': self.expanded / self.queries if self.queries else 0.0,
+                'mean_ms': self.seconds * 1000 / self.queries if self.queries else 0.0,
+            }
 
 def a_star(
-    graph: NavigationGraph,
+    graph: Union[NavigationGraph, RoutingGraph, CSRGraph, FloorPartitions, ClusterHierarchy, Landmarks],
+    start_id: str,
+    goal_id: str,
+    edges_data: Optional[List[Dict]] = None,
+    prefer_hallways: bool = True,
+    has_keycard: bool = False,
+    stats: Optional[SearchStats] = None
+) -> List[str]:
+    """
+    A* pathfinding with hallway preference.
+
+    Routes minimize (non_hallway_count, distance) compared lexicographically, or
+    distance alone when prefer_hallways is False. Pass a prebuilt RoutingGraph,
+    CSRGraph, FloorPartitions, ClusterHierarchy or Landmarks (and no edges_data) to
+    route without rebuilding any lookups; has_keycard then selects the keycard edge
+    overlay. A RoutingGraph is searched through its CSR packing, built once per
+    snapshot. Landmarks route with a bidirectional search under landmark bounds.
+    When edges_data is given it is assumed to already include all allowed edges.
+    The heuristic adds the cheapest cost of the floor changes still ahead. Nodes
+    expanded and time taken are recorded on stats.
+    """
+    started = time.perf_counter()
+    if edges_data is None and isinstance(graph, CSRGraph):
+        path, expanded = _a_star_csr(graph, start_id, goal_id, prefer_hallways, has_keycard)
+    elif edges_data is None and isinstance(graph, FloorPartitions):
+        path, expanded = _a_star_floors(graph, start_id, goal_id, prefer_hallways, has_keycard)
+    elif edges_data is None and isinstance(graph, ClusterHierarchy):
+        path, expanded = _a_star_hierarchical(graph, start_id, goal_id, prefer_hallways, has_keycard)
+    elif edges_data is None and isinstance(graph, Landmarks):
+        path, expanded = _a_star_bidirectional(graph.csr, start_id, goal_id, prefer_hallways, has_keycard,
+                                               graph.table(has_keycard))
+    else:
+        path, expanded = _a_star_csr(_routing_graph(graph, edges_data).csr, start_id, goal_id,
+                                     prefer_hallways, has_keycard)
+    if stats is not None:
+        stats.record(expanded, time.perf_counter() - started)
+    return path
+
+def bidirectional_a_star(
+    graph: CSRGraph,
     start_id: str,
     goal_id: str,
-    edges_data: List[Dict],
-    prefer_hallways: bool = True
+    prefer_hallways: bool = True,
+    has_keycard: bool = False,
+    landmarks: Optional[Landmarks] = None,
+    stats: Optional[SearchStats] = None
 ) -> List[str]:
-    """A* pathfinding with hallway preference. Assumes edges_data already includes all allowed edges."""
-    
-    if start_id not in graph.nodes or goal_id not in graph.nodes:
+    """
+    Bidirectional A* over CSR arrays, same cost model as a_star.
+
+    With landmarks the estimates also take the landmark (ALT) bounds, which are much
+    tighter than straight-line distance between rooms that share a wall but not a
+    door. Nodes expanded and time taken are recorded on stats.
+    """
+    started = time.perf_counter()
+    table = landmarks.table(has_keycard) if landmarks is not None else None
+    path, expanded = _a_star_bidirectional(graph, start_id, goal_id, prefer_hallways, has_keycard, table)
+    if stats is not None:
+        stats.record(expanded, time.perf_counter() - started)
+    return path
+
+def _a_star_csr(graph: CSRGraph, start_id: str, goal_id: str, prefer_hallways: bool,
+                has_keycard: bool) -> Tuple[List[str], int]:
+    """
+    A* over CSR arrays using integer node indices.
+
+    Costs are (non_hallway_count, distance) pairs kept in flat arrays. The heap is
+    never updated in place: an improved node is pushed again and the entries it
+    leaves behind are dropped when popped (lazy deletion). The heuristic is
+    consistent, so the first time a node is popped its cost is final; the closed set
+    then keeps it from being expanded again.
+    """
+    if start_id not in graph or goal_id not in graph:
         print(f"Start node {start_id} or goal node {goal_id} not in graph")
-        return []
+        return [], 0
+
+    xs, ys, layers = graph.xs, graph.ys, graph.layers
+    offsets, targets, weights, flags = graph.offsets, graph.targets, graph.weights, graph.flags
+    start = graph.index[start_id]
+    goal = graph.index[goal_id]
+    goal_x, goal_y, goal_layer = xs[goal], ys[goal], layers[goal]
+    skip = 0 if has_keycard else KEYCARD
+    goal_bound = _goal_non_hallway_bound(
+        [flags[k] & HALLWAY for k in range(offsets[goal], offsets[goal + 1]) if not flags[k] & skip]) \
+        if prefer_hallways else 0
+
+    n = len(graph)
+    non_hallway_count = array('i', [n]) * n  # n: more non-hallway edges than any route has
+    g_score = array('d', [float('inf')]) * n
+    came_from = array('i', [-1]) * n
+    closed = bytearray(n)
+    non_hallway_count[start], g_score[start] = 0, 0.0
+    open_set = [(0, 0.0, start)]  # (estimated non_hallway_count, estimated distance, node)
+
+    expanded = 0
+    while open_set:
+        _, _, current = heapq.heappop(open_set)
+        if closed[current]:
+            continue  # superseded by a cheaper entry
+        closed[current] = 1
+        expanded += 1
+
+        if current == goal:
+            path = [current]
+            while came_from[current] != -1:
+                current = came_from[current]
+                path.append(current)
+            return [graph.ids[i] for i in reversed(path)], expanded
+
+        current_g = g_score[current]
+        current_non_hallway = non_hallway_count[current]
+        for k in range(offsets[current], offsets[current + 1]):
+            flag = flags[k]
+            if flag & skip:
+                continue
+            neighbor = targets[k]
+            if closed[neighbor]:
+                continue
+            new_non_hallway_count = current_non_hallway + 1 if prefer_hallways and not flag & HALLWAY \
+                else current_non_hallway
+            tentative_g = current_g + weights[k]
+
+            known = non_hallway_count[neighbor]
+            if new_non_hallway_count < known or (new_non_hallway_count == known and tentative_g < g_score[neighbor]):
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g
+                non_hallway_count[neighbor] = new_non_hallway_count
+                dx = xs[neighbor] - goal_x
+                dy = ys[neighbor] - goal_y
+                f = tentative_g + (dx * dx + dy * dy) ** 0.5 + \
+                    abs(layers[neighbor] - goal_layer) * MIN_FLOOR_CHANGE_COST
+                bound = 0 if neighbor == goal else goal_bound
+                heapq.heappush(open_set, (new_non_hallway_count + bound, f, neighbor))
+
+    print("No path found")
+    return [], expanded
+
+def _a_star_floors(partitions: FloorPartitions, start_id: str, goal_id: str, prefer_hallways: bool,
+                   has_keycard: bool) -> Tuple[List[str], int]:
+    """
+    A* over per-floor subgraphs, same cost model and search as _a_star_csr.
+
+    Nodes are full-graph indices; each node's moves (including stairs and elevators)
+    come prebuilt from its floor's FloorGraph, and a floor's subgraph is only built
+    once the search first reaches it.
+    """
+    if start_id not in partitions or goal_id not in partitions:
+        print(f"Start node {start_id} or goal node {goal_id} not in graph")
+        return [], 0
+
+    csr, local = partitions.csr, partitions.local
+    start = csr.index[start_id]
+    goal = csr.index[goal_id]
+    goal_x, goal_y, goal_layer = csr.xs[goal], csr.ys[goal], csr.layers[goal]
+    skip = 0 if has_keycard else KEYCARD
+    goal_bound = _goal_non_hallway_bound(
+        [hallway for _, _, hallway in csr.neighbor_indices(goal, has_keycard)]) if prefer_hallways else 0
+    floors = {}  # layer -> FloorGraph, fetched once the search reaches the floor
+
+    n = len(csr)
+    non_hallway_count = array('i', [n]) * n
+    g_score = array('d', [float('inf')]) * n
+    came_from = array('i', [-1]) * n
+    closed = bytearray(n)
+    non_hallway_count[start], g_score[start] = 0, 0.0
+    open_set = [(0, 0.0, start)]
+
+    expanded = 0
+    while open_set:
+        _, _, current = heapq.heappop(open_set)
+        if closed[current]:
+            continue
+        closed[current] = 1
+        expanded += 1
+
+        if current == goal:
+            path = [current]
+            while came_from[current] != -1:
+                current = came_from[current]
+                path.append(current)
+            return [csr.ids[i] for i in reversed(path)], expanded
+
+        layer = csr.layers[current]
+        floor = floors.get(layer)
+        if floor is None:
+            floor = floors[layer] = partitions.floor(layer)
+
+        current_g = g_score[current]
+        current_non_hallway = non_hallway_count[current]
+        for neighbor, weight, flag, x, y, neighbor_layer in floor.moves[local[current]]:
+            if flag & skip or closed[neighbor]:
+                continue
+            new_non_hallway_count = current_non_hallway + 1 if prefer_hallways and not flag & HALLWAY \
+                else current_non_hallway
+            tentative_g = current_g + weight
+            known = non_hallway_count[neighbor]
+            if new_non_hallway_count < known or (new_non_hallway_count == known and tentative_g < g_score[neighbor]):
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g
+                non_hallway_count[neighbor] = new_non_hallway_count
+                dx = x - goal_x
+                dy = y - goal_y
+                f = tentative_g + (dx * dx + dy * dy) ** 0.5 + \
+                    abs(neighbor_layer - goal_layer) * MIN_FLOOR_CHANGE_COST
+                bound = 0 if neighbor == goal else goal_bound
+                heapq.heappush(open_set, (new_non_hallway_count + bound, f, neighbor))
+
+    print("No path found")
+    return [], expanded
 
-    start = graph.nodes[start_id]
-    goal = graph.nodes[goal_id]
+def _a_star_hierarchical(hierarchy: ClusterHierarchy, start_id: str, goal_id: str,
+                         prefer_hallways: bool, has_keycard: bool) -> Tuple[List[str], int]:
+    """
+    A* over the portals of a ClusterHierarchy, then unpacked to the full route.
 
-    # Build edge lookup: edge_key => {'hallway': bool}
-    edge_lookup = {}
-    adjacency = {}
-    for edge in edges_data:
-        a, b = edge['pointnum1'], edge['pointnum2']
-        is_hallway = edge.get('hallway', False)
-        
-        key_ab = f"{a}-{b}"
-        key_ba = f"{b}-{a}"
-        edge_lookup[key_ab] = {'hallway': is_hallway}
-        edge_lookup[key_ba] = {'hallway': is_hallway}
+    The start and goal are linked to the portals of their own clusters through the
+    portals' precomputed trees (plus a search inside the cluster when both share
+    one), so the search itself only visits portals; the routes behind each link are
+    spliced together at the end. Costs are (non_hallway_count, distance) as in
+    a_star, so the route costs the same as a flat search's.
+    """
+    if start_id not in hierarchy or goal_id not in hierarchy:
+        print(f"Start node {start_id} or goal node {goal_id} not in graph")
+        return [], 0
 
-        adjacency.setdefault(a, set()).add(b)
-        adjacency.setdefault(b, set()).add(a)
+    csr, local = hierarchy.csr, hierarchy.local
+    start = csr.index[start_id]
+    goal = csr.index[goal_id]
+    if start == goal:
+        return [start_id], 0
+    portal_graph = hierarchy.portal_graph(prefer_hallways, has_keycard)
+    links, trees = portal_graph.links, portal_graph.trees
+    xs, ys, layers = csr.xs, csr.ys, csr.layers
+    goal_x, goal_y, goal_layer = xs[goal], ys[goal], layers[goal]
+    goal_bound = _goal_non_hallway_bound(
+        [hallway for _, _, hallway in csr.neighbor_indices(goal, has_keycard)]) if prefer_hallways else 0
 
-    open_set = [(0, 0, start_id)]  # (non_hallway_count, f_score, node_id)
-    open_set_hash = {start_id}
-    came_from = {}
+    start_links = list(links[start]) if start in portal_graph else portal_graph.portal_links(hierarchy, start)
+    to_goal = {}  # portal -> its move into the goal
+    if goal not in portal_graph:
+        to_goal = {portal: (goal, non_hallway, distance, portal)
+                   for portal, non_hallway, distance, _ in portal_graph.portal_links(hierarchy, goal)}
+    if hierarchy.cluster[start] == hierarchy.cluster[goal]:
+        direct = hierarchy.cluster_route(start, goal, prefer_hallways, has_keycard)
+        if direct is not None:
+            start_links.append((goal, direct[0], direct[1], direct[2]))
 
-    g_score = {start_id: 0}
-    non_hallway_count = {start_id: 0}
-    f_score = {start_id: heuristic(start, goal)}
+    open_set = [(0, 0.0, 0, 0.0, start)]  # (estimated non-hallway, estimated distance, non-hallway, distance, node)
+    best = {start: (0, 0.0)}
+    came_from = {}  # node -> (previous node, route of the link between them)
+    closed = set()
 
+    expanded = 0
     while open_set:
-        _, _, current_id = heapq.heappop(open_set)
-        open_set_hash.remove(current_id)
-
-        if current_id == goal_id:
-            path = []
-            while current_id in came_from:
-                path.append(current_id)
-                current_id = came_from[current_id]
-            path.append(start_id)
-            return path[::-1]
-
-        current_node = graph.nodes[current_id]
-        neighbors = adjacency.get(current_id, set())
-
-        for neighbor_id in neighbors:
-            if neighbor_id not in graph.nodes:
+        _, _, current_non_hallway, current_distance, current = heapq.heappop(open_set)
+        if current in closed:
+            continue
+        closed.add(current)
+        expanded += 1
+
+        if current == goal:
+            route = [goal]
+            while current in came_from:
+                previous, via = came_from[current]
+                if via is None:
+                    segment = [previous, current]
+                elif isinstance(via, list):
+                    segment = via
+                elif via == current:  # the tree of the link's far end walks toward it
+                    segment = trees[via].route(local[previous])
+                else:
+                    segment = trees[via].route(local[current])[::-1]
+                route.extend(reversed(segment[:-1]))
+                current = previous
+            return [csr.ids[i] for i in reversed(route)], expanded
+
+        moves = start_links if current == start else links.get(current, ())
+        if current in to_goal:
+            moves = list(moves) + [to_goal[current]]
+        for neighbor, non_hallway, distance, via in moves:
+            if neighbor in closed:
                 continue
-            neighbor = graph.nodes[neighbor_id]
-            edge_key = f"{current_id}-{neighbor_id}"
-            edge_info = edge_lookup.get(edge_key)
-            if edge_info is None:
-                continue  # skip unknown edge
-
-            # Distance
-            dx = float(current_node.x) - float(neighbor.x)
-            dy = float(current_node.y) - float(neighbor.y)
-            weight = (dx**2 + dy**2) ** 0.5
-
-            # Handle hallway preference
-            is_hallway = edge_info.get('hallway', False)
-            new_non_hallway_count = non_hallway_count[current_id]
-            if not is_hallway:
-                new_non_hallway_count += 1
-
-            tentative_g = g_score[current_id] + weight
-
-            # Update if better path found
-            better = False
-            if neighbor_id not in g_score:
-                better = True
-            elif new_non_hallway_count < non_hallway_count[neighbor_id]:
-                better = True
-            elif new_non_hallway_count == non_hallway_count[neighbor_id] and tentative_g < g_score[neighbor_id]:
-                better = True
-
-            if better:
-                came_from[neighbor_id] = current_id
-                g_score[neighbor_id] = tentative_g
-                non_hallway_count[neighbor_id] = new_non_hallway_count
-                f = tentative_g + heuristic(neighbor, goal)
-                f_score[neighbor_id] = f
-
-                if neighbor_id not in open_set_hash:
-                    heapq.heappush(open_set, (new_non_hallway_count, f, neighbor_id))
-                    open_set_hash.add(neighbor_id)
+            cost = (current_non_hallway + non_hallway, current_distance + distance)
+            known = best.get(neighbor)
+            if known is None or cost < known:
+                best[neighbor] = cost
+                came_from[neighbor] = (current, via)
+                dx = xs[neighbor] - goal_x
+                dy = ys[neighbor] - goal_y
+                f = cost[1] + (dx * dx + dy * dy) ** 0.5 + abs(layers[neighbor] - goal_layer) * MIN_FLOOR_CHANGE_COST
+                bound = 0 if neighbor == goal else goal_bound
+                heapq.heappush(open_set, (cost[0] + bound, f, cost[0], cost[1], neighbor))
 
     print("No path found")
-    return []
+    return [], expanded
+
+def _a_star_bidirectional(csr: CSRGraph, start_id: str, goal_id: str, prefer_hallways: bool,
+                          has_keycard: bool, table: Optional[LandmarkTable]) -> Tuple[List[str], int]:
+    """
+    Bidirectional A* over CSR arrays, same cost model as a_star.
+
+    One search runs forward from the start toward the goal and one backward from the
+    goal toward the start (edges are undirected), taking turns by open set size. Each
+    uses its own estimate: straight-line distance plus the floors ahead, the
+    non-hallway bound of a_star and, given a LandmarkTable, the bounds of the
+    landmarks that best separate start and goal. Both estimates are consistent, so a
+    search whose smallest key is no cheaper than the best route found where the two
+    meet cannot improve on it, and the search stops there.
+    """
+    if start_id not in csr or goal_id not in csr:
+        print(f"Start node {start_id} or goal node {goal_id} not in graph")
+        return [], 0
+
+    xs, ys, layers = csr.xs, csr.ys, csr.layers
+    offsets, targets, weights, flags = csr.offsets, csr.targets, csr.weights, csr.flags
+    start = csr.index[start_id]
+    goal = csr.index[goal_id]
+    if start == goal:
+        return [start_id], 0
+    skip = 0 if has_keycard else KEYCARD
+    rows = table.select(start, goal) if table is not None else []
+
+    def estimator(end: int):
+        """Estimate of the (non_hallway_count, distance) from any node to end"""
+        end_x, end_y, end_layer = xs[end], ys[end], layers[end]
+        bound = 0
+        if prefer_hallways:
+            bound = _goal_non_hallway_bound([hallway for _, _, hallway in csr.neighbor_indices(end, has_keycard)])
+        landmarks = [(row, table.distance[row + end], table.non_hallway[row + end] if prefer_hallways else 0)
+                     for row in rows]
+        landmark_distance = table.distance if table is not None else None
+        landmark_non_hallway = table.non_hallway if table is not None else None
+
+        def estimate(i: int) -> Tuple[int, float]:
+            dx = xs[i] - end_x
+            dy = ys[i] - end_y
+            distance = (dx * dx + dy * dy) ** 0.5 + abs(layers[i] - end_layer) * MIN_FLOOR_CHANGE_COST
+            non_hallway = 0 if i == end else bound
+            for row, end_distance, end_non_hallway in landmarks:
+                gap = landmark_distance[row + i] - end_distance
+                if gap > distance:
+                    distance = gap
+                elif -gap > distance:
+                    distance = -gap
+                if prefer_hallways:
+                    gap = landmark_non_hallway[row + i] - end_non_hallway
+                    if gap > non_hallway:
+                        non_hallway = gap
+                    elif -gap > non_hallway:
+                        non_hallway = -gap
+            return non_hallway, distance
+        return estimate
+
+    # Index 0 searches forward from the start, 1 backward from the goal
+    estimates = (estimator(goal), estimator(start))
+    best = ({start: (0, 0.0)}, {goal: (0, 0.0)})
+    came_from = ({}, {})
+    closed = (set(), set())
+    open_sets = ([(*estimates[0](start), start)], [(*estimates[1](goal), goal)])
+    route_cost = None  # cheapest route through a node reached from both sides so far
+    meeting = -1
+
+    expanded = 0
+    while open_sets[0] and open_sets[1]:
+        side = 0 if len(open_sets[0]) <= len(open_sets[1]) else 1
+        open_set = open_sets[side]
+        top = open_set[0]
+        if route_cost is not None and (top[0], top[1]) >= route_cost:
+            break
+        _, _, current = heapq.heappop(open_set)
+        if current in closed[side]:
+            continue
+        closed[side].add(current)
+        expanded += 1
+
+        estimate, costs, other_costs = estimates[side], best[side], best[1 - side]
+        current_non_hallway, current_distance = costs[current]
+        for k in range(offsets[current], offsets[current + 1]):
+            flag = flags[k]
+            if flag & skip:
+                continue
+            neighbor = targets[k]
+            if neighbor in closed[side]:
+                continue
+            cost = (current_non_hallway + 1 if prefer_hallways and not flag & HALLWAY else current_non_hallway,
+                    current_distance + weights[k])
+            known = costs.get(neighbor)
+            if known is None or cost < known:
+                costs[neighbor] = cost
+                came_from[side][neighbor] = current
+                non_hallway, distance = estimate(neighbor)
+                heapq.heappush(open_set, (cost[0] + non_hallway, cost[1] + distance, neighbor))
+                other = other_costs.get(neighbor)
+                if other is not None and (route_cost is None or
+                                          (cost[0] + other[0], cost[1] + other[1]) < route_cost):
+                    route_cost = (cost[0] + other[0], cost[1] + other[1])
+                    meeting = neighbor
+
+    if route_cost is None:
+        print("No path found")
+        return [], expanded
+    path = [meeting]
+    while path[-1] in came_from[0]:
+        path.append(came_from[0][path[-1]])
+    path.reverse()
+    while path[-1] in came_from[1]:
+        path.append(came_from[1][path[-1]])
+    return [csr.ids[i] for i in path], expanded
+
+# Restrooms in the ENRC building, used when the Point Table has no "restroom" type
+RESTROOM_IDS = [1162, 1166, 1265, 1261, 2513, 2517, 4407, 4405, 4721, 4725]
+
+def _as_csr(graph: Union[NavigationGraph, RoutingGraph, CSRGraph, FloorPartitions],
+            edges_data: Optional[List[Dict]]) -> CSRGraph:
+    if edges_data is None and isinstance(graph, CSRGraph):
+        return graph
+    if edges_data is None and isinstance(graph, (FloorPartitions, ClusterHierarchy, Landmarks)):
+        return graph.csr
+    return _routing_graph(graph, edges_data).csr
+
+def find_nearest(
+    graph: Union[NavigationGraph, RoutingGraph, CSRGraph],
+    start_id: str,
+    target_ids,
+    edges_data: Optional[List[Dict]] = None,
+    prefer_hallways: bool = True,
+    has_keycard: bool = False
+) -> Tuple[Optional[str], List[str]]:
+    """
+    Find the closest of several target nodes with a single multi-target Dijkstra.
 
-# Correct implementation of find_restroom function that aligns with a_star parameters:
+    Uses the same (non_hallway_count, distance) cost as a_star and stops at the first
+    target it settles.
 
-def find_restroom(graph: NavigationGraph, room_id: str, edges_data=None, keycard_edges_data=None, has_keycard=False):
-    """Find the nearest restroom from a given room"""
-    restrooms = [1162, 1166, 1265, 1261, 2513, 2517, 4407, 4405, 4721, 4725]
-    shortest_path = None
-    shortest_restroom_id = None
-    shortest_path_length = float('inf')
-    fewest_non_hallways = float('inf')
+    Returns:
+        Tuple of (target_id, path), or (None, []) if no target is reachable
+    """
+    csr = _as_csr(graph, edges_data)
+    if start_id not in csr:
+        print(f"Start node {start_id} not in graph")
+        return None, []
 
-    if room_id in map(str, restrooms):
+    targets = {csr.index[target_id] for target_id in target_ids if target_id in csr}
+    if not targets:
+        return None, []
+
+    start = csr.index[start_id]
+    _, _, parent, found = shortest_path_tree(csr, start, prefer_hallways, has_keycard,
+                                             targets=targets, first_only=True)
+    if found is None:
+        return None, []
+    return csr.ids[found], [csr.ids[i] for i in tree_path(parent, start, found)]
+
+def find_nearest_of_type(
+    graph: Union[NavigationGraph, RoutingGraph, CSRGraph],
+    start_id: str,
+    type_name: str,
+    edges_data: Optional[List[Dict]] = None,
+    prefer_hallways: bool = True,
+    has_keycard: bool = False
+) -> Tuple[Optional[str], List[str]]:
+    """Find the closest node whose type_name matches (e.g. "elevator", "exit", "stairs")"""
+    csr = _as_csr(graph, edges_data)
+    wanted = type_name.lower()
+    target_ids = [node_id for node_id, node_type in zip(csr.ids, csr.types) if str(node_type).lower() == wanted]
+    return find_nearest(csr, start_id, target_ids, prefer_hallways=prefer_hallways, has_keycard=has_keycard)
+
+def find_restroom(graph: Union[NavigationGraph, RoutingGraph, CSRGraph], room_id: str,
+                  edges_data=None, keycard_edges_data=None, has_keycard=False):
+    """
+    Find the nearest restroom from a given room.
+
+    Pass a prebuilt RoutingGraph or CSRGraph to search without rebuilding any lookups;
+    otherwise the edge lists are combined into a one-off routing graph.
+    """
+    if edges_data is not None or not isinstance(graph, (RoutingGraph, CSRGraph)):
+        routing = RoutingGraph(graph, edges_data or [], keycard_edges_data if has_keycard else None)
+        graph, has_keycard = routing, bool(has_keycard and keycard_edges_data)
+    csr = _as_csr(graph, None)
+
+    restrooms = [node_id for node_id, node_type in zip(csr.ids, csr.types) if str(node_type).lower() == "restroom"]
+    if not restrooms:
+        restrooms = [node_id for node_id in csr.ids if str(node_id) in map(str, RESTROOM_IDS)]
+
+    if str(room_id) in map(str, restrooms):
         return room_id  # If already at a restroom, return the same id
 
-    # Prepare all edges for pathfinding
-    all_edges = []
-    if edges_data:
-        all_edges.extend(edges_data)
-    
-    # Add keycard edges if user has keycard
-    if has_keycard and keycard_edges_data:
-        all_edges.extend(keycard_edges_data)
-        print(f"✅ Added {len(keycard_edges_data)} keycard edges to restroom search")
-
-    for restroom_id in restrooms:
-        # Call a_star with the correct number of parameters
-        path = a_star(graph, room_id, str(restroom_id), all_edges, True)
-        
-        if path:
-            # Count non-hallway segments
-            non_hallway_segments = 0
-            
-            # Create a dictionary for quick edge lookup
-            edge_lookup = {}
-            for edge in all_edges:
-                key1 = f"{edge['pointnum1']}-{edge['pointnum2']}"
-                key2 = f"{edge['pointnum2']}-{edge['pointnum1']}"
-                is_hallway = edge.get('hallway', False)
-                edge_lookup[key1] = {'hallway': is_hallway}
-                edge_lookup[key2] = {'hallway': is_hallway}
-            
-            for i in range(len(path) - 1):
-                edge_key = f"{path[i]}-{path[i+1]}"
-                edge_info = edge_lookup.get(edge_key, {'hallway': False})
-                if not edge_info.get('hallway', False):
-                    non_hallway_segments += 1
-            
-            # First prioritize minimizing non-hallway segments, then path length
-            if non_hallway_segments < fewest_non_hallways or \
-               (non_hallway_segments == fewest_non_hallways and len(path) < shortest_path_length):
-                fewest_non_hallways = non_hallway_segments
-                shortest_path_length = len(path)
-                shortest_path = path
-                shortest_restroom_id = restroom_id
-
-    if shortest_restroom_id:
-        print(f"Path from Room {room_id} to Restroom {shortest_restroom_id}: {shortest_path}")
-        print(f"Path has {fewest_non_hallways} non-hallway segments and {shortest_path_length} total segments")
-    return str(shortest_restroom_id) if shortest_restroom_id else None
+    restroom_id, path = find_nearest(csr, room_id, restrooms, prefer_hallways=True, has_keycard=has_keycard)
+
+    if restroom_id is not None:
+        print(f"Path from Room {room_id} to Restroom {restroom_id}: {path}")
+    return str(restroom_id) if restroom_id is not None else None
+
+def shortest_path_tree(
+    graph: CSRGraph,
+    source: int,
+    prefer_hallways: bool = True,
+    has_keycard: bool = False,
+    targets: Optional[set] = None,
+    first_only: bool = False
+) -> Tuple[List[int], List[float], List[int], Optional[int]]:
+    """
+    Dijkstra from a source node index over CSR arrays.
+
+    Costs are compared lexicographically as (non_hallway_count, distance), or by
+    distance alone when prefer_hallways is False. The search stops once every node
+    in targets is settled, or at the first settled target when first_only is set.
+
+    Returns:
+        Tuple of (non_hallway, distance, parent, first_settled_target) lists indexed by
+        node index; unreachable nodes have parent -1 and infinite distance.
+    """
+    n = len(graph)
+    offsets, targets_arr, weights, flags = graph.offsets, graph.targets, graph.weights, graph.flags
+    skip = 0 if has_keycard else KEYCARD
+    inf = float('inf')
+
+    non_hallway = [0] * n
+    distance = [inf] * n
+    parent = [-1] * n
+    settled = bytearray(n)
+    remaining = set(targets) if targets is not None else None
+
+    distance[source] = 0.0
+    heap = [(0, 0.0, source)]
+    while heap:
+        current_non_hallway, current_distance, current = heapq.heappop(heap)
+        if settled[current]:
+            continue
+        settled[current] = 1
+
+        if remaining is not None and current in remaining:
+            if first_only:
+                return non_hallway, distance, parent, current
+            remaining.discard(current)
+            if not remaining:
+                break
+
+        for k in range(offsets[current], offsets[current + 1]):
+            flag = flags[k]
+            if flag & skip:
+                continue
+            neighbor = targets_arr[k]
+            if settled[neighbor]:
+                continue
+            new_non_hallway = current_non_hallway
+            if prefer_hallways and not flag & HALLWAY:
+                new_non_hallway += 1
+            new_distance = current_distance + weights[k]
+            if distance[neighbor] == inf or new_non_hallway < non_hallway[neighbor] or \
+                    (new_non_hallway == non_hallway[neighbor] and new_distance < distance[neighbor]):
+                non_hallway[neighbor] = new_non_hallway
+                distance[neighbor] = new_distance
+                parent[neighbor] = current
+                heapq.heappush(heap, (new_non_hallway, new_distance, neighbor))
+
+    return non_hallway, distance, parent, None
+
+def tree_path(parent: List[int], source: int, target: int) -> List[int]:
+    """Walk parent pointers of a shortest path tree from target back to source"""
+    if target != source and parent[target] == -1:
+        return []
+    path = [target]
+    while path[-1] != source:
+        path.append(parent[path[-1]])
+    path.reverse()
+    return path
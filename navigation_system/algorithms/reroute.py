@@ -0,0 +1,200 @@
+# algorithms/reroute.py
+import heapq
+import threading
+from typing import Iterable, List, Optional, Set, Tuple
+
+from navigation_system.models.csr_graph import CSRGraph, HALLWAY, KEYCARD
+from navigation_system.algorithms.pathfinding import shortest_path_tree
+
+_EPSILON = 1e-9
+
+
+class DestinationTree:
+    """
+    Shortest path tree rooted at a destination, for rerouting one navigation session.
+
+    Built once with a Dijkstra from the destination (the graph is undirected), after
+    which the route from any node to the destination is a walk along parent pointers,
+    with no search. Costs follow a_star's model: (non_hallway_count, distance)
+    compared lexicographically, or distance alone when prefer_hallways is False.
+
+    When the graph changes, sync() repairs the tree instead of rebuilding it: subtrees
+    hanging off edges that got worse or disappeared are cut loose and re-attached from
+    their boundary, and edges that got better are relaxed outward. Only the region
+    whose cost actually changes is visited.
+    """
+
+    def __init__(self, csr: CSRGraph, destination_id, prefer_hallways: bool = True,
+                 has_keycard: bool = False):
+        self.destination_id = destination_id
+        self.prefer_hallways = prefer_hallways
+        self.has_keycard = has_keycard
+        self.repaired = 0  # nodes touched by the last sync
+        self._pending: Set = set()
+        self._lock = threading.Lock()
+        self._build(csr)
+
+    def _build(self, csr: CSRGraph) -> None:
+        self.csr = csr
+        self.root = csr.index[self.destination_id]
+        self.non_hallway, self.distance, self.parent, _ = shortest_path_tree(
+            csr, self.root, self.prefer_hallways, self.has_keycard)
+        self.children = [set() for _ in range(len(csr))]
+        for node, parent in enumerate(self.parent):
+            if parent != -1:
+                self.children[parent].add(node)
+        self.repaired = len(csr)
+
+    def __contains__(self, node_id) -> bool:
+        i = self.csr.index.get(node_id)
+        return i is not None and (i == self.root or self.parent[i] != -1)
+
+    def cost(self, node_id) -> Optional[Tuple[int, float]]:
+        """(non_hallway_count, distance) from node_id to the destination, or None if unreachable"""
+        if node_id not in self:
+            return None
+        i = self.csr.index[node_id]
+        return self.non_hallway[i], self.distance[i]
+
+    def next_hop(self, node_id):
+        """Next node on the way to the destination (None at the destination or if unreachable)"""
+        if node_id not in self:
+            return None
+        parent = self.parent[self.csr.index[node_id]]
+        return self.csr.ids[parent] if parent != -1 else None
+
+    def route(self, start_id) -> List:
+        """Node ids from start_id to the destination, or [] if unreachable"""
+        with self._lock:
+            if start_id not in self:
+                return []
+            ids, parent = self.csr.ids, self.parent
+            i = self.csr.index[start_id]
+            path = [ids[i]]
+            while i != self.root:
+                i = parent[i]
+                path.append(ids[i])
+            return path
+
+    def mark_changed(self, node_ids: Iterable) -> None:
+        """Note nodes whose node or incident edges changed; applied by the next sync()"""
+        with self._lock:
+            self._pending.update(node_ids)
+
+    def sync(self, csr: CSRGraph) -> int:
+        """
+        Bring the tree up to date with a new graph snapshot.
+
+        Uses the nodes passed to mark_changed() since the last sync; without any, every
+        node's edges are compared. Falls back to a full rebuild if nodes were added or
+        removed. Returns the number of nodes repaired.
+        """
+        with self._lock:
+            if csr is self.csr:
+                return 0
+            old, changed = self.csr, self._pending
+            self._pending = set()
+            if csr.ids != old.ids or self.destination_id not in csr.index:
+                self._build(csr)
+                return self.repaired
+
+            if changed:
+                changed = {csr.index[node_id] for node_id in changed if node_id in csr.index}
+            else:
+                changed = {i for i in range(len(csr)) if self._edges(old, i) != self._edges(csr, i)}
+            self.csr = csr
+            self.repaired = self._repair(changed)
+            return self.repaired
+
+    def _edges(self, csr: CSRGraph, i: int) -> List[Tuple[int, float, int]]:
+        return sorted(zip(csr.targets[csr.offsets[i]:csr.offsets[i + 1]],
+                          csr.weights[csr.offsets[i]:csr.offsets[i + 1]],
+                          csr.flags[csr.offsets[i]:csr.offsets[i + 1]]))
+
+    def _step(self, flag: int) -> int:
+        return 1 if self.prefer_hallways and not flag & HALLWAY else 0
+
+    def _edge_cost(self, a: int, b: int) -> Optional[Tuple[int, float]]:
+        """Cheapest usable edge a-b in the current snapshot"""
+        csr = self.csr
+        skip = 0 if self.has_keycard else KEYCARD
+        best = None
+        for k in range(csr.offsets[a], csr.offsets[a + 1]):
+            if csr.targets[k] == b and not csr.flags[k] & skip:
+                cost = (self._step(csr.flags[k]), csr.weights[k])
+                if best is None or cost < best:
+                    best = cost
+        return best
+
+    def _set(self, node: int, parent: int, non_hallway: int, distance: float) -> None:
+        old_parent = self.parent[node]
+        if old_parent != -1:
+            self.children[old_parent].discard(node)
+        self.parent[node] = parent
+        if parent != -1:
+            self.children[parent].add(node)
+        self.non_hallway[node] = non_hallway
+        self.distance[node] = distance
+
+    def _tree_edge_intact(self, node: int) -> bool:
+        """Whether node's edge to its parent still exists at the cost the tree assumes"""
+        parent = self.parent[node]
+        cost = self._edge_cost(node, parent)
+        return cost is not None and cost[0] == self.non_hallway[node] - self.non_hallway[parent] and \
+            abs(cost[1] - (self.distance[node] - self.distance[parent])) <= _EPSILON
+
+    def _repair(self, changed: Set[int]) -> int:
+        csr, inf = self.csr, float('inf')
+        offsets, targets, weights, flags = csr.offsets, csr.targets, csr.weights, csr.flags
+        skip = 0 if self.has_keycard else KEYCARD
+
+        # 1. Cut loose every subtree whose link toward the root got worse or disappeared
+        cut = set()
+        for node in changed:
+            for child in [node] + list(self.children[node]):
+                if child == self.root or self.parent[child] == -1 or child in cut:
+                    continue
+                if not self._tree_edge_intact(child):
+                    stack = [child]
+                    while stack:
+                        current = stack.pop()
+                        if current not in cut:
+                            cut.add(current)
+                            stack.extend(self.children[current])
+        for node in cut:
+            self._set(node, -1, 0, inf)
+
+        # 2. Re-attach cut nodes from their intact neighbors, and relax every changed
+        # node outward and inward so improved edges propagate
+        heap = []
+        for node in changed - cut:
+            if self.distance[node] != inf:
+                heapq.heappush(heap, (self.non_hallway[node], self.distance[node], node))
+        for node in cut | changed:
+            for k in range(offsets[node], offsets[node + 1]):
+                if flags[k] & skip:
+                    continue
+                neighbor = targets[k]
+                if self.distance[neighbor] != inf and neighbor not in cut:
+                    heapq.heappush(heap, (self.non_hallway[neighbor], self.distance[neighbor], neighbor))
+
+        # 3. Dijkstra over the affected region only
+        touched = set(cut)
+
+        def relax(source: int, k: int) -> None:
+            neighbor = targets[k]
+            candidate = (self.non_hallway[source] + self._step(flags[k]), self.distance[source] + weights[k])
+            if self.distance[neighbor] == inf or candidate < (self.non_hallway[neighbor], self.distance[neighbor]):
+                self._set(neighbor, source, *candidate)
+                heapq.heappush(heap, (candidate[0], candidate[1], neighbor))
+
+        while heap:
+            non_hallway, distance, node = heapq.heappop(heap)
+            if (non_hallway, distance) != (self.non_hallway[node], self.distance[node]):
+                continue  # stale entry
+            touched.add(node)
+            for k in range(offsets[node], offsets[node + 1]):
+                if flags[k] & skip or targets[k] == self.root:
+                    continue
+                relax(node, k)
+        return len(touched)
@@ -0,0 +1,150 @@
+# algorithms/route_table.py
+import json
+import struct
+import sys
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+from navigation_system.models.csr_graph import CSRGraph, id_type
+from navigation_system.algorithms.pathfinding import shortest_path_tree
+
+MAGIC = b"NAVRTBL1"
+
+# (prefer_hallways, has_keycard)
+Profile = Tuple[bool, bool]
+PROFILES: List[Profile] = [(True, False), (True, True), (False, False), (False, True)]
+
+
+def next_hop_column(graph: CSRGraph, target: int, profile: Profile) -> array:
+    """
+    Compute the next hop from every node towards one target.
+
+    Edges are undirected, so the shortest path tree rooted at the target gives each
+    node's next hop on its shortest path to the target (-1 if unreachable).
+    """
+    prefer_hallways, has_keycard = profile
+    _, _, parent, _ = shortest_path_tree(graph, target, prefer_hallways, has_keycard)
+    return array('i', parent)
+
+
+class RouteTable:
+    """
+    Precomputed next-hop matrix for a set of destination nodes.
+
+    For every access profile the table stores, for each destination, the next node
+    to move to from any node in the graph. A route lookup follows next hops from the
+    start node, so answering a query is O(path length) with no search.
+
+    The version compares node ids as text, so the table also records the type of its
+    ids; matches() only accepts a graph whose ids are of that same type.
+    """
+
+    def __init__(self, ids: List, targets: List[int], profiles: List[Profile],
+                 next_hops: Dict[Profile, array], version: Optional[str] = None):
+        self.ids = ids
+        self.id_type = id_type(ids)
+        self.index = {node_id: i for i, node_id in enumerate(ids)}
+        self.targets = targets
+        self.target_columns = {target: column for column, target in enumerate(targets)}
+        self.profiles = profiles
+        self.next_hops = next_hops
+        self.version = version
+
+    @classmethod
+    def build(cls, graph: CSRGraph, target_ids: Optional[Iterable] = None,
+              profiles: Optional[List[Profile]] = None) -> "RouteTable":
+        """
+        Build next-hop columns for the given destinations (all nodes by default).
+
+        Args:
+            graph: CSR routing graph to precompute
+            target_ids: Destination node ids, e.g. every room; None means every node
+            profiles: (prefer_hallways, has_keycard) combinations to precompute
+        """
+        profiles = list(profiles or PROFILES)
+        if target_ids is None:
+            targets = list(range(len(graph)))
+        else:
+            targets = [graph.index[node_id] for node_id in target_ids if node_id in graph]
+
+        next_hops = {}
+        for profile in profiles:
+            table = array('i')
+            for target in targets:
+                table.extend(next_hop_column(graph, target, profile))
+            next_hops[profile] = table
+        return cls(list(graph.ids), targets, profiles, next_hops, version=graph.version)
+
+    def matches(self, graph: CSRGraph) -> bool:
+        """Check whether the table was built for this graph: same version and same id type"""
+        return self.version == graph.version and self.id_type == graph.id_type
+
+    def covers(self, end_id, prefer_hallways: bool = True, has_keycard: bool = False) -> bool:
+        """Check whether routes to end_id under this profile can be answered from the table"""
+        end = self.index.get(end_id)
+        return end in self.target_columns and (bool(prefer_hallways), bool(has_keycard)) in self.next_hops
+
+    def lookup(self, start_id, end_id, prefer_hallways: bool = True,
+               has_keycard: bool = False) -> Optional[List]:
+        """
+        Look up a precomputed route.
+
+        Returns:
+            The path as a list of node ids, [] if the end is unreachable, or None if
+            the table does not cover this destination or profile.
+        """
+        if start_id not in self.index or not self.covers(end_id, prefer_hallways, has_keycard):
+            return None
+
+        n = len(self.ids)
+        end = self.index[end_id]
+        table = self.next_hops[(bool(prefer_hallways), bool(has_keycard))]
+        base = self.target_columns[end] * n
+
+        current = self.index[start_id]
+        path = [current]
+        while current != end:
+            current = table[base + current]
+            if current == -1 or len(path) > n:
+                return []
+            path.append(current)
+        return [self.ids[i] for i in path]
+
+    def save(self, filename: str) -> None:
+        """Write the table to disk: magic, JSON header, then one int32 matrix per profile"""
+        header = json.dumps({
+            'version': self.version,
+            'id_type': self.id_type,
+            'ids': self.ids,
+            'targets': self.targets,
+            'profiles': self.profiles,
+            'byteorder': sys.byteorder,
+        }).encode()
+        with open(filename, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<I', len(header)))
+            f.write(header)
+            for profile in self.profiles:
+                self.next_hops[profile].tofile(f)
+
+    @classmethod
+    def load(cls, filename: str) -> "RouteTable":
+        """Read a table written by save()"""
+        with open(filename, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{filename} is not a route table file")
+            header_length, = struct.unpack('<I', f.read(4))
+            header = json.loads(f.read(header_length))
+
+            ids = header['ids']
+            if header.get('id_type', id_type(ids)) != id_type(ids):
+                raise ValueError(f"{filename} has {id_type(ids)} node ids but its header says {header['id_type']}")
+            targets = header['targets']
+            profiles = [tuple(profile) for profile in header['profiles']]
+            next_hops = {}
+            for profile in profiles:
+                table = array('i')
+                table.fromfile(f, len(ids) * len(targets))
+                if header['byteorder'] != sys.byteorder:
+                    table.byteswap()
+                next_hops[profile] = table
+        return cls(ids, targets, profiles, next_hops, version=header['version'])
@@ -1,5 +1,119 @@
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 from navigation_system.models.node import NavigationGraph
+from navigation_system.models.csr_graph import CSRGraph
+
+def _position(graph, node_id) -> Tuple[float, float]:
+    """Get node coordinates from a NavigationGraph or a prebuilt routing graph"""
+    if hasattr(graph, 'position'):
+        return graph.position(node_id)
+    node = graph.nodes[node_id]
+    return float(node.x), float(node.y)
+
+def _node_type(graph, node_id) -> str:
+    if isinstance(graph, CSRGraph):
+        return graph.type_name(node_id)
+    return graph.nodes[node_id].type_name
+
+def _path_coordinates(graph, path: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Coordinates of every node on a path as two float arrays"""
+    if isinstance(graph, CSRGraph):
+        index = graph.index
+        indices = [index[node_id] for node_id in path]
+        return np.frombuffer(graph.xs, dtype=np.float64)[indices], np.frombuffer(graph.ys, dtype=np.float64)[indices]
+    coordinates = np.array([_position(graph, node_id) for node_id in path], dtype=np.float64)
+    return coordinates[:, 0], coordinates[:, 1]
+
+def _path_layers(graph, path: List[str]) -> np.ndarray:
+    """Floor of every node on a path"""
+    if isinstance(graph, CSRGraph):
+        index = graph.index
+        return np.frombuffer(graph.layers, dtype=np.int32)[[index[node_id] for node_id in path]]
+    if hasattr(graph, 'layers'):
+        return np.fromiter(map(graph.layers.__getitem__, path), dtype=np.int64, count=len(path))
+    return np.array([int(graph.nodes[node_id].layer) for node_id in path], dtype=np.int64)
+
+def path_turns(graph, path: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Classify every bend of a path at once.
+
+    Returns:
+        Tuple of (segment lengths, turns) where turns[i] is the direction taken at
+        path[i + 1]: 0 straight, 1 left, -1 right (same rules as get_relative_direction)
+    """
+    xs, ys = _path_coordinates(graph, path)
+    dx, dy = np.diff(xs), np.diff(ys)
+    lengths = np.hypot(dx, dy)
+
+    # Compare |cos| against 0.95 without normalizing: |a.b| > 0.95 |a||b|
+    dot = dx[:-1] * dx[1:] + dy[:-1] * dy[1:]
+    cross = dx[:-1] * dy[1:] - dy[:-1] * dx[1:]
+    norms = lengths[:-1] * lengths[1:]
+    turns = np.where(cross > 0, 1, -1)
+    turns[(norms == 0) | (np.abs(dot) > 0.95 * norms)] = 0
+    return lengths, turns
+
+def get_navigation_steps(graph: NavigationGraph, path: List[str],
+                         landmarks: Optional[Dict[str, str]] = None) -> List[Dict]:
+    """
+    Structured version of get_navigation_instructions.
+
+    Each step covers one straight run, or one ride up or down stairs or an elevator
+    (direction "up"/"down"). Besides the direction and distance it names the node the
+    step ends at, its type and floor, and a landmark description for it when one is
+    given (e.g. decision point or room descriptions).
+
+    Args:
+        graph: The navigation graph containing the nodes (a RoutingGraph or CSRGraph also works)
+        path: A list of node IDs representing the path
+        landmarks: Optional {node_id: description}
+
+    Returns:
+        A list of dicts with direction, distance (feet), instruction, start, end,
+        end_type, floor and landmark keys
+    """
+    if not path or len(path) < 2:
+        return []
+
+    lengths, turns = path_turns(graph, path)
+    # Per-segment distances are rounded before summing, as the instructions always have been
+    feet = np.rint(lengths).astype(np.int64)
+    layers = _path_layers(graph, path)
+    vertical = layers[1:] != layers[:-1]
+
+    # A new step starts at the first segment, after every bend that isn't straight, and where
+    # a run of floor changes begins or ends; bends within such a run don't start a step
+    starts = np.concatenate(([0], np.flatnonzero(turns) + 1))
+    if vertical.any():
+        starts = np.union1d(starts, np.flatnonzero(vertical[1:] != vertical[:-1]) + 1)
+        inside = np.zeros(len(starts), dtype=bool)
+        inside[1:] = vertical[starts[1:]] & vertical[starts[1:] - 1]
+        starts = starts[~inside]
+    distances = np.add.reduceat(feet, starts)
+    ends = np.append(starts[1:], len(path) - 1)
+
+    steps = []
+    for start, end, distance in zip(starts.tolist(), ends.tolist(), distances.tolist()):
+        end_id = path[end]
+        floor = int(layers[end])
+        if vertical[start]:
+            direction = "up" if floor > layers[start] else "down"
+            instruction = f"{direction}: take the {_node_type(graph, path[start])} to floor {floor}"
+        else:
+            turn = turns[start - 1] if start and not vertical[start - 1] else 0
+            direction = "forward" if not turn else ("left" if turn > 0 else "right")
+            instruction = f"{direction}: {distance} feet"
+        steps.append({
+            'direction': direction,
+            'distance': distance,
+            'instruction': instruction,
+            'start': path[start],
+            'end': end_id,
+            'end_type': _node_type(graph, end_id),
+            'floor': floor,
+            'landmark': landmarks.get(end_id) if landmarks else None,
+        })
+    return steps
 
 def get_navigation_instructions(graph: NavigationGraph, path: List[str]) -> List[str]:
     """
@@ -7,61 +121,13 @@ def get_navigation_instructions(graph: NavigationGraph, path: List[str]) -> List
     Each instruction has the format: "[direction]: [distance in feet]"
     
     Args:
-        graph: The navigation graph containing the nodes
+        graph: The navigation graph containing the nodes (a RoutingGraph or CSRGraph also works)
         path: A list of node IDs representing the path
         
     Returns:
         A list of string instructions
     """
-    if not path or len(path) < 2:
-        return []
-    
-    instructions = []
-    current_direction = "forward"  # Default initial direction
-    current_distance = 0
-    
-    # Need at least three nodes to determine a turn
-    for i in range(len(path) - 1):
-        # Get current and next nodes
-        current_node = graph.nodes[path[i]]
-        next_node = graph.nodes[path[i + 1]]
-        
-        # Calculate segment vector
-        dx = float(next_node.x) - float(current_node.x)
-        dy = float(next_node.y) - float(current_node.y)
-        
-        # Calculate distance for this segment
-        distance = graph._calculate_distance(current_node, next_node)
-        distance_feet = round(distance)
-        
-        # For the first segment, we just move forward
-        if i == 0:
-            current_distance = distance_feet
-            continue
-        
-        # For subsequent segments, we need to determine if we're turning
-        prev_node = graph.nodes[path[i-1]]
-        
-        # Calculate previous segment vector
-        prev_dx = float(current_node.x) - float(prev_node.x)
-        prev_dy = float(current_node.y) - float(prev_node.y)
-        
-        # Determine turn direction
-        turn_direction = get_relative_direction(prev_dx, prev_dy, dx, dy)
-        
-        # If direction changed, add the previous instruction and start a new one
-        if turn_direction != "straight":
-            instructions.append(f"{current_direction}: {current_distance} feet")
-            current_direction = turn_direction
-            current_distance = distance_feet
-        else:
-            # Continue straight, add to the distance
-            current_distance += distance_feet
-    
-    # Add the last instruction
-    instructions.append(f"{current_direction}: {current_distance} feet")
-    
-    return instructions
+    return [step['instruction'] for step in get_navigation_steps(graph, path)]
 
 def get_relative_direction(prev_dx: float, prev_dy: float, dx: float, dy: float) -> str:
     """
@@ -0,0 +1,232 @@
+# models/cluster_hierarchy.py
+import heapq
+import math
+import threading
+from array import array
+from typing import Dict, List, Optional, Tuple, Union
+
+from navigation_system.models.csr_graph import CSRGraph, HALLWAY, KEYCARD
+
+DEFAULT_CLUSTER_SIZE = 200.0  # feet; corridors are cut into square cells of one floor
+
+# (node index, non_hallway_count, distance, route) of a move in the portal graph. The route
+# is None for a single edge, the portal whose PortalTree holds it, or a list of node indices.
+Link = Tuple[int, int, float, Union[None, int, List[int]]]
+
+
+class PortalTree:
+    """Shortest path tree from one portal over its cluster, in local node indices"""
+
+    def __init__(self, hierarchy: "ClusterHierarchy", portal: int, prefer_hallways: bool, has_keycard: bool):
+        csr, cluster, local = hierarchy.csr, hierarchy.cluster, hierarchy.local
+        members = hierarchy.members[cluster[portal]]
+        offsets, targets, weights, flags = csr.offsets, csr.targets, csr.weights, csr.flags
+        skip = 0 if has_keycard else KEYCARD
+        home = cluster[portal]
+        inf = float('inf')
+
+        non_hallway = array('i', [0]) * len(members)
+        distance = array('d', [inf]) * len(members)
+        parent = array('i', [-1]) * len(members)
+        settled = bytearray(len(members))
+        distance[local[portal]] = 0.0
+
+        heap = [(0, 0.0, portal)]
+        while heap:
+            current_non_hallway, current_distance, current = heapq.heappop(heap)
+            i = local[current]
+            if settled[i]:
+                continue
+            settled[i] = 1
+            for k in range(offsets[current], offsets[current + 1]):
+                flag = flags[k]
+                neighbor = targets[k]
+                if flag & skip or cluster[neighbor] != home:
+                    continue
+                j = local[neighbor]
+                if settled[j]:
+                    continue
+                cost = (current_non_hallway + 1 if prefer_hallways and not flag & HALLWAY else current_non_hallway,
+                        current_distance + weights[k])
+                if distance[j] == inf or cost < (non_hallway[j], distance[j]):
+                    non_hallway[j], distance[j] = cost
+                    parent[j] = i
+                    heapq.heappush(heap, (cost[0], cost[1], neighbor))
+
+        self.portal = portal
+        self.members = members
+        self.non_hallway = non_hallway
+        self.distance = distance
+        self.parent = parent
+
+    def cost(self, local_index: int) -> Optional[Tuple[int, float]]:
+        """(non_hallway_count, distance) between the portal and a node of its cluster, None if unreachable"""
+        if self.distance[local_index] == float('inf'):
+            return None
+        return self.non_hallway[local_index], self.distance[local_index]
+
+    def route(self, local_index: int) -> List[int]:
+        """Node indices from a node of the cluster to the portal"""
+        members, parent = self.members, self.parent
+        route = [members[local_index]]
+        while parent[local_index] != -1:
+            local_index = parent[local_index]
+            route.append(members[local_index])
+        return route
+
+
+class PortalGraph:
+    """
+    Abstract graph of one routing profile (hallway preference, keycard access).
+
+    Portals are the nodes with a usable edge into another cluster. Each portal keeps
+    a shortest path tree over its own cluster, which gives its links to the other
+    portals of the cluster and, at query time, the start's and goal's links to it;
+    portals of neighbouring clusters are linked by the original edges. Any route
+    splits into such pieces, so a search over portals finds exactly the cost a flat
+    search would.
+    """
+
+    def __init__(self, hierarchy: "ClusterHierarchy", prefer_hallways: bool, has_keycard: bool):
+        csr, cluster = hierarchy.csr, hierarchy.cluster
+        offsets, targets, weights, flags = csr.offsets, csr.targets, csr.weights, csr.flags
+        skip = 0 if has_keycard else KEYCARD
+        self.prefer_hallways = prefer_hallways
+        self.has_keycard = has_keycard
+
+        self.links: Dict[int, List[Link]] = {}  # portal -> moves to other portals
+        self.portals: Dict[int, List[int]] = {}  # cluster -> its portals
+        for i in range(len(csr)):
+            for k in range(offsets[i], offsets[i + 1]):
+                if not flags[k] & skip and cluster[targets[k]] != cluster[i]:
+                    if i not in self.links:
+                        self.links[i] = []
+                        self.portals.setdefault(cluster[i], []).append(i)
+                    self.links[i].append(
+                        (targets[k], 0 if not prefer_hallways or flags[k] & HALLWAY else 1, weights[k], None))
+
+        self.trees: Dict[int, PortalTree] = {}
+        self.shortcuts = 0
+        for portals in self.portals.values():
+            for portal in portals:
+                self.trees[portal] = PortalTree(hierarchy, portal, prefer_hallways, has_keycard)
+            for portal in portals:
+                # The tree of the portal a route ends at holds it
+                for other in portals:
+                    cost = self.trees[other].cost(hierarchy.local[portal]) if other != portal else None
+                    if cost is not None:
+                        self.links[portal].append((other, cost[0], cost[1], other))
+                        self.shortcuts += 1
+
+    def __contains__(self, i: int) -> bool:
+        return i in self.links
+
+    def portal_links(self, hierarchy: "ClusterHierarchy", i: int) -> List[Link]:
+        """Moves from node i to every portal of its cluster it can reach"""
+        links = []
+        local = hierarchy.local[i]
+        for portal in self.portals.get(hierarchy.cluster[i], ()):
+            cost = self.trees[portal].cost(local)
+            if cost is not None:
+                links.append((portal, cost[0], cost[1], portal))
+        return links
+
+
+class ClusterHierarchy:
+    """
+    A CSRGraph grouped into clusters for hierarchical routing.
+
+    Corridor nodes (those with a hallway edge) are grouped by floor and by square
+    cells of cluster_size feet, so a cluster is one wing of one floor of one building;
+    every other node (rooms, mostly) joins the cluster of a corridor node it opens
+    onto, so cluster edges run along corridors rather than between rooms and their
+    doors. The PortalGraph of a routing profile is built the first time that profile
+    is routed and kept for the life of the graph version.
+    """
+
+    def __init__(self, csr: CSRGraph, cluster_size: float = DEFAULT_CLUSTER_SIZE):
+        self.csr = csr
+        self.cluster_size = cluster_size
+        offsets, targets, flags, layers = csr.offsets, csr.targets, csr.flags, csr.layers
+
+        def cell(i: int) -> Tuple[int, int, int]:
+            return layers[i], math.floor(csr.xs[i] / cluster_size), math.floor(csr.ys[i] / cluster_size)
+
+        corridor = [any(flags[k] & HALLWAY for k in range(offsets[i], offsets[i + 1])) for i in range(len(csr))]
+        keys = {}
+        self.cluster = array('i')
+        for i in range(len(csr)):
+            if not corridor[i]:
+                i = next((targets[k] for k in range(offsets[i], offsets[i + 1])
+                          if corridor[targets[k]] and layers[targets[k]] == layers[i]), i)
+            self.cluster.append(keys.setdefault(cell(i), len(keys)))
+
+        self.members: List[List[int]] = [[] for _ in keys]  # cluster -> node indices
+        self.local = array('i')  # node index -> index within its cluster
+        for i, c in enumerate(self.cluster):
+            self.local.append(len(self.members[c]))
+            self.members[c].append(i)
+        self._profiles: Dict[Tuple[bool, bool], PortalGraph] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, node_id) -> bool:
+        return node_id in self.csr
+
+    def __len__(self) -> int:
+        return len(self.csr)
+
+    @property
+    def cluster_count(self) -> int:
+        return len(self.members)
+
+    def portal_graph(self, prefer_hallways: bool = True, has_keycard: bool = False) -> PortalGraph:
+        """The PortalGraph of a routing profile, built on first use"""
+        key = (bool(prefer_hallways), bool(has_keycard))
+        portal_graph = self._profiles.get(key)
+        if portal_graph is None:
+            with self._lock:
+                portal_graph = self._profiles.get(key)
+                if portal_graph is None:
+                    portal_graph = self._profiles[key] = PortalGraph(self, *key)
+        return portal_graph
+
+    def cluster_route(self, start: int, goal: int, prefer_hallways: bool,
+                      has_keycard: bool) -> Optional[Tuple[int, float, List[int]]]:
+        """
+        Cheapest route between two nodes of one cluster that stays inside it.
+
+        Returns:
+            (non_hallway_count, distance, node indices), or None if there is none
+        """
+        csr, cluster = self.csr, self.cluster
+        offsets, targets, weights, flags = csr.offsets, csr.targets, csr.weights, csr.flags
+        skip = 0 if has_keycard else KEYCARD
+        home = cluster[start]
+        best = {start: (0, 0.0)}
+        parent = {start: -1}
+        settled = set()
+
+        heap = [(0, 0.0, start)]
+        while heap:
+            non_hallway, distance, current = heapq.heappop(heap)
+            if current in settled:
+                continue
+            if current == goal:
+                route = [goal]
+                while parent[route[-1]] != -1:
+                    route.append(parent[route[-1]])
+                return non_hallway, distance, route[::-1]
+            settled.add(current)
+            for k in range(offsets[current], offsets[current + 1]):
+                flag = flags[k]
+                neighbor = targets[k]
+                if flag & skip or neighbor in settled or cluster[neighbor] != home:
+                    continue
+                cost = (non_hallway + 1 if prefer_hallways and not flag & HALLWAY else non_hallway,
+                        distance + weights[k])
+                known = best.get(neighbor)
+                if known is None or cost < known:
+                    best[neighbor] = cost
+                    parent[neighbor] = current
+                    heapq.heappush(heap, (cost[0], cost[1], neighbor))
+        return None
@@ -0,0 +1,188 @@
+# models/csr_graph.py
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+from navigation_system.models.routing_graph import RoutingGraph
+
+# Edge flag bits
+HALLWAY = 1
+KEYCARD = 2
+FLOOR_CHANGE = 4  # endpoints are on different floors (stairs, elevator)
+
+# Numeric arrays of a CSRGraph, in the order they are laid out in shared memory and snapshot files
+ARRAY_FIELDS = ('layers', 'xs', 'ys', 'offsets', 'targets', 'weights', 'flags')
+
+
+def typecode(values) -> str:
+    """Element type of an array or of a memoryview cast to one"""
+    return values.format if isinstance(values, memoryview) else values.typecode
+
+
+def id_type(ids) -> Optional[str]:
+    """
+    Name of the type of a graph's node ids ("str" from CSV exports, often "int" from
+    Supabase), "mixed" if they differ, None if there are none.
+
+    Versions compare ids as text, so artifacts built offline record this as well:
+    "12" never finds node 12.
+    """
+    names = {type(node_id).__name__ for node_id in ids}
+    if len(names) > 1:
+        return "mixed"
+    return names.pop() if names else None
+
+
+def array_layout(graph: "CSRGraph") -> Tuple[Dict[str, Tuple[str, int, int]], int]:
+    """
+    Pack a graph's numeric arrays back to back, each 8-byte aligned.
+
+    Returns:
+        ({field: (typecode, byte offset, length)}, total size in bytes)
+    """
+    layout = {}
+    size = 0
+    for field in ARRAY_FIELDS:
+        values = getattr(graph, field)
+        size = -(-size // 8) * 8
+        layout[field] = (typecode(values), size, len(values))
+        size += values.itemsize * len(values)
+    return layout, size
+
+
+class CSRGraph:
+    """
+    Compressed-sparse-row routing graph.
+
+    Nodes are addressed by integer index; `ids[i]` maps back to the original node id.
+    Coordinates are contiguous float64 arrays, and the neighbors of node i are
+    `targets[offsets[i]:offsets[i + 1]]` with matching `weights` and `flags` entries.
+    Keycard-only edges carry the KEYCARD flag and are skipped for regular users, and
+    edges between floors carry FLOOR_CHANGE.
+    """
+
+    def __init__(self, ids: List, types: List[str], layers: array, xs: array, ys: array,
+                 offsets: array, targets: array, weights: array, flags: array,
+                 version: Optional[str] = None):
+        self.ids = ids
+        self.index: Dict = {node_id: i for i, node_id in enumerate(ids)}
+        self.id_type = id_type(ids)
+        self.types = types
+        self.layers = layers
+        self.xs = xs
+        self.ys = ys
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.flags = flags
+        self.version = version
+        self._floors = None
+        self._hierarchy = None
+        self._landmarks = None
+
+    @classmethod
+    def from_routing_graph(cls, routing_graph: RoutingGraph) -> "CSRGraph":
+        """Pack a RoutingGraph (regular edges plus keycard overlay) into CSR arrays"""
+        ids = list(routing_graph.nodes)
+        types = [routing_graph.nodes[node_id].type_name for node_id in ids]
+        layers = array('i', (int(routing_graph.nodes[node_id].layer) for node_id in ids))
+        xs = array('d', (routing_graph.positions[node_id][0] for node_id in ids))
+        ys = array('d', (routing_graph.positions[node_id][1] for node_id in ids))
+        index = {node_id: i for i, node_id in enumerate(ids)}
+
+        offsets = array('q', [0])
+        targets = array('i')
+        weights = array('d')
+        flags = array('B')
+        for node_id in ids:
+            regular = {neighbor_id for neighbor_id, _, _ in routing_graph.neighbors(node_id)}
+            layer = layers[index[node_id]]
+            for neighbor_id, weight, is_hallway in routing_graph.neighbors(node_id, has_keycard=True):
+                flag = HALLWAY if is_hallway else 0
+                if neighbor_id not in regular:
+                    flag |= KEYCARD
+                if layers[index[neighbor_id]] != layer:
+                    flag |= FLOOR_CHANGE
+                targets.append(index[neighbor_id])
+                weights.append(weight)
+                flags.append(flag)
+            offsets.append(len(targets))
+
+        return cls(ids, types, layers, xs, ys, offsets, targets, weights, flags,
+                   version=routing_graph.version)
+
+    @classmethod
+    def from_buffer(cls, buffer, layout: Dict, ids: List, types: List[str],
+                    version: Optional[str] = None) -> "CSRGraph":
+        """CSRGraph whose arrays are zero-copy memoryviews into buffer, laid out by array_layout()"""
+        buffer = memoryview(buffer)
+        arrays = {}
+        for field, (code, offset, length) in layout.items():
+            itemsize = array(code).itemsize
+            arrays[field] = buffer[offset:offset + itemsize * length].cast(code)
+        return cls(ids, types, version=version, **arrays)
+
+    def __contains__(self, node_id) -> bool:
+        return node_id in self.index
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def edge_count(self) -> int:
+        """Number of stored (directed) adjacency entries"""
+        return len(self.targets)
+
+    def position(self, node_id) -> Tuple[float, float]:
+        """Get the (x, y) coordinates of a node"""
+        i = self.index[node_id]
+        return self.xs[i], self.ys[i]
+
+    def type_name(self, node_id) -> str:
+        return self.types[self.index[node_id]]
+
+    def layer(self, node_id) -> int:
+        """Get the floor a node is on"""
+        return self.layers[self.index[node_id]]
+
+    @property
+    def floors(self):
+        """FloorPartitions of this graph; each floor's subgraph is built on first use"""
+        if self._floors is None:
+            from navigation_system.models.floor_partitions import FloorPartitions
+            self._floors = FloorPartitions(self)
+        return self._floors
+
+    @property
+    def hierarchy(self):
+        """ClusterHierarchy of this graph for hierarchical routing, built on first use"""
+        if self._hierarchy is None:
+            from navigation_system.models.cluster_hierarchy import ClusterHierarchy
+            self._hierarchy = ClusterHierarchy(self)
+        return self._hierarchy
+
+    @property
+    def landmarks(self):
+        """Landmarks of this graph for ALT bounds, selected on first use"""
+        if self._landmarks is None:
+            from navigation_system.models.landmarks import Landmarks
+            self._landmarks = Landmarks(self)
+        return self._landmarks
+
+    def neighbor_indices(self, i: int, has_keycard: bool = False) -> Iterator[Tuple[int, float, bool]]:
+        """Yield (neighbor_index, weight, is_hallway) for node index i"""
+        targets, weights, flags = self.targets, self.weights, self.flags
+        for k in range(self.offsets[i], self.offsets[i + 1]):
+            flag = flags[k]
+            if flag & KEYCARD and not has_keycard:
+                continue
+            yield targets[k], weights[k], bool(flag & HALLWAY)
+
+    def neighbors(self, node_id, has_keycard: bool = False) -> List[Tuple[str, float, bool]]:
+        """Get (neighbor_id, weight, is_hallway) tuples for a node"""
+        ids = self.ids
+        return [(ids[j], weight, is_hallway)
+                for j, weight, is_hallway in self.neighbor_indices(self.index[node_id], has_keycard)]
+
+    def nbytes(self) -> int:
+        """Approximate size of the numeric arrays in bytes"""
+        arrays = (self.layers, self.xs, self.ys, self.offsets, self.targets, self.weights, self.flags)
+        return sum(a.itemsize * len(a) for a in arrays)
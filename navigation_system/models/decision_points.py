@@ -3,14 +3,20 @@ import json
 import sqlite3
 from typing import Dict, Optional, List, Tuple
 from navigation_system.models.node import NavigationGraph
+from navigation_system.models.fingerprint_store import FingerprintStore
+from navigation_system.models.fingerprint_index import StrongestAPIndex
 
 class DecisionPointManager:
     """Manages decision points with WiFi fingerprints for indoor positioning"""
     
-    def __init__(self, db_path: str, graph: NavigationGraph):
+    def __init__(self, db_path: str, graph: NavigationGraph, strongest_aps: int = 0):
         self.db_path = db_path
         self.graph = graph
         self.decision_points = {}  # Cache of decision points
+        self.similarity_threshold = 8.0  # dBm threshold (adjust based on testing)
+        self.fingerprints = FingerprintStore(self.similarity_threshold)
+        # Prune to points sharing one of the scan's strongest APs (0 = score every point)
+        self.fingerprint_index = StrongestAPIndex(self.fingerprints, strongest_aps) if strongest_aps > 0 else None
         self.load_decision_points()
         
     def load_decision_points(self) -> None:
@@ -43,6 +49,9 @@ class DecisionPointManager:
                 }
             
             conn.close()
+            self.fingerprints.set_all({
+                node_id: data['fingerprint'] for node_id, data in self.decision_points.items()
+            })
         except Exception as e:
             print(f"Error loading decision points: {e}")
     
@@ -51,23 +60,8 @@ class DecisionPointManager:
         if not wifi_signals or not self.decision_points:
             return None
             
-        best_match = None
-        best_score = float('inf')
-        
-        for node_id, data in self.decision_points.items():
-            fingerprint = data['fingerprint']
-            score = self._calculate_similarity(wifi_signals, fingerprint)
-            
-            if score < best_score:
-                best_score = score
-                best_match = node_id
-        
-        # Only return a match if the similarity is good enough
-        similarity_threshold = 8.0  # dBm threshold (adjust based on testing)
-        if best_score <= similarity_threshold:
-            return best_match
-            
-        return None
+        # Score against every decision point at once (same RMS metric as _calculate_similarity)
+        return self.fingerprints.locate(wifi_signals, self.similarity_threshold, self.fingerprint_index)
     
     def _calculate_similarity(self, current_signals: Dict[str, float], 
                               fingerprint: Dict[str, float]) -> float:
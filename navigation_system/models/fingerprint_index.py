@@ -0,0 +1,60 @@
+# models/fingerprint_index.py
+from typing import Dict, Optional
+
+import numpy as np
+
+from navigation_system.models.fingerprint_store import FingerprintMatrix, FingerprintStore
+
+
+class StrongestAPIndex:
+    """
+    Inverted index from BSSID to the reference points where it is one of the loudest APs.
+
+    Each reference point is posted under its `point_aps` strongest access points. A
+    scan's candidates are the points posted under any of the scan's `strongest`
+    loudest APs, and only those are scored exactly with FingerprintStore.scores.
+    Strong signals come from nearby APs, so the true position almost always shares
+    one, while points that only match on weak, distant APs are never scored. The
+    postings are rebuilt automatically when the store changes, for the matrix a
+    query holds.
+    """
+
+    def __init__(self, store: FingerprintStore, strongest: int = 3, point_aps: int = 8):
+        self.store = store
+        self.strongest = strongest
+        self.point_aps = point_aps
+        self._postings = (None, {})  # (revision, {bssid: rows}), replaced whole so readers never mix versions
+
+    def _build(self, matrix: FingerprintMatrix) -> Dict[str, np.ndarray]:
+        postings = {}
+        if len(matrix) and matrix.bssid_index:
+            rssi = np.where(matrix.mask, matrix.rssi, -np.inf)
+            loudest = np.argsort(-rssi, axis=1, kind='stable')[:, :self.point_aps]
+            rows = np.repeat(np.arange(len(matrix)), loudest.shape[1])
+            columns = loudest.ravel()
+            heard = matrix.mask[rows, columns]
+            rows, columns = rows[heard], columns[heard]
+
+            order = np.argsort(columns, kind='stable')
+            rows, columns = rows[order], columns[order]
+            bounds = np.searchsorted(columns, np.arange(len(matrix.bssid_index) + 1))
+            postings = {
+                bssid: rows[bounds[column]:bounds[column + 1]]
+                for bssid, column in matrix.bssid_index.items()
+                if bounds[column] < bounds[column + 1]
+            }
+        return postings
+
+    def candidates(self, scan: Dict[str, float], matrix: Optional[FingerprintMatrix] = None) -> np.ndarray:
+        """Row indices into matrix (the store's current one by default) worth scoring for this scan"""
+        matrix = matrix if matrix is not None else self.store.current
+        revision, postings = self._postings
+        if revision != matrix.revision:
+            postings = self._build(matrix)
+            self._postings = (matrix.revision, postings)
+
+        known = sorted(((rssi, bssid) for bssid, rssi in scan.items() if bssid in postings), reverse=True)
+        chosen = [postings[bssid] for _, bssid in known[:self.strongest]]
+        if not chosen:
+            return np.zeros(0, dtype=np.intp)
+        return np.unique(np.concatenate(chosen))
@@ -0,0 +1,258 @@
+# models/fingerprint_store.py
+import threading
+from typing import Dict, Hashable, Iterable, List, Optional
+
+import numpy as np
+
+
+class FingerprintMatrix:
+    """
+    One immutable version of a FingerprintStore's fingerprints as a dense RSSI matrix.
+
+    Each BSSID maps to a column; row i holds the fingerprint of node_ids[i] with a
+    presence mask for the access points it saw. Scans are scored against every
+    reference point at once using the same metric as calculate_wifi_similarity:
+    the RMS difference over the access points both have in common (inf if none).
+
+    Arrays are read-only and never change after construction, so a reader that takes
+    one matrix for a whole query sees row indices, columns and values that agree.
+    """
+
+    def __init__(self, node_ids: List[Hashable], bssid_index: Dict[str, int], rssi: np.ndarray,
+                 mask: np.ndarray, revision: int = 0):
+        self.node_ids = node_ids
+        self.bssid_index = bssid_index
+        self.rssi = rssi
+        self.mask = mask
+        self.revision = revision  # bumped on every change so indexes know to rebuild
+        self._row = {node_id: i for i, node_id in enumerate(node_ids)}
+        # Masked terms used to expand sum((r - v)^2) into matrix products
+        self._present = mask.astype(np.float64)
+        self._r = np.where(mask, rssi, 0.0)
+        self._r2 = self._r * self._r
+        for values in (self.rssi, self.mask, self._present, self._r, self._r2):
+            values.flags.writeable = False
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def __contains__(self, node_id) -> bool:
+        return node_id in self._row
+
+    def rows(self, node_ids: Iterable[Hashable]) -> np.ndarray:
+        """Row index of each node's fingerprint, -1 for nodes without one"""
+        return np.array([self._row.get(node_id, -1) for node_id in node_ids], dtype=np.intp)
+
+    def vectorize(self, scans: Iterable[Dict[str, float]]) -> tuple:
+        """Turn scans into (values, presence) matrices over the known BSSID columns"""
+        scans = list(scans)
+        values = np.zeros((len(scans), len(self.bssid_index)))
+        present = np.zeros((len(scans), len(self.bssid_index)))
+        for i, scan in enumerate(scans):
+            for bssid, value in scan.items():
+                column = self.bssid_index.get(bssid)
+                if column is not None:
+                    values[i, column] = value
+                    present[i, column] = 1.0
+        return values, present
+
+    def scores_batch(self, scans: Iterable[Dict[str, float]]) -> np.ndarray:
+        """
+        Score scans against every reference point (lower is better).
+
+        Returns:
+            Array of shape (len(scans), len(self)) with RMS differences over common APs
+        """
+        values, present = self.vectorize(scans)
+        # sum over common APs of (r - v)^2 = r^2 . m_s - 2 r . (m_s v) + m_r . (m_s v^2)
+        sum_squared_diff = (self._r2 @ present.T
+                            - 2.0 * self._r @ (present * values).T
+                            + self._present @ (present * values * values).T).T
+        common = (self._present @ present.T).T
+
+        scores = np.full(common.shape, np.inf)
+        has_common = common > 0
+        scores[has_common] = np.sqrt(np.maximum(sum_squared_diff[has_common], 0.0) / common[has_common])
+        return scores
+
+    def scores(self, scan: Dict[str, float], rows: Optional[np.ndarray] = None,
+               missing: Optional[float] = None) -> np.ndarray:
+        """
+        Score one scan against all reference points, or only the given row indices.
+
+        With missing set to a dBm floor, the RMS is taken over every AP either side heard,
+        with the absent readings counted as that floor. This penalises points that match
+        on a single weak AP, which the common-AP metric scores as a perfect match. APs
+        no reference point has heard are ignored either way.
+        """
+        if rows is None:
+            if missing is None:
+                return self.scores_batch([scan])[0]
+            rows = np.arange(len(self))
+
+        values, present = self.vectorize([scan])
+        heard = present[0] > 0
+        if missing is None:
+            counted = self.mask[rows] & heard
+            reference, current = self.rssi[rows], values[0]
+        else:
+            counted = self.mask[rows] | heard
+            reference = np.where(self.mask[rows], self.rssi[rows], missing)
+            current = np.where(heard, values[0], missing)
+        diff = np.where(counted, reference - current, 0.0)
+        count = counted.sum(axis=1)
+        scores = np.full(len(rows), np.inf)
+        has_common = count > 0
+        scores[has_common] = np.sqrt((diff[has_common] ** 2).sum(axis=1) / count[has_common])
+        return scores
+
+
+class FingerprintStore:
+    """
+    WiFi fingerprints of reference points, scored as a FingerprintMatrix.
+
+    Changes never edit the arrays in place: each builds a new FingerprintMatrix and
+    publishes it with one assignment to `current`, under a lock that only writers take.
+    Queries read `current` once, so a fingerprint added from a request handler cannot
+    leave another thread scoring against half-updated arrays. Callers that combine
+    several queries (row lookups, then scores) take `current` themselves.
+    """
+
+    def __init__(self, threshold: float = 10.0):
+        self.threshold = threshold
+        self.current = FingerprintMatrix([], {}, np.zeros((0, 0)), np.zeros((0, 0), dtype=bool))
+        self._lock = threading.Lock()
+
+    @property
+    def node_ids(self) -> List[Hashable]:
+        return self.current.node_ids
+
+    @property
+    def bssid_index(self) -> Dict[str, int]:
+        return self.current.bssid_index
+
+    @property
+    def rssi(self) -> np.ndarray:
+        return self.current.rssi
+
+    @property
+    def mask(self) -> np.ndarray:
+        return self.current.mask
+
+    @property
+    def revision(self) -> int:
+        return self.current.revision
+
+    def __len__(self) -> int:
+        return len(self.current)
+
+    def __contains__(self, node_id) -> bool:
+        return node_id in self.current
+
+    def rows(self, node_ids: Iterable[Hashable]) -> np.ndarray:
+        return self.current.rows(node_ids)
+
+    def vectorize(self, scans: Iterable[Dict[str, float]]) -> tuple:
+        return self.current.vectorize(scans)
+
+    def scores_batch(self, scans: Iterable[Dict[str, float]]) -> np.ndarray:
+        return self.current.scores_batch(scans)
+
+    def scores(self, scan: Dict[str, float], rows: Optional[np.ndarray] = None,
+               missing: Optional[float] = None) -> np.ndarray:
+        return self.current.scores(scan, rows, missing)
+
+    @classmethod
+    def from_fingerprints(cls, fingerprints: Dict[Hashable, Dict[str, float]],
+                          threshold: float = 10.0) -> "FingerprintStore":
+        """Build a store from {node_id: {bssid: rssi}}"""
+        store = cls(threshold)
+        store.set_all(fingerprints)
+        return store
+
+    def set_all(self, fingerprints: Dict[Hashable, Dict[str, float]]) -> None:
+        """Replace every fingerprint in one pass"""
+        bssids = {}
+        for fingerprint in fingerprints.values():
+            for bssid in fingerprint:
+                bssids.setdefault(bssid, len(bssids))
+
+        rssi = np.zeros((len(fingerprints), len(bssids)))
+        mask = np.zeros((len(fingerprints), len(bssids)), dtype=bool)
+        for i, fingerprint in enumerate(fingerprints.values()):
+            for bssid, value in fingerprint.items():
+                rssi[i, bssids[bssid]] = value
+                mask[i, bssids[bssid]] = True
+
+        with self._lock:
+            self.current = FingerprintMatrix(list(fingerprints), bssids, rssi, mask, self.current.revision + 1)
+
+    def add(self, node_id: Hashable, fingerprint: Dict[str, float]) -> None:
+        """Add or replace the fingerprint of one reference point"""
+        with self._lock:
+            matrix = self.current
+            node_ids, bssid_index = list(matrix.node_ids), dict(matrix.bssid_index)
+            rssi, mask = matrix.rssi, matrix.mask
+            new_bssids = [bssid for bssid in fingerprint if bssid not in bssid_index]
+            if new_bssids:
+                for bssid in new_bssids:
+                    bssid_index[bssid] = len(bssid_index)
+                extra = len(new_bssids)
+                rssi = np.pad(rssi, ((0, 0), (0, extra)))
+                mask = np.pad(mask, ((0, 0), (0, extra)))
+
+            row = matrix._row.get(node_id)
+            if row is None:
+                row = len(node_ids)
+                node_ids.append(node_id)
+                rssi = np.vstack([rssi, np.zeros((1, rssi.shape[1]))])
+                mask = np.vstack([mask, np.zeros((1, mask.shape[1]), dtype=bool)])
+            elif rssi is matrix.rssi:
+                rssi, mask = rssi.copy(), mask.copy()
+
+            rssi[row] = 0.0
+            mask[row] = False
+            for bssid, value in fingerprint.items():
+                rssi[row, bssid_index[bssid]] = value
+                mask[row, bssid_index[bssid]] = True
+            self.current = FingerprintMatrix(node_ids, bssid_index, rssi, mask, matrix.revision + 1)
+
+    def remove(self, node_id: Hashable) -> None:
+        with self._lock:
+            matrix = self.current
+            row = matrix._row[node_id]
+            node_ids = matrix.node_ids[:row] + matrix.node_ids[row + 1:]
+            self.current = FingerprintMatrix(node_ids, matrix.bssid_index, np.delete(matrix.rssi, row, axis=0),
+                                             np.delete(matrix.mask, row, axis=0), matrix.revision + 1)
+
+    def locate_batch(self, scans: Iterable[Dict[str, float]],
+                     threshold: Optional[float] = None) -> List[Optional[Hashable]]:
+        """Best matching reference point per scan, or None when no score is within the threshold"""
+        threshold = self.threshold if threshold is None else threshold
+        matrix = self.current
+        if not matrix.node_ids:
+            return [None for _ in scans]
+        scores = matrix.scores_batch(scans)
+        best = np.argmin(scores, axis=1)
+        return [matrix.node_ids[j] if scores[i, j] <= threshold else None for i, j in enumerate(best)]
+
+    def locate(self, scan: Dict[str, float], threshold: Optional[float] = None,
+               index=None) -> Optional[Hashable]:
+        """
+        Best matching reference point for one scan, or None when nothing is within the threshold.
+
+        With an index (see fingerprint_index.py) only its candidate points are scored exactly.
+        """
+        if not scan:
+            return None
+        if index is None:
+            return self.locate_batch([scan], threshold)[0]
+
+        threshold = self.threshold if threshold is None else threshold
+        matrix = self.current
+        rows = index.candidates(scan, matrix)
+        if len(rows) == 0:
+            return None
+        scores = matrix.scores(scan, rows)
+        best = int(np.argmin(scores))
+        return matrix.node_ids[rows[best]] if scores[best] <= threshold else None
@@ -0,0 +1,95 @@
+# models/floor_partitions.py
+import threading
+from array import array
+from typing import Dict, List, Tuple
+
+from navigation_system.models.csr_graph import CSRGraph
+
+# (neighbor index in the full graph, weight, flags, x, y, layer) of an edge out of a node
+Move = Tuple[int, float, int, float, float, int]
+
+
+class FloorGraph:
+    """
+    One floor of a CSRGraph, unpacked for searching.
+
+    The floor's nodes are renumbered 0..n-1; `nodes[i]` is node i's index in the full
+    graph. `moves[i]` lists every edge out of node i with the neighbor's coordinates
+    and floor inline, so a search reads one tuple per edge instead of indexing five
+    arrays. Edges that change floor (stairs, elevators) are included, and their
+    endpoints are also listed in `exits`.
+    """
+
+    def __init__(self, csr: CSRGraph, layer: int, members: List[int]):
+        self.layer = layer
+        self.nodes = array('i', members)
+        self.xs = array('d', (csr.xs[i] for i in members))
+        self.ys = array('d', (csr.ys[i] for i in members))
+        self.moves: List[Tuple[Move, ...]] = []
+        self.exits: Dict[int, List[int]] = {}  # local node -> full-graph neighbors on other floors
+
+        offsets, targets, weights, flags = csr.offsets, csr.targets, csr.weights, csr.flags
+        xs, ys, layers = csr.xs, csr.ys, csr.layers
+        for i, node in enumerate(members):
+            moves = []
+            for k in range(offsets[node], offsets[node + 1]):
+                target = targets[k]
+                moves.append((target, weights[k], flags[k], xs[target], ys[target], layers[target]))
+                if layers[target] != layer:
+                    self.exits.setdefault(i, []).append(target)
+            self.moves.append(tuple(moves))
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+
+class FloorPartitions:
+    """
+    A CSRGraph split into per-floor subgraphs.
+
+    Each floor's FloorGraph is built the first time something asks for it and kept
+    for the life of the graph version, so a search that stays on two floors of a
+    ten-floor building never builds (or touches the memory of) the other eight.
+    """
+
+    def __init__(self, csr: CSRGraph):
+        self.csr = csr
+        self.members: Dict[int, List[int]] = {}  # layer -> full-graph indices on that floor
+        self.local: List[int] = []  # full-graph index -> index within its floor
+        for i, layer in enumerate(csr.layers):
+            floor = self.members.setdefault(layer, [])
+            self.local.append(len(floor))
+            floor.append(i)
+        self._floors: Dict[int, FloorGraph] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, node_id) -> bool:
+        return node_id in self.csr
+
+    def __len__(self) -> int:
+        return len(self.csr)
+
+    @property
+    def layers(self) -> List[int]:
+        """Every floor of the building, bottom first"""
+        return sorted(self.members)
+
+    @property
+    def loaded(self) -> List[int]:
+        """Floors whose subgraph has been built so far"""
+        return sorted(self._floors)
+
+    def floor(self, layer: int) -> FloorGraph:
+        """The subgraph of one floor, built on first use"""
+        floor = self._floors.get(layer)
+        if floor is None:
+            with self._lock:
+                floor = self._floors.get(layer)
+                if floor is None:
+                    floor = self._floors[layer] = FloorGraph(self.csr, layer, self.members.get(layer, []))
+        return floor
+
+    def node_ids(self, layer: int) -> List:
+        """Ids of the nodes on a floor"""
+        ids = self.csr.ids
+        return [ids[i] for i in self.members.get(layer, [])]
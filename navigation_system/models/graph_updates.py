@@ -0,0 +1,248 @@
+# models/graph_updates.py
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from navigation_system.models.node import NavigationGraph
+from navigation_system.models.routing_graph import RoutingGraphStore
+from navigation_system.utils.graph_io import point_layer
+
+POINT_TABLE = "Point Table"
+EDGE_TABLE = "Edge Table"
+KEYCARD_EDGE_TABLE = "Keycard Edge Table"
+GRAPH_TABLES = (POINT_TABLE, EDGE_TABLE, KEYCARD_EDGE_TABLE)
+
+
+@dataclass
+class GraphChange:
+    """A single row change in one of the graph tables"""
+    table: str
+    op: str  # "insert", "update" or "delete"
+    key: Tuple
+    record: Optional[Dict] = None
+    old_record: Optional[Dict] = None
+
+
+def row_key(table: str, row: Dict) -> Tuple:
+    """Identify a row: points by pointnum, edges by their (unordered) endpoints"""
+    if table == POINT_TABLE:
+        return (row['pointnum'],)
+    a, b = row['pointnum1'], row['pointnum2']
+    return (a, b) if str(a) <= str(b) else (b, a)
+
+
+def diff_rows(table: str, old_rows: Dict[Tuple, Dict], new_rows: Iterable[Dict]) -> List[GraphChange]:
+    """Compare a table's previous rows (keyed by row_key) with a fresh fetch"""
+    changes = []
+    seen = set()
+    for row in new_rows:
+        key = row_key(table, row)
+        seen.add(key)
+        old = old_rows.get(key)
+        if old is None:
+            changes.append(GraphChange(table, "insert", key, row))
+        elif old != row:
+            changes.append(GraphChange(table, "update", key, row, old))
+    for key, old in old_rows.items():
+        if key not in seen:
+            changes.append(GraphChange(table, "delete", key, None, old))
+    return changes
+
+
+def _hallway(row: Optional[Dict]) -> bool:
+    return bool(row and row.get('hallway', False))
+
+
+class GraphUpdater:
+    """
+    Applies row changes from the graph tables to the live graph.
+
+    Changes are applied to a copy of the NavigationGraph whose nodes are then swapped
+    in, and a new RoutingGraph snapshot is published, so requests already running keep
+    a consistent view. Cached routes are only dropped when the change can affect them:
+    removing or worsening an edge or node only invalidates routes through it, while
+    anything that can make a route shorter (new edges, moved nodes, a corridor
+    becoming a hallway) invalidates every cached route.
+    """
+
+    def __init__(self, graph: NavigationGraph, store: RoutingGraphStore, route_cache=None,
+                 point_rows: Iterable[Dict] = (), edge_rows: Iterable[Dict] = (),
+                 keycard_edge_rows: Iterable[Dict] = ()):
+        self.graph = graph
+        self.store = store
+        self.route_cache = route_cache
+        self.rows = {
+            POINT_TABLE: {row_key(POINT_TABLE, row): row for row in point_rows},
+            EDGE_TABLE: {row_key(EDGE_TABLE, row): row for row in edge_rows},
+            KEYCARD_EDGE_TABLE: {row_key(KEYCARD_EDGE_TABLE, row): row for row in keycard_edge_rows},
+        }
+        self.listeners: List[Callable[[List[GraphChange], Set], None]] = []
+        self._lock = threading.Lock()
+
+    def diff(self, tables: Dict[str, Iterable[Dict]]) -> List[GraphChange]:
+        """Changes between the rows this updater has applied and freshly fetched tables"""
+        with self._lock:
+            return self._diff(tables)
+
+    def _diff(self, tables: Dict[str, Iterable[Dict]]) -> List[GraphChange]:
+        changes = []
+        for table, rows in tables.items():
+            changes.extend(diff_rows(table, self.rows[table], rows))
+        return changes
+
+    def sync(self, tables: Dict[str, Iterable[Dict]]) -> List[GraphChange]:
+        """
+        Bring the graph in line with freshly fetched tables.
+
+        The diff is computed and applied under one lock, so two syncs running at once
+        (e.g. a poll and a webhook refresh) never both apply the same change set.
+
+        Returns:
+            The changes applied
+        """
+        with self._lock:
+            changes = self._diff(tables)
+            affected = self._apply(changes)
+        self._notify(changes, affected)
+        return changes
+
+    def apply(self, changes: List[GraphChange]) -> Set:
+        """
+        Apply changes and publish a new routing graph version.
+
+        Returns:
+            The set of node ids whose node or incident edges changed
+        """
+        with self._lock:
+            affected = self._apply(changes)
+        self._notify(changes, affected)
+        return affected
+
+    def _apply(self, changes: List[GraphChange]) -> Set:
+        if not changes:
+            return set()
+
+        staged = self.graph.copy()
+        affected = set()
+        improving = False
+        for change in changes:
+            rows = self.rows[change.table]
+            if change.op == "delete":
+                rows.pop(change.key, None)
+            else:
+                rows[change.key] = change.record
+            affected.update(change.key)
+
+            if change.table == POINT_TABLE:
+                improving |= self._apply_point(staged, change)
+            else:
+                improving |= self._apply_edge(staged, change)
+
+        old_version = self.store.version
+        # Publish the snapshot first: a request that sees the new nodes can then always route
+        # over them, while one holding the old snapshot keeps its own nodes
+        self.store.refresh(self.rows[EDGE_TABLE].values(), self.rows[KEYCARD_EDGE_TABLE].values(), staged)
+        self.graph.nodes = staged.nodes
+
+        if self.route_cache is not None:
+            if improving:
+                self.route_cache.invalidate()
+            else:
+                self.route_cache.revalidate(old_version, self.store.version, affected)
+        return affected
+
+    def _notify(self, changes: List[GraphChange], affected: Set) -> None:
+        if not changes:
+            return
+        for listener in self.listeners:
+            listener(changes, affected)
+
+    def _apply_point(self, graph: NavigationGraph, change: GraphChange) -> bool:
+        node_id = change.key[0]
+        if change.op == "delete":
+            if node_id in graph.nodes:
+                graph.remove_node(node_id)
+            return False
+
+        data = change.record
+        if change.op == "insert" or node_id not in graph.nodes:
+            graph.add_node(node_id, data['type'], point_layer(data), data['x_position'], data['y_position'])
+            # Edges that arrived before their endpoint, one connection per pair of points
+            pairs = {key for table in (EDGE_TABLE, KEYCARD_EDGE_TABLE) for key in self.rows[table] if node_id in key}
+            attached = False
+            for a, b in pairs:
+                if (b if a == node_id else a) in graph.nodes:
+                    graph.add_edge(a, b)
+                    attached = True
+            return attached
+
+        old = change.old_record or {}
+        node = graph.nodes[node_id]
+        moved = (old.get('x_position'), old.get('y_position')) != (data['x_position'], data['y_position']) or \
+            node.layer != point_layer(data)
+        # The connector type sets the cost of floor-changing edges (e.g. stairs become an elevator)
+        reconnected = node.type_name != data['type'] and \
+            any(graph.nodes[neighbor_id].layer != node.layer for neighbor_id, _ in node.connections)
+        graph.update_node(node_id, data['type'], point_layer(data), data['x_position'], data['y_position'])
+        return moved or reconnected
+
+    def _apply_edge(self, graph: NavigationGraph, change: GraphChange) -> bool:
+        a, b = change.key
+        if a not in graph.nodes or b not in graph.nodes:
+            return False
+
+        # A pair of points has one connection, whichever edge tables hold a row for it
+        other_table = KEYCARD_EDGE_TABLE if change.table == EDGE_TABLE else EDGE_TABLE
+        if change.op == "delete":
+            if change.key not in self.rows[other_table]:
+                graph.remove_edge(a, b)
+            return False
+        if change.op == "insert":
+            if change.key not in self.rows[other_table]:
+                graph.add_edge(a, b)
+            return True
+        # Only the hallway flag matters for an existing edge; gaining it can shorten routes
+        return _hallway(change.record) and not _hallway(change.old_record)
+
+
+class ChangeFeedPoller:
+    """
+    Polls the graph tables and feeds row-level changes to a GraphUpdater.
+
+    Works with the Supabase client or any stand-in with the same table API, such as
+    navigation_system.utils.local_tables.LocalTableClient.
+    """
+
+    def __init__(self, client, updater: GraphUpdater, interval: float = 30.0):
+        self.client = client
+        self.updater = updater
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def fetch(self) -> Dict[str, List[Dict]]:
+        return {table: self.client.table(table).select("*").execute().data for table in GRAPH_TABLES}
+
+    def poll(self) -> List[GraphChange]:
+        """Fetch the tables once and apply whatever changed"""
+        return self.updater.sync(self.fetch())
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                changes = self.poll()
+                if changes:
+                    print(f"Applied {len(changes)} graph changes, version {self.updater.store.version}")
+            except Exception as e:
+                print(f"Error polling graph tables: {e}")
+
+    def start(self) -> None:
+        """Poll in a background daemon thread every interval seconds"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="graph-change-feed", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
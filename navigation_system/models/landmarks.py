@@ -0,0 +1,96 @@
+# models/landmarks.py
+import threading
+from array import array
+from typing import Dict, List
+
+from navigation_system.models.csr_graph import CSRGraph
+
+DEFAULT_LANDMARKS = 8
+ACTIVE_LANDMARKS = 4  # landmarks a search consults, the best of them for its start and goal
+
+
+class LandmarkTable:
+    """
+    Costs from every landmark to every node, for one keycard setting.
+
+    Row l of `non_hallway` holds the fewest non-hallway edges from landmark l to each
+    node and row l of `distance` the shortest distance, each from its own Dijkstra so
+    both are true metrics. By the triangle inequality |c(l, v) - c(l, t)| bounds the
+    cost from v to t from below, separately for each component.
+    """
+
+    def __init__(self, csr: CSRGraph, landmarks: List[int], has_keycard: bool):
+        from navigation_system.algorithms.pathfinding import shortest_path_tree
+
+        self.count = len(landmarks)
+        self.non_hallway = array('i')
+        self.distance = array('d')
+        for landmark in landmarks:
+            non_hallway, _, _, _ = shortest_path_tree(csr, landmark, True, has_keycard)
+            _, distance, _, _ = shortest_path_tree(csr, landmark, False, has_keycard)
+            self.non_hallway.extend(non_hallway)
+            self.distance.extend(distance)
+        self.size = len(csr)
+
+    def select(self, start: int, goal: int, count: int = ACTIVE_LANDMARKS) -> List[int]:
+        """
+        Row offsets of the landmarks that best bound the distance between two nodes.
+
+        Landmarks out of reach of either node are left out, so every value a search
+        reads from the chosen rows is finite.
+        """
+        distance, size, inf = self.distance, self.size, float('inf')
+        rows = [row for row in range(0, self.count * size, size)
+                if distance[row + start] != inf and distance[row + goal] != inf]
+        rows.sort(key=lambda row: abs(distance[row + start] - distance[row + goal]), reverse=True)
+        return rows[:count]
+
+
+class Landmarks:
+    """
+    Landmark (ALT) lower bounds for the searches over a CSRGraph.
+
+    Landmarks are picked by farthest-point selection over shortest distances: each
+    new one is the node farthest from those chosen so far, which spreads them to the
+    building's extremities where they bound best. A node out of reach of every
+    landmark so far (another component) is picked first. A LandmarkTable per keycard
+    setting is computed on first use and kept for the life of the graph version.
+    """
+
+    def __init__(self, csr: CSRGraph, count: int = DEFAULT_LANDMARKS):
+        from navigation_system.algorithms.pathfinding import shortest_path_tree
+
+        self.csr = csr
+        self.landmarks: List[int] = []
+        nearest = [float('inf')] * len(csr)  # distance to the closest landmark chosen so far
+        candidate = 0
+        if len(csr):
+            # The node farthest from an arbitrary start is a good first landmark
+            _, distance, _, _ = shortest_path_tree(csr, 0, False, False)
+            candidate = max(range(len(csr)), key=lambda i: distance[i] if distance[i] != float('inf') else -1.0)
+        while len(self.landmarks) < min(count, len(csr)):
+            self.landmarks.append(candidate)
+            _, distance, _, _ = shortest_path_tree(csr, candidate, False, False)
+            nearest = [min(a, b) for a, b in zip(nearest, distance)]
+            candidate = max(range(len(csr)), key=nearest.__getitem__)
+            if nearest[candidate] == 0.0:
+                break  # every node is a landmark
+        self._tables: Dict[bool, LandmarkTable] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, node_id) -> bool:
+        return node_id in self.csr
+
+    def __len__(self) -> int:
+        return len(self.csr)
+
+    def table(self, has_keycard: bool = False) -> LandmarkTable:
+        """The LandmarkTable of a keycard setting, built on first use"""
+        has_keycard = bool(has_keycard)
+        table = self._tables.get(has_keycard)
+        if table is None:
+            with self._lock:
+                table = self._tables.get(has_keycard)
+                if table is None:
+                    table = self._tables[has_keycard] = LandmarkTable(self.csr, self.landmarks, has_keycard)
+        return table
@@ -0,0 +1,185 @@
+# models/navigation_session.py
+import bisect
+import json
+import queue
+import threading
+import time
+import uuid
+from typing import Callable, Container, Dict, Hashable, Iterable, Iterator, List, Optional
+
+from navigation_system.models.position_tracker import PositionTracker
+from navigation_system.algorithms.reroute import DestinationTree
+
+
+class NavigationSession:
+    """
+    One user's active route, held server-side while they walk it.
+
+    The path is indexed once (node -> position, cumulative distance, decision point
+    indices), so each position update is a dict lookup plus a bisect instead of
+    path.index() and a scan. Updates are published as events to every subscriber
+    of the session (see events()).
+    """
+
+    def __init__(self, session_id: Hashable, end_id: Hashable, prefer_hallways: bool,
+                 has_keycard: bool, tracker: Optional[PositionTracker] = None,
+                 tree: Optional[DestinationTree] = None):
+        self.session_id = session_id
+        self.end_id = end_id
+        self.prefer_hallways = prefer_hallways
+        self.has_keycard = has_keycard
+        self.tracker = tracker
+        self.tree = tree  # shortest path tree toward end_id, used for rerouting
+        self.path: List = []
+        self.progress = 0  # index into path of the furthest node reached
+        self.current = None
+        self.off_route = 0  # consecutive updates that were not on the route
+        self.last_used = time.monotonic()
+        self._index: Dict = {}
+        self._cumulative: List[float] = []
+        self._decision_indices: List[int] = []
+        self._subscribers: List[queue.Queue] = []
+        self._lock = threading.Lock()
+
+    def set_route(self, path: List, positions: Callable, decision_points: Container) -> None:
+        """Adopt a (new) route and precompute its lookups"""
+        with self._lock:
+            self.path = list(path)
+            self.progress = 0
+            self.off_route = 0
+            self._index = {}
+            for i, node_id in enumerate(self.path):
+                self._index.setdefault(node_id, i)
+            self._cumulative = [0.0]
+            for a, b in zip(self.path, self.path[1:]):
+                (x1, y1), (x2, y2) = positions(a), positions(b)
+                self._cumulative.append(self._cumulative[-1] + ((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5)
+            self._decision_indices = [i for i, node_id in enumerate(self.path) if node_id in decision_points]
+
+    def next_decision_index(self, index: int) -> Optional[int]:
+        """Index of the first decision point after index, or the destination"""
+        if not self.path:
+            return None
+        position = bisect.bisect_right(self._decision_indices, index)
+        if position < len(self._decision_indices):
+            return self._decision_indices[position]
+        return len(self.path) - 1
+
+    def advance(self, node_id: Hashable) -> Optional[Dict]:
+        """
+        Record the user at node_id.
+
+        Returns:
+            Progress dict, or None if node_id is not on the route (off route)
+        """
+        with self._lock:
+            self.current = node_id
+            self.last_used = time.monotonic()
+            index = self._index.get(node_id)
+            if index is None:
+                self.off_route += 1
+                return None
+            self.off_route = 0
+            self.progress = max(self.progress, index)
+
+            next_index = self.next_decision_index(index)
+            return {
+                'node_id': node_id,
+                'index': index,
+                'next_decision_point': self.path[next_index] if next_index is not None else None,
+                'next_decision_index': next_index,
+                'remaining_distance': self._cumulative[-1] - self._cumulative[index],
+                'arrived': index == len(self.path) - 1,
+            }
+
+    def publish(self, event: str, data: Dict) -> None:
+        message = f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        with self._lock:
+            for subscriber in self._subscribers:
+                subscriber.put(message)
+
+    def events(self, keepalive: float = 15.0) -> Iterator[str]:
+        """
+        Server-sent event stream for this session.
+
+        Yields SSE-formatted messages as they are published, plus a comment line every
+        keepalive seconds so proxies keep the connection open. Ends when the session is
+        closed.
+        """
+        subscriber = queue.Queue()
+        with self._lock:
+            self._subscribers.append(subscriber)
+        try:
+            while True:
+                try:
+                    message = subscriber.get(timeout=keepalive)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                if message is None:
+                    return
+                yield message
+        finally:
+            with self._lock:
+                if subscriber in self._subscribers:
+                    self._subscribers.remove(subscriber)
+
+    def close(self) -> None:
+        """End every open event stream"""
+        with self._lock:
+            for subscriber in self._subscribers:
+                subscriber.put(None)
+            self._subscribers = []
+
+
+class NavigationSessions:
+    """Active NavigationSessions, closed after ttl seconds without an update"""
+
+    def __init__(self, ttl: float = 1800.0, maxsize: int = 10000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._sessions: Dict[Hashable, NavigationSession] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def create(self, end_id: Hashable, prefer_hallways: bool, has_keycard: bool,
+               tracker: Optional[PositionTracker] = None,
+               tree: Optional[DestinationTree] = None) -> NavigationSession:
+        with self._lock:
+            self._expire()
+            session = NavigationSession(uuid.uuid4().hex, end_id, prefer_hallways, has_keycard, tracker, tree)
+            self._sessions[session.session_id] = session
+            return session
+
+    def get(self, session_id: Hashable) -> Optional[NavigationSession]:
+        with self._lock:
+            self._expire()
+            return self._sessions.get(session_id)
+
+    def mark_changed(self, node_ids: Iterable) -> None:
+        """Pass graph changes on to each session's tree, to be repaired on its next reroute"""
+        node_ids = list(node_ids)
+        with self._lock:
+            sessions = list(self._sessions.values())
+        for session in sessions:
+            if session.tree is not None:
+                session.tree.mark_changed(node_ids)
+
+    def end(self, session_id: Hashable) -> bool:
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+        if session is None:
+            return False
+        session.close()
+        return True
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        stale = [key for key, session in self._sessions.items() if now - session.last_used > self.ttl]
+        while len(self._sessions) - len(stale) >= self.maxsize:
+            stale.append(min((key for key in self._sessions if key not in stale),
+                             key=lambda key: self._sessions[key].last_used))
+        for key in stale:
+            self._sessions.pop(key).close()
@@ -1,6 +1,11 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import List, Tuple
 
+# Cost of going up or down one floor, in map units, by the node type of the connector used
+FLOOR_CHANGE_COSTS = {'elevator': 60.0, 'stairs': 40.0}
+DEFAULT_FLOOR_CHANGE_COST = 50.0  # floor-changing edges between nodes of any other type
+MIN_FLOOR_CHANGE_COST = min(DEFAULT_FLOOR_CHANGE_COST, *FLOOR_CHANGE_COSTS.values())  # admissible per-floor heuristic
+
 @dataclass
 class Node:
     id: str
@@ -16,6 +21,24 @@ class Node:
         print(f"ID: {self.id}, Type: {self.type_name}, Layer: {self.layer}, X: {self.x}, Y: {self.y}, Connections: {self.connections}")
 
 
+def floor_change_cost(node1: "Node", node2: "Node") -> float:
+    """Vertical cost of an edge: floors crossed times the cost of its connector (0 on one floor)"""
+    floors = abs(int(node1.layer) - int(node2.layer))
+    if not floors:
+        return 0.0
+    types = {str(node1.type_name).lower(), str(node2.type_name).lower()}
+    # An elevator at either end makes it an elevator ride, else stairs, else the default
+    for connector in ('elevator', 'stairs'):
+        if connector in types:
+            return floors * FLOOR_CHANGE_COSTS[connector]
+    return floors * DEFAULT_FLOOR_CHANGE_COST
+
+def edge_weight(node1: "Node", node2: "Node") -> float:
+    """Walking distance between two connected nodes plus the cost of any floor change"""
+    distance = ((float(node1.x) - float(node2.x))**2 + (float(node1.y) - float(node2.y))**2)**0.5
+    return distance + floor_change_cost(node1, node2)
+
+
 class NavigationGraph:
     def __init__(self):
         self.nodes = {}
@@ -26,11 +49,40 @@ class NavigationGraph:
     def add_edge(self, node1_id: str, node2_id: str) -> None:
         node1 = self.nodes[node1_id]
         node2 = self.nodes[node2_id]
-        weight = self._calculate_distance(node1, node2)
+        weight = edge_weight(node1, node2)
         
         node1.add_connection(node2_id, weight)
         node2.add_connection(node1_id, weight)
 
+    def remove_edge(self, node1_id: str, node2_id: str) -> None:
+        node1 = self.nodes[node1_id]
+        node2 = self.nodes[node2_id]
+        node1.connections = [c for c in node1.connections if c[0] != node2_id]
+        node2.connections = [c for c in node2.connections if c[0] != node1_id]
+
+    def remove_node(self, id: str) -> None:
+        node = self.nodes.pop(id)
+        for neighbor_id, _ in node.connections:
+            neighbor = self.nodes.get(neighbor_id)
+            if neighbor:
+                neighbor.connections = [c for c in neighbor.connections if c[0] != id]
+
+    def update_node(self, id: str, type_name: str, layer: int, x: float, y: float) -> None:
+        """Change a node's attributes, keeping its connections and updating their weights"""
+        node = self.nodes[id]
+        node.type_name, node.layer, node.x, node.y = type_name, layer, x, y
+        node.connections = [(neighbor_id, edge_weight(node, self.nodes[neighbor_id]))
+                            for neighbor_id, _ in node.connections]
+        for neighbor_id, weight in node.connections:
+            neighbor = self.nodes[neighbor_id]
+            neighbor.connections = [(c, weight) if c == id else (c, w) for c, w in neighbor.connections]
+
+    def copy(self) -> "NavigationGraph":
+        """Copy of the graph whose nodes can be changed without affecting this one"""
+        graph = NavigationGraph()
+        graph.nodes = {id: replace(node, connections=list(node.connections)) for id, node in self.nodes.items()}
+        return graph
+
     def print_Nodes(self) -> None:
         for node in self.nodes.values():
             node.print()
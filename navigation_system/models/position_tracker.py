@@ -0,0 +1,254 @@
+# models/position_tracker.py
+import threading
+import time
+import uuid
+from typing import Dict, Hashable, Optional
+
+import numpy as np
+
+from navigation_system.models.fingerprint_store import FingerprintStore
+from navigation_system.models.routing_graph import RoutingGraphStore
+
+
+class PositionTracker:
+    """
+    Particle filter over graph nodes for one user's stream of WiFi scans.
+
+    Each particle sits on a node. Per scan, particles stay put or step to an adjacent
+    node, are weighted by how well the scan matches the fingerprint of the node they
+    are on, and are resampled when the weights degenerate. RSSI is smoothed per BSSID
+    across scans before matching. Work per scan is proportional to the number of
+    particles, not the size of the building.
+
+    Scans are matched over every AP heard on either side, with missing readings
+    counted as the `missing` floor (see FingerprintStore.scores). Nodes without a
+    fingerprint get the `unsurveyed` score, so particles can travel through
+    unsurveyed corridors between fingerprinted decision points.
+    """
+
+    def __init__(self, fingerprints: FingerprintStore, graph_store: RoutingGraphStore,
+                 particles: int = 300, sigma: float = 6.0, stay: float = 0.2, max_hops: int = 3,
+                 momentum: float = 0.8, smoothing: float = 0.5, missing: float = -95.0,
+                 unsurveyed: float = 15.0, relocate: float = 25.0, seed: Optional[int] = None):
+        self.fingerprints = fingerprints
+        self.graph_store = graph_store
+        self.count = particles
+        self.sigma = sigma  # dBm, spread of the RMS match score
+        self.stay = stay  # probability a particle does not move between scans
+        self.max_hops = max_hops  # furthest a particle can walk between scans, in edges
+        self.momentum = momentum  # probability a moving particle does not turn back
+        self.smoothing = smoothing  # weight of the newest reading in the RSSI average
+        self.missing = missing  # dBm assumed for an AP one side did not hear
+        self.unsurveyed = unsurveyed  # score given to nodes without a fingerprint
+        self.relocate = relocate  # restart from scratch when every particle scores worse than this
+        self.rng = np.random.default_rng(seed)
+
+        self.particles = None  # node index into the CSR graph per particle
+        self.previous = None  # node each particle last moved from
+        self.weights = None
+        self.rssi = {}  # smoothed {bssid: rssi}
+        self.scans = 0
+        self._csr = None
+        self._offsets = None
+        self._targets = None
+        self._lock = threading.Lock()
+
+    def _sync_graph(self) -> bool:
+        """Pick up a new graph version, carrying particles over by node id. False if there is no graph."""
+        csr = self.graph_store.csr
+        if csr is None:
+            return False
+        if csr is self._csr:
+            return True
+        if self._csr is not None and self.particles is not None:
+            ids = [self._csr.ids[i] for i in self.particles]
+            keep = np.array([node_id in csr.index for node_id in ids], dtype=bool)
+            self.particles = np.array([csr.index[node_id] for node_id in ids if node_id in csr.index], dtype=np.int64)
+            self.previous = np.full(len(self.particles), -1, dtype=np.int64)
+            self.weights = self.weights[keep]
+            if len(self.particles) == 0:
+                self.particles = None
+        self._csr = csr
+        self._offsets = np.frombuffer(csr.offsets, dtype=np.int64)
+        self._targets = np.frombuffer(csr.targets, dtype=np.int32)
+        return True
+
+    def _smooth(self, scan: Dict[str, float]) -> Dict[str, float]:
+        """Exponential moving average per BSSID; APs missing from the scan are dropped"""
+        alpha = self.smoothing
+        self.rssi = {
+            bssid: alpha * value + (1 - alpha) * self.rssi[bssid] if bssid in self.rssi else value
+            for bssid, value in scan.items()
+        }
+        return self.rssi
+
+    def _scores(self, scan: Dict[str, float], nodes: np.ndarray) -> np.ndarray:
+        """RMS match score of the scan at each of nodes (CSR indices)"""
+        scores = np.full(len(nodes), self.unsurveyed)
+        # Row lookups and scores from one matrix, whatever fingerprints are added meanwhile
+        matrix = self.fingerprints.current
+        rows = matrix.rows([self._csr.ids[i] for i in nodes])
+        surveyed = rows >= 0
+        if surveyed.any():
+            scores[surveyed] = matrix.scores(scan, rows[surveyed], self.missing)
+        return scores
+
+    def _likelihood(self, scan: Dict[str, float], scores: np.ndarray) -> np.ndarray:
+        """Relative likelihood of each score, scaled so the best is 1"""
+        # The RMS averages over the APs heard; independent per-AP noise multiplies back up
+        heard = sum(1 for bssid in scan if bssid in self.fingerprints.bssid_index)
+        log_likelihood = -0.5 * max(heard, 1) * (scores / self.sigma) ** 2
+        # Shift by the best finite value before exponentiating: with many APs and a poor
+        # match every likelihood would otherwise underflow to 0
+        finite = log_likelihood[np.isfinite(log_likelihood)]
+        if finite.size:
+            log_likelihood = log_likelihood - finite.max()
+        return np.exp(log_likelihood)
+
+    def _initialize(self, scan: Dict[str, float]) -> bool:
+        """Seed particles at fingerprinted nodes in proportion to how well they match"""
+        known = [node_id for node_id in self.fingerprints.node_ids if node_id in self._csr.index]
+        if not known:
+            return False
+        nodes = np.array([self._csr.index[node_id] for node_id in known], dtype=np.int64)
+        likelihood = self._likelihood(scan, self._scores(scan, nodes))
+        if likelihood.sum() <= 0:
+            return False
+        self.particles = self.rng.choice(nodes, size=self.count, p=likelihood / likelihood.sum())
+        self.previous = np.full(self.count, -1, dtype=np.int64)
+        self.weights = np.full(self.count, 1.0 / self.count)
+        return True
+
+    def _move(self) -> None:
+        """
+        Each particle stays, or walks 1 to max_hops steps along the graph.
+
+        People rarely turn back between two scans, so a walking particle avoids the node
+        it came from (with probability momentum) when there is anywhere else to go.
+        """
+        hops = np.where(self.rng.random(len(self.particles)) < self.stay, 0,
+                        self.rng.integers(1, self.max_hops + 1, len(self.particles)))
+        for step in range(1, self.max_hops + 1):
+            walking = np.flatnonzero(hops >= step)
+            starts = self._offsets[self.particles[walking]]
+            degrees = self._offsets[self.particles[walking] + 1] - starts
+            walking, starts, degrees = walking[degrees > 0], starts[degrees > 0], degrees[degrees > 0]
+            choice = (self.rng.random(len(walking)) * degrees).astype(np.int64)
+
+            back = ((self._targets[starts + choice] == self.previous[walking]) & (degrees > 1)
+                    & (self.rng.random(len(walking)) < self.momentum))
+            # Shift to one of the other neighbors, uniformly
+            shift = 1 + (self.rng.random(back.sum()) * (degrees[back] - 1)).astype(np.int64)
+            choice[back] = (choice[back] + shift) % degrees[back]
+
+            self.previous[walking] = self.particles[walking]
+            self.particles[walking] = self._targets[starts + choice]
+
+    def _resample(self) -> None:
+        """Systematic resampling once the effective sample size drops below half"""
+        if 1.0 / np.sum(self.weights ** 2) >= len(self.weights) / 2:
+            return
+        positions = (self.rng.random() + np.arange(self.count)) / self.count
+        cumulative = np.cumsum(self.weights)
+        cumulative[-1] = 1.0
+        chosen = np.searchsorted(cumulative, positions)
+        self.particles = self.particles[chosen]
+        self.previous = self.previous[chosen]
+        self.weights = np.full(self.count, 1.0 / self.count)
+
+    def update(self, scan: Dict[str, float]) -> Optional[Dict]:
+        """
+        Fold one scan into the estimate.
+
+        Returns:
+            Dict with the most likely node_id, its confidence (share of particle weight)
+            and the weighted mean x/y, or None if nothing can be located yet
+        """
+        with self._lock:
+            return self._update(scan)
+
+    def _update(self, scan: Dict[str, float]) -> Optional[Dict]:
+        if not self._sync_graph():
+            return None
+        scan = self._smooth(scan)
+        self.scans += 1
+
+        if self.particles is None:
+            if not scan or not self._initialize(scan):
+                return None
+        else:
+            self._move()
+            if scan:
+                scores = self._scores(scan, self.particles)
+                if scores.min() > self.relocate and self._initialize(scan):
+                    # No particle is anywhere near a match; the user was lost, start over
+                    return self.estimate()
+                self.weights = self.weights * self._likelihood(scan, scores)
+            total = self.weights.sum()
+            if total > 0:
+                self.weights = self.weights / total
+                self._resample()
+            elif not self._initialize(scan):
+                self.particles = None
+                return None
+
+        return self.estimate()
+
+    def estimate(self) -> Optional[Dict]:
+        if self.particles is None:
+            return None
+        nodes, slots = np.unique(self.particles, return_inverse=True)
+        mass = np.bincount(slots, weights=self.weights)
+        best = int(np.argmax(mass))
+        xs = np.frombuffer(self._csr.xs, dtype=np.float64)[self.particles]
+        ys = np.frombuffer(self._csr.ys, dtype=np.float64)[self.particles]
+        return {
+            'node_id': self._csr.ids[nodes[best]],
+            'confidence': float(mass[best] / mass.sum()),
+            'x': float(np.dot(self.weights, xs)),
+            'y': float(np.dot(self.weights, ys)),
+            'scans': self.scans,
+        }
+
+
+class TrackerSessions:
+    """Per-session PositionTrackers, dropped after ttl seconds without a scan"""
+
+    def __init__(self, fingerprints: FingerprintStore, graph_store: RoutingGraphStore,
+                 ttl: float = 900.0, maxsize: int = 10000, **tracker_options):
+        self.fingerprints = fingerprints
+        self.graph_store = graph_store
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.tracker_options = tracker_options
+        self._trackers = {}  # session_id -> (tracker, last_used)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._trackers)
+
+    def get(self, session_id: Optional[Hashable] = None):
+        """Return (session_id, tracker), starting a new session if the id is unknown or missing"""
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._trackers.get(session_id) if session_id else None
+            if entry is None:
+                session_id = session_id or uuid.uuid4().hex
+                tracker = PositionTracker(self.fingerprints, self.graph_store, **self.tracker_options)
+            else:
+                tracker = entry[0]
+            self._trackers[session_id] = (tracker, now)
+            return session_id, tracker
+
+    def end(self, session_id: Hashable) -> bool:
+        with self._lock:
+            return self._trackers.pop(session_id, None) is not None
+
+    def _expire(self, now: float) -> None:
+        stale = [key for key, (_, last_used) in self._trackers.items() if now - last_used > self.ttl]
+        for key in stale:
+            del self._trackers[key]
+        while len(self._trackers) >= self.maxsize:
+            oldest = min(self._trackers, key=lambda key: self._trackers[key][1])
+            del self._trackers[oldest]
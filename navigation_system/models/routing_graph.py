@@ -0,0 +1,246 @@
+# models/routing_graph.py
+import hashlib
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from navigation_system.models.node import NavigationGraph, Node, edge_weight
+
+# (neighbor_id, weight, is_hallway)
+Neighbor = Tuple[str, float, bool]
+
+
+def edge_data_version(nodes: Dict[str, Node], edges_data: Iterable[Dict],
+                      keycard_edges_data: Optional[Iterable[Dict]] = None) -> str:
+    """
+    Compute a stable version string for a set of nodes and edge rows.
+
+    The version only depends on node types and positions and the (endpoints, hallway) values
+    of each edge, so refetching identical tables yields the same version.
+    """
+    digest = hashlib.sha1()
+    for node_id in sorted(nodes, key=str):
+        node = nodes[node_id]
+        digest.update(f"n|{node_id}|{node.type_name}|{node.layer}|{node.x}|{node.y}\n".encode())
+    for tag, rows in (("e", edges_data or []), ("k", keycard_edges_data or [])):
+        keys = sorted(
+            f"{tag}|{row['pointnum1']}|{row['pointnum2']}|{bool(row.get('hallway', False))}"
+            for row in rows
+        )
+        for key in keys:
+            digest.update(key.encode())
+            digest.update(b"\n")
+    return digest.hexdigest()[:16]
+
+
+class _CSRAdjacency(Mapping):
+    """Read-only {node_id: (Neighbor, ...)} over a CSRGraph, unpacked per node on first access"""
+
+    def __init__(self, csr, has_keycard: bool):
+        self._csr = csr
+        self._has_keycard = has_keycard
+        self._unpacked: Dict = {}
+
+    def __getitem__(self, node_id) -> Tuple[Neighbor, ...]:
+        neighbors = self._unpacked.get(node_id)
+        if neighbors is None:
+            neighbors = tuple(self._csr.neighbor_indices(self._csr.index[node_id], self._has_keycard))
+            if not neighbors:
+                raise KeyError(node_id)
+            ids = self._csr.ids
+            neighbors = self._unpacked[node_id] = tuple((ids[j], weight, hallway) for j, weight, hallway in neighbors)
+        return neighbors
+
+    def __iter__(self) -> Iterator:
+        return (node_id for node_id in self._csr.ids if node_id in self)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class RoutingGraph:
+    """
+    Immutable, prebuilt routing view of a NavigationGraph.
+
+    Holds adjacency lists with precomputed weights and hallway flags for the
+    regular edges, plus a keycard overlay that is merged in for users with
+    keycard access. Pathfinding against a RoutingGraph performs no I/O and
+    does not rebuild any lookups per request.
+    """
+
+    def __init__(self, graph: NavigationGraph, edges_data: Iterable[Dict],
+                 keycard_edges_data: Optional[Iterable[Dict]] = None,
+                 version: Optional[str] = None):
+        edges_data = list(edges_data or [])
+        keycard_edges_data = list(keycard_edges_data or [])
+
+        self.nodes = MappingProxyType(dict(graph.nodes))
+        self.version = version or edge_data_version(self.nodes, edges_data, keycard_edges_data)
+        self.positions = MappingProxyType({
+            node_id: (float(node.x), float(node.y)) for node_id, node in self.nodes.items()
+        })
+        self.layers = MappingProxyType({node_id: int(node.layer) for node_id, node in self.nodes.items()})
+
+        regular = self._build_adjacency(edges_data, {})
+        self.edge_count = sum(len(neighbors) for neighbors in regular.values()) // 2
+        merged = self._build_adjacency(keycard_edges_data, {a: dict(n) for a, n in regular.items()})
+
+        self._adjacency = MappingProxyType(self._freeze(regular))
+        self._keycard_adjacency = MappingProxyType(self._freeze(merged))
+        self._csr = None
+
+    @classmethod
+    def from_csr(cls, csr, nodes: Dict[str, Node]) -> "RoutingGraph":
+        """
+        Rebuild a RoutingGraph from its CSR packing (e.g. a loaded snapshot) without the
+        edge rows. Adjacency tuples are unpacked from the CSR arrays per node on first
+        use, the CSR stays attached, and the version is the one it was saved with.
+        """
+        from navigation_system.models.csr_graph import KEYCARD
+        routing_graph = cls.__new__(cls)
+        routing_graph.nodes = MappingProxyType(dict(nodes))
+        routing_graph.version = csr.version
+        routing_graph.positions = MappingProxyType(dict(zip(csr.ids, zip(csr.xs, csr.ys))))
+        routing_graph.layers = MappingProxyType(dict(zip(csr.ids, csr.layers)))
+        routing_graph.edge_count = (len(csr.flags) - sum(1 for flag in csr.flags if flag & KEYCARD)) // 2
+        routing_graph._adjacency = _CSRAdjacency(csr, has_keycard=False)
+        routing_graph._keycard_adjacency = _CSRAdjacency(csr, has_keycard=True)
+        routing_graph._csr = csr
+        return routing_graph
+
+    def _build_adjacency(self, rows: List[Dict],
+                         adjacency: Dict[str, Dict[str, Tuple[float, bool]]]) -> Dict[str, Dict[str, Tuple[float, bool]]]:
+        """Add edge rows to an adjacency dict of {node_id: {neighbor_id: (weight, hallway)}}"""
+        for row in rows:
+            a, b = row['pointnum1'], row['pointnum2']
+            if a not in self.positions or b not in self.positions:
+                continue
+            is_hallway = bool(row.get('hallway', False))
+            weight = edge_weight(self.nodes[a], self.nodes[b])
+            adjacency.setdefault(a, {})[b] = (weight, is_hallway)
+            adjacency.setdefault(b, {})[a] = (weight, is_hallway)
+        return adjacency
+
+    @staticmethod
+    def _freeze(adjacency: Dict[str, Dict[str, Tuple[float, bool]]]) -> Dict[str, Tuple[Neighbor, ...]]:
+        return {
+            node_id: tuple((neighbor_id, weight, hallway) for neighbor_id, (weight, hallway) in neighbors.items())
+            for node_id, neighbors in adjacency.items()
+        }
+
+    def __contains__(self, node_id) -> bool:
+        return node_id in self.nodes
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def csr(self):
+        """CSR-packed copy of this snapshot, built on first use"""
+        if self._csr is None:
+            from navigation_system.models.csr_graph import CSRGraph
+            self._csr = CSRGraph.from_routing_graph(self)
+        return self._csr
+
+    def position(self, node_id) -> Tuple[float, float]:
+        """Get the (x, y) coordinates of a node as floats"""
+        return self.positions[node_id]
+
+    def layer(self, node_id) -> int:
+        """Get the floor a node is on"""
+        return self.layers[node_id]
+
+    def neighbors(self, node_id, has_keycard: bool = False) -> Tuple[Neighbor, ...]:
+        """Get (neighbor_id, weight, is_hallway) tuples for a node"""
+        adjacency = self._keycard_adjacency if has_keycard else self._adjacency
+        return adjacency.get(node_id, ())
+
+    def edge(self, node1_id, node2_id, has_keycard: bool = False) -> Optional[Tuple[float, bool]]:
+        """Get (weight, is_hallway) for an edge, or None if the nodes are not connected"""
+        for neighbor_id, weight, is_hallway in self.neighbors(node1_id, has_keycard):
+            if neighbor_id == node2_id:
+                return weight, is_hallway
+        return None
+
+
+class RoutingGraphStore:
+    """
+    Holds the current RoutingGraph and only rebuilds it when the edge data changes.
+
+    Readers grab `store.current` once per request; a refresh swaps in a new
+    snapshot atomically so in-flight requests keep using the one they started with.
+    With a SharedGraphFile, snapshots are published to it and used memory-mapped from
+    it, so worker processes on the same data share one copy of the graph arrays.
+    """
+
+    def __init__(self, graph: NavigationGraph, build_csr: bool = False, shared=None, by_floor: bool = False,
+                 hierarchical: bool = False, landmarks: bool = False):
+        self.graph = graph
+        self.build_csr = build_csr or by_floor or hierarchical or landmarks
+        self.by_floor = by_floor  # route over per-floor partitions of the CSR graph
+        self.hierarchical = hierarchical  # route over the portals of the CSR graph's clusters
+        self.landmarks = landmarks  # route bidirectionally under the CSR graph's landmark bounds
+        self.shared = shared  # SharedGraphFile new versions are published to and mapped from
+        self.current: Optional[RoutingGraph] = None
+
+    @property
+    def version(self) -> Optional[str]:
+        return self.current.version if self.current else None
+
+    def refresh(self, edges_data: Iterable[Dict],
+                keycard_edges_data: Optional[Iterable[Dict]] = None,
+                graph: Optional[NavigationGraph] = None) -> bool:
+        """
+        Rebuild the routing graph if the data changed. Returns True if a new snapshot was published.
+
+        graph is the node set to build from, by default the store's; pass a staged copy to
+        publish its snapshot before the copy's nodes are swapped into the live graph.
+        """
+        graph = graph if graph is not None else self.graph
+        edges_data = list(edges_data or [])
+        keycard_edges_data = list(keycard_edges_data or [])
+        version = edge_data_version(graph.nodes, edges_data, keycard_edges_data)
+        if self.current is not None and self.current.version == version:
+            return False
+        if self.shared is not None:
+            # Use the version another process already published, else build and publish it
+            mapped = self.shared.adopt(version, graph.nodes)
+            if mapped is None:
+                built = RoutingGraph(graph, edges_data, keycard_edges_data, version=version)
+                mapped = self.shared.publish(built) or built
+            self.publish(mapped)
+            return True
+
+        self.publish(RoutingGraph(graph, edges_data, keycard_edges_data, version=version))
+        return True
+
+    def publish(self, routing_graph: RoutingGraph) -> None:
+        """Swap in a routing graph built elsewhere (e.g. loaded from a snapshot)"""
+        if self.build_csr:
+            routing_graph.csr
+        if self.hierarchical:
+            # Precompute the default profile's portal links before any request needs them
+            routing_graph.csr.hierarchy.portal_graph()
+        if self.landmarks:
+            # Select landmarks and compute their public access distances along with the graph
+            routing_graph.csr.landmarks.table()
+        self.current = routing_graph
+
+    @property
+    def csr(self):
+        return self.current.csr if self.current else None
+
+    def router(self, routing_graph: Optional[RoutingGraph] = None):
+        """
+        Get the graph routes should run against (the CSR, per-floor, hierarchical or landmark
+        backend when enabled), of the current snapshot or of one a request already holds
+        """
+        routing_graph = routing_graph if routing_graph is not None else self.current
+        if routing_graph is None:
+            return None
+        if self.by_floor:
+            return routing_graph.csr.floors
+        if self.hierarchical:
+            return routing_graph.csr.hierarchy
+        if self.landmarks:
+            return routing_graph.csr.landmarks
+        return routing_graph.csr if self.build_csr else routing_graph
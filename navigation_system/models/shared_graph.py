@@ -0,0 +1,105 @@
+# models/shared_graph.py
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from navigation_system.models.node import NavigationGraph
+from navigation_system.models.routing_graph import RoutingGraph
+from navigation_system.utils.graph_io import save_graph_snapshot, read_graph_snapshot, load_graph_snapshot
+
+
+class SharedGraphFile:
+    """
+    Routing graph snapshot that every worker process memory-maps read-only.
+
+    The CSR arrays of the routing graph live in the mapped file, so N workers share one
+    physical copy through the page cache. A new version is published by writing the
+    file under a temporary name and os.replace()-ing it over the path; processes still
+    holding the old version keep a valid mapping until they drop it. poll() notices a
+    replaced file with at most one stat() per check_interval.
+
+    Args:
+        path: Snapshot file
+        tables: Returns the digests of the table rows the current graph was built from;
+            stamped into published snapshots, and publishing is skipped while any is missing
+        check_interval: Seconds between stat() calls in poll()
+    """
+
+    def __init__(self, path: str, tables: Optional[Callable[[], Dict[str, str]]] = None,
+                 check_interval: float = 1.0):
+        self.path = path
+        self.tables = tables
+        self.check_interval = check_interval
+        self.version: Optional[str] = None  # version in the file as of the last check
+        self._identity = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def _stat(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def load(self, tables: Optional[Dict[str, str]] = None) -> Optional[Tuple[NavigationGraph, RoutingGraph]]:
+        """Map the snapshot if it was built from `tables` (see load_graph_snapshot)"""
+        identity = self._stat()
+        loaded = load_graph_snapshot(self.path, tables, mapped=True)
+        if loaded is not None:
+            self._identity, self.version = identity, loaded[1].version
+        return loaded
+
+    def adopt(self, version: str, nodes: Dict) -> Optional[RoutingGraph]:
+        """Map the snapshot as a RoutingGraph over nodes, if the file holds exactly this version"""
+        identity = self._stat()
+        snapshot = read_graph_snapshot(self.path, mapped=True)
+        if snapshot is None:
+            return None
+        header, csr = snapshot
+        self._identity, self.version = identity, header['version']
+        if header['version'] != version or list(nodes) != csr.ids:
+            return None
+        return RoutingGraph.from_csr(csr, nodes)
+
+    def publish(self, routing_graph: RoutingGraph) -> Optional[RoutingGraph]:
+        """
+        Write routing_graph to the file, then map it back.
+
+        Returns:
+            The mapped copy to use in place of routing_graph, or None if nothing was
+            published (missing table digests, or the write failed)
+        """
+        tables = self.tables() if self.tables else None
+        if tables is not None and not all(tables.values()):
+            return None
+        try:
+            save_graph_snapshot(self.path, routing_graph, tables)
+        except OSError as e:
+            print(f"Error publishing graph snapshot {self.path}: {e}")
+            return None
+        # Another worker may have published the same version in the meantime; either file will do
+        return self.adopt(routing_graph.version, routing_graph.nodes)
+
+    def poll(self) -> Optional[str]:
+        """
+        Cheap check for a newly published snapshot.
+
+        Returns:
+            The new file's version if the file was replaced since the last check, else None
+        """
+        now = time.monotonic()
+        if now - self._checked < self.check_interval:
+            return None
+        with self._lock:
+            self._checked = now
+            identity = self._stat()
+            if identity is None or identity == self._identity:
+                return None
+            snapshot = read_graph_snapshot(self.path, mapped=True)
+            self._identity = identity
+            if snapshot is None:
+                return None
+            self.version = snapshot[0]['version']
+            return self.version
@@ -0,0 +1,980 @@
+# tools/benchmark.py
+import argparse
+import random
+import json
+import statistics
+import subprocess
+import sys
+import os
+import tempfile
+import time
+
+# Add repository root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from navigation_system.models.routing_graph import RoutingGraph, RoutingGraphStore
+from navigation_system.models.csr_graph import CSRGraph
+from navigation_system.models.floor_partitions import FloorPartitions
+from navigation_system.models.cluster_hierarchy import ClusterHierarchy, DEFAULT_CLUSTER_SIZE
+from navigation_system.models.landmarks import Landmarks, DEFAULT_LANDMARKS
+from navigation_system.algorithms import pathfinding
+from navigation_system.algorithms.pathfinding import a_star, bidirectional_a_star, shortest_path_tree, SearchStats
+from navigation_system.algorithms.reroute import DestinationTree
+from navigation_system.algorithms.step_instructions import (get_navigation_instructions, get_navigation_steps,
+                                                            get_relative_direction)
+from navigation_system.algorithms.route_table import RouteTable
+from navigation_system.algorithms.contraction_hierarchy import ContractionHierarchy
+from navigation_system.algorithms.parallel import RouteWorkerPool
+from navigation_system.models.fingerprint_store import FingerprintStore
+from navigation_system.models.fingerprint_index import StrongestAPIndex
+from navigation_system.models.position_tracker import PositionTracker
+from navigation_system.utils.graph_io import read_table_csv, build_graph, save_graph_snapshot
+from navigation_system.utils.local_tables import LocalTableClient
+from navigation_system.utils.table_mirror import TableMirror
+from navigation_system.utils.room_search import RoomSearchIndex, RoomSearchStore
+
+def synthetic_tables(corridors=10, length=40, spacing=10.0, seed=0, floors=1, buildings=1):
+    """
+    Generate Point/Edge/Keycard Edge rows for a synthetic building.
+
+    Corridors run east-west and are joined by a hallway spine at both ends; every
+    corridor point has a room on each side, and some neighbouring rooms share a
+    keycard door. With several floors the layout repeats on each (Point rows then
+    get a layer column), joined by stairs at both ends of the first corridor and an
+    elevator in its middle. With several buildings the whole building repeats
+    eastward, each joined to the next by an outdoor walkway on the ground floor.
+    """
+    rng = random.Random(seed)
+    points, edges, keycard_edges = [], [], []
+
+    def point(pointnum, type_name, x, y, layer):
+        row = {'pointnum': str(pointnum), 'type': type_name, 'x_position': x, 'y_position': y}
+        if floors > 1:
+            row['layer'] = layer
+        points.append(row)
+
+    def edge(rows, a, b, hallway):
+        rows.append({'pointnum1': str(a), 'pointnum2': str(b), 'hallway': hallway})
+
+    per_floor = corridors * length * 3
+    connectors = [('stairs', 0), ('elevator', length // 2), ('stairs', length - 1)]
+    per_building = floors * per_floor + (floors * len(connectors) if floors > 1 else 0)
+    walkway = 10  # walkway points between neighbouring buildings
+    width = (length - 1 + walkway + 1) * spacing  # building plus walkway, east to east
+    for building in range(buildings):
+        first, x0 = building * per_building, building * width
+        for floor in range(floors):
+            base, layer = first + floor * per_floor, floor + 1
+            for c in range(corridors):
+                y = c * spacing * 4
+                for i in range(length):
+                    hall = base + c * length + i
+                    point(hall, 'point', x0 + i * spacing, y, layer)
+                    if i > 0:
+                        edge(edges, hall - 1, hall, True)
+                    if c > 0 and i in (0, length - 1):
+                        edge(edges, hall - length, hall, True)
+
+            room_base = base + corridors * length
+            for c in range(corridors):
+                for i in range(length):
+                    hall = c * length + i
+                    for side in (-1, 1):
+                        room = room_base + 2 * hall + (side > 0)
+                        point(room, 'room', x0 + i * spacing, c * spacing * 4 + side * spacing * 1.5, layer)
+                        edge(edges, base + hall, room, False)
+                        if i > 0 and rng.random() < 0.15:
+                            edge(keycard_edges, room - 2, room, False)
+
+        if floors > 1:
+            connector_base = first + floors * per_floor
+            for floor in range(floors):
+                for j, (type_name, i) in enumerate(connectors):
+                    connector = connector_base + floor * len(connectors) + j
+                    point(connector, type_name, x0 + i * spacing, -spacing, floor + 1)
+                    edge(edges, first + floor * per_floor + i, connector, True)
+                    if floor > 0:
+                        edge(edges, connector - len(connectors), connector, True)
+
+    # Walkways from the east end of each building's first corridor to the west end of the next
+    for building in range(buildings - 1):
+        previous = building * per_building + length - 1
+        for j in range(walkway):
+            walk = buildings * per_building + building * walkway + j
+            point(walk, 'point', building * width + (length + j) * spacing, 0.0, 1)
+            edge(edges, previous, walk, True)
+            previous = walk
+        edge(edges, previous, (building + 1) * per_building, True)
+
+    return points, edges, keycard_edges
+
+def load_graph(args):
+    """Load the graph named by the shared --points/--edges/--synthetic arguments"""
+    if args.points:
+        points = read_table_csv(args.points)
+        edges = read_table_csv(args.edges)
+        keycard_edges = read_table_csv(args.keycard_edges) if args.keycard_edges else []
+    else:
+        points, edges, keycard_edges = synthetic_tables(corridors=args.synthetic, seed=args.seed)
+    graph = build_graph(points)
+    return graph, RoutingGraph(graph, edges, keycard_edges)
+
+def sample_pairs(node_ids, count, seed):
+    rng = random.Random(seed)
+    return [(rng.choice(node_ids), rng.choice(node_ids)) for _ in range(count)]
+
+def time_calls(fn, pairs):
+    """Run fn over every pair and return per-call latencies in microseconds"""
+    latencies = []
+    for start_id, end_id in pairs:
+        started = time.perf_counter()
+        fn(start_id, end_id)
+        latencies.append((time.perf_counter() - started) * 1e6)
+    return latencies
+
+def report(name, latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0]
+    print(f"{name:<24} mean {statistics.mean(latencies):>10.1f} us   "
+          f"p50 {statistics.median(latencies):>10.1f} us   p95 {p95:>10.1f} us")
+
+def bench_route_table(args):
+    """Compare route table lookups against live a_star"""
+    graph, routing_graph = load_graph(args)
+    csr = CSRGraph.from_routing_graph(routing_graph)
+    rooms = [node_id for node_id, node in graph.nodes.items() if node.type_name == 'room']
+    print(f"Graph: {len(csr)} nodes, {routing_graph.edge_count} edges, {len(rooms)} rooms")
+
+    started = time.perf_counter()
+    table = RouteTable.build(csr, rooms)
+    print(f"Built route table in {time.perf_counter() - started:.1f}s")
+
+    pairs = sample_pairs(rooms, args.queries, args.seed)
+    for prefer_hallways, has_keycard in table.profiles:
+        label = f"hallways={prefer_hallways} keycard={has_keycard}"
+        print(f"\n[{label}]")
+        report("a_star", time_calls(
+            lambda s, e: a_star(routing_graph, s, e, prefer_hallways=prefer_hallways, has_keycard=has_keycard), pairs))
+        report("route table lookup", time_calls(
+            lambda s, e: table.lookup(s, e, prefer_hallways, has_keycard), pairs))
+
+def bench_parallel(args):
+    """Scaling of the process pool from 1 to N workers on matrix, batch and table jobs"""
+    graph, routing_graph = load_graph(args)
+    csr = routing_graph.csr
+    rooms = [node_id for node_id, node in graph.nodes.items() if node.type_name == 'room']
+    pairs = sample_pairs(rooms, args.queries * 10, args.seed)
+    print(f"Graph: {len(csr)} nodes, {routing_graph.edge_count} edges, {len(rooms)} rooms, "
+          f"{len(pairs)} batch pairs")
+
+    baseline = {}
+    reference = None
+    print(f"{'workers':>8} {'matrix':>10} {'batch':>10} {'table':>10} {'speedup':>8}")
+    for processes in range(1, args.max_processes + 1):
+        with RouteWorkerPool(csr, processes) as pool:
+            timings = []
+            started = time.perf_counter()
+            matrix = pool.distance_matrix(rooms[:args.origins], rooms)
+            timings.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            batch = pool.route_batch(pairs)
+            timings.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            table = pool.build_route_table(rooms[:args.origins])
+            timings.append(time.perf_counter() - started)
+
+        # Results must not depend on the number of workers
+        result = (matrix, batch, {profile: bytes(hops) for profile, hops in table.next_hops.items()})
+        if reference is None:
+            reference = result
+        elif result != reference:
+            raise AssertionError(f"Results with {processes} workers differ from 1 worker")
+
+        if not baseline:
+            baseline = timings
+        speedup = sum(baseline) / sum(timings)
+        print(f"{processes:>8} {timings[0]:>9.2f}s {timings[1]:>9.2f}s {timings[2]:>9.2f}s {speedup:>7.2f}x")
+
+def path_loss_model(access_points, rng):
+    """
+    Scan simulator for access points at fixed (x, y) positions (log-distance path loss).
+
+    Returns reading(x, y, sigma): the {bssid: rssi} heard at (x, y) with sigma dBm of
+    noise; APs below -90 dBm are not heard.
+    """
+    import math
+
+    def reading(x, y, sigma):
+        signals = {}
+        for i, (ax, ay) in enumerate(access_points):
+            distance = max(1.0, math.hypot(ax - x, ay - y))
+            rssi = -30.0 - 30.0 * math.log10(distance) + rng.gauss(0, sigma)
+            if rssi > -90.0:
+                signals[f"ap:{i:05d}"] = round(rssi, 1)
+        return signals
+
+    return reading
+
+def synthetic_fingerprints(points, aps, seed):
+    """
+    Fingerprints on a square grid of reference points, one every 3 m.
+
+    Access points are spread uniformly over the same area. Returns (fingerprints,
+    locations, reading) where reading is the path_loss_model scan simulator.
+    """
+    import math
+    rng = random.Random(seed)
+    side = math.ceil(math.sqrt(points))
+    size = side * 3.0
+    reading = path_loss_model([(rng.uniform(0, size), rng.uniform(0, size)) for _ in range(aps)], rng)
+
+    locations = [(i % side * 3.0, i // side * 3.0) for i in range(points)]
+    fingerprints = {i: reading(x, y, 1.0) for i, (x, y) in enumerate(locations)}
+    return fingerprints, locations, reading
+
+def bench_fingerprints(args):
+    """
+    Recall and latency of the strongest-AP index against scoring every fingerprint.
+
+    Recall is the share of scans whose true reference point is among the index's
+    candidates; agreement is the share where the index returns the same point as brute
+    force. Agreement drops on large databases because brute force tends to pick a
+    far-away point that happens to match on a single weak AP, which the index never
+    scores, so the positioning error against the true location is reported as well.
+    """
+    import math
+    fingerprints, locations, reading = synthetic_fingerprints(args.reference_points, args.aps, args.seed)
+    store = FingerprintStore.from_fingerprints(fingerprints, threshold=float('inf'))
+    rng = random.Random(args.seed)
+    truth = [rng.randrange(len(locations)) for _ in range(args.queries)]
+    scans = [reading(*locations[i], args.noise) for i in truth]
+    mean_aps = statistics.mean(len(f) for f in fingerprints.values())
+    print(f"{len(store)} reference points, {len(store.bssid_index)} APs, "
+          f"{mean_aps:.1f} APs heard per point, {len(scans)} scans")
+
+    def run(name, index):
+        latencies, results = [], []
+        for scan in scans:
+            started = time.perf_counter()
+            results.append(store.locate(scan, index=index))
+            latencies.append((time.perf_counter() - started) * 1e6)
+        errors = sorted(math.dist(locations[found], locations[actual]) if found is not None else math.inf
+                        for found, actual in zip(results, truth))
+        report(name, latencies)
+        print(f"{'':<24} median error {errors[len(errors) // 2]:.1f} m   "
+              f"within 5 m {sum(e <= 5.0 for e in errors) / len(errors):.1%}")
+        return results
+
+    exact = run("brute force", None)
+    for strongest in args.strongest:
+        index = StrongestAPIndex(store, strongest, args.point_aps)
+        index.candidates(scans[0])  # build the postings outside the timed loop
+        results = run(f"strongest {strongest} APs", index)
+        candidates = [index.candidates(scan) for scan in scans]
+        recall = sum(actual in rows for actual, rows in zip(truth, candidates)) / len(scans)
+        agreement = sum(a == b for a, b in zip(results, exact)) / len(scans)
+        mean_candidates = statistics.mean(len(rows) for rows in candidates)
+        print(f"{'':<24} recall {recall:.3f}   agreement {agreement:.3f}   {mean_candidates:.0f} "
+              f"candidates per scan ({mean_candidates / len(store):.1%} of points)")
+
+def bench_tracking(args):
+    """
+    Particle-filter tracking vs independent per-scan matching on simulated walks.
+
+    Every node of the graph is fingerprinted; a walker then follows random routes
+    one node per scan while scans are taken with --noise dBm of noise. Reports the
+    error against the walker's true node and how far the reported position moves
+    between consecutive scans, next to how far the walker actually moved.
+    """
+    import math
+    graph, routing_graph = load_graph(args)
+    store_graph = RoutingGraphStore(graph, build_csr=True)
+    store_graph.refresh(*routing_graph_rows(args))
+    positions = routing_graph.positions
+    xs = [x for x, _ in positions.values()]
+    ys = [y for _, y in positions.values()]
+    rng = random.Random(args.seed)
+    access_points = [(rng.uniform(min(xs), max(xs)), rng.uniform(min(ys), max(ys))) for _ in range(args.aps)]
+    reading = path_loss_model(access_points, rng)
+
+    fingerprints = FingerprintStore.from_fingerprints(
+        {node_id: reading(*positions[node_id], 1.0) for node_id in routing_graph.nodes})
+    node_ids = list(routing_graph.nodes)
+    print(f"Graph: {len(node_ids)} nodes, {args.aps} APs, {args.walks} walks, noise {args.noise} dBm")
+
+    def independent(scan):
+        return fingerprints.locate(scan, threshold=math.inf)
+
+    def independent_missing(scan):
+        return fingerprints.node_ids[int(fingerprints.scores(scan, missing=-95.0).argmin())]
+
+    methods = ['independent', 'independent, missing APs', 'tracker']
+    results = {name: ([], [], []) for name in methods}
+    walked = []
+    for walk in range(args.walks):
+        while True:
+            path = a_star(routing_graph, rng.choice(node_ids), rng.choice(node_ids))
+            if len(path) > 10:
+                break
+        walked.extend(math.dist(positions[a], positions[b]) for a, b in zip(path, path[1:]))
+        tracker = PositionTracker(fingerprints, store_graph, particles=args.particles, seed=args.seed + walk)
+        locators = [independent, independent_missing, lambda scan: (tracker.update(scan) or {}).get('node_id')]
+        previous = {name: None for name in methods}
+        for node_id in path:
+            scan = reading(*positions[node_id], args.noise)
+            for name, locate in zip(methods, locators):
+                started = time.perf_counter()
+                found = locate(scan)
+                elapsed = time.perf_counter() - started
+                errors, steps, latencies = results[name]
+                errors.append(math.dist(positions[found], positions[node_id]) if found is not None else math.inf)
+                if previous[name] is not None and found is not None:
+                    steps.append(math.dist(positions[previous[name]], positions[found]))
+                previous[name] = found
+                latencies.append(elapsed * 1e6)
+
+    print(f"Walker moves {statistics.mean(walked):.1f} per scan")
+    for name, (errors, steps, latencies) in results.items():
+        errors.sort()
+        report(name, latencies)
+        print(f"{'':<24} median error {errors[len(errors) // 2]:.1f}   "
+              f"p90 error {errors[int(len(errors) * 0.9)]:.1f}   "
+              f"exact node {sum(e == 0 for e in errors) / len(errors):.1%}   "
+              f"moves {statistics.mean(steps):.1f} per scan")
+
+def bench_reroute(args):
+    """
+    Rerouting from a destination tree vs a fresh a_star, and tree repair vs rebuild.
+
+    Each closure removes one random edge (and reopens the previous one); the repaired
+    tree is checked against a freshly built one after every change.
+    """
+    graph, routing_graph = load_graph(args)
+    edges, keycard_edges = routing_graph_rows(args)
+    csr = routing_graph.csr
+    rng = random.Random(args.seed)
+    node_ids = list(routing_graph.nodes)
+    print(f"Graph: {len(csr)} nodes, {routing_graph.edge_count} edges")
+
+    destination = rng.choice(node_ids)
+    started = time.perf_counter()
+    tree = DestinationTree(csr, destination)
+    print(f"Built destination tree in {(time.perf_counter() - started) * 1e3:.1f} ms")
+
+    pairs = [(rng.choice(node_ids), destination) for _ in range(args.queries)]
+    report("a_star reroute", time_calls(lambda s, e: a_star(routing_graph, s, e), pairs))
+    report("tree reroute", time_calls(lambda s, e: tree.route(s), pairs))
+
+    repair_times, rebuild_times, repaired = [], [], []
+    for _ in range(args.closures):
+        closed = rng.randrange(len(edges))
+        row = edges[closed]
+        new_csr = RoutingGraph(graph, edges[:closed] + edges[closed + 1:], keycard_edges).csr
+
+        tree.mark_changed([row['pointnum1'], row['pointnum2']])
+        started = time.perf_counter()
+        repaired.append(tree.sync(new_csr))
+        repair_times.append((time.perf_counter() - started) * 1e6)
+
+        started = time.perf_counter()
+        DestinationTree(new_csr, destination)
+        rebuild_times.append((time.perf_counter() - started) * 1e6)
+
+        non_hallway, distance, _, _ = shortest_path_tree(new_csr, new_csr.index[destination])
+        for i in range(len(new_csr)):
+            if distance[i] == float('inf'):
+                assert tree.distance[i] == distance[i], f"node {new_csr.ids[i]} should be unreachable"
+            else:
+                assert tree.non_hallway[i] == non_hallway[i] and abs(tree.distance[i] - distance[i]) < 1e-6, \
+                    f"repaired cost of node {new_csr.ids[i]} differs from Dijkstra"
+
+        # Reopen the edge before the next closure
+        tree.mark_changed([row['pointnum1'], row['pointnum2']])
+        tree.sync(csr)
+
+    print(f"\n{args.closures} edge closures, repaired trees match a fresh Dijkstra")
+    report("tree repair", repair_times)
+    report("tree rebuild", rebuild_times)
+    print(f"{'':<24} {statistics.mean(repaired):.0f} of {len(csr)} nodes touched per repair on average")
+
+def scalar_instructions(graph, path):
+    """The original per-segment instruction loop, kept as the reference for bench_instructions"""
+    if not path or len(path) < 2:
+        return []
+    instructions = []
+    current_direction = "forward"
+    current_distance = 0
+    for i in range(len(path) - 1):
+        current_x, current_y = graph.position(path[i])
+        next_x, next_y = graph.position(path[i + 1])
+        dx, dy = next_x - current_x, next_y - current_y
+        distance_feet = round((dx**2 + dy**2)**0.5)
+        if i == 0:
+            current_distance = distance_feet
+            continue
+        prev_x, prev_y = graph.position(path[i - 1])
+        turn_direction = get_relative_direction(current_x - prev_x, current_y - prev_y, dx, dy)
+        if turn_direction != "straight":
+            instructions.append(f"{current_direction}: {current_distance} feet")
+            current_direction = turn_direction
+            current_distance = distance_feet
+        else:
+            current_distance += distance_feet
+    instructions.append(f"{current_direction}: {current_distance} feet")
+    return instructions
+
+def bench_instructions(args):
+    """Vectorized instructions vs the per-segment loop on long cross-building paths"""
+    graph, routing_graph = load_graph(args)
+    csr = routing_graph.csr
+    rng = random.Random(args.seed)
+    node_ids = list(routing_graph.nodes)
+    paths = []
+    while len(paths) < args.queries:
+        path = a_star(routing_graph, rng.choice(node_ids), rng.choice(node_ids))
+        if len(path) >= args.min_length:
+            paths.append(path)
+    landmarks = {node_id: f"{node.type_name} {node_id}" for node_id, node in routing_graph.nodes.items()}
+    print(f"Graph: {len(csr)} nodes; {len(paths)} paths of "
+          f"{statistics.mean(len(path) for path in paths):.0f} nodes on average")
+
+    for path in paths:
+        expected = scalar_instructions(routing_graph, path)
+        for target in (graph, routing_graph, csr):
+            assert get_navigation_instructions(target, path) == expected, "instructions differ from the reference"
+    print("Instructions match the per-segment reference on every path")
+
+    def timed(fn):
+        latencies = []
+        for path in paths:
+            started = time.perf_counter()
+            fn(path)
+            latencies.append((time.perf_counter() - started) * 1e6)
+        return latencies
+
+    report("per-segment loop", timed(lambda path: scalar_instructions(routing_graph, path)))
+    report("vectorized", timed(lambda path: get_navigation_instructions(routing_graph, path)))
+    report("vectorized (csr)", timed(lambda path: get_navigation_instructions(csr, path)))
+    report("steps + landmarks", timed(lambda path: get_navigation_steps(csr, path, landmarks)))
+
+class SlowTableClient(LocalTableClient):
+    """LocalTableClient that waits latency seconds per query, standing in for a remote database"""
+
+    def __init__(self, tables, latency):
+        super().__init__(tables)
+        self.latency = latency
+
+    def table(self, name):
+        query = super().table(name)
+        execute = query.execute
+
+        def delayed():
+            time.sleep(self.latency)
+            return execute()
+        query.execute = delayed
+        return query
+
+    from_ = table
+
+def bench_tables(args):
+    """Table mirror: cold start from the remote vs the snapshot, and reads from memory vs remote"""
+    points, edges, keycard_edges = synthetic_tables(corridors=args.synthetic, seed=args.seed)
+    room_info = [{'room_number': row['pointnum'], 'space_description': f"Room {row['pointnum']}",
+                  'contact': '', 'department': ''} for row in points if row['type'] == 'room']
+    tables = {"Point Table": points, "Edge Table": edges, "Keycard Edge Table": keycard_edges,
+              "Room Info Table": room_info}
+    remote = SlowTableClient(tables, args.latency / 1000.0)
+    sources = {name: remote for name in tables}
+    print(f"Tables: {', '.join(f'{name} ({len(rows)})' for name, rows in tables.items())}; "
+          f"{args.latency:.0f} ms per remote query")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'tables.db')
+        started = time.perf_counter()
+        TableMirror(sources, path).refresh()
+        fetched = time.perf_counter() - started
+
+        mirror = TableMirror(sources, path)
+        started = time.perf_counter()
+        assert mirror.load(), "snapshot is missing tables"
+        loaded = time.perf_counter() - started
+        assert all(mirror.rows(name) == remote.tables[name] for name in tables), "snapshot differs from the remote"
+        print(f"Cold start: {fetched * 1000:.1f} ms fetching, {loaded * 1000:.1f} ms from the snapshot "
+              f"({os.path.getsize(path) / 1024:.0f} KiB)")
+
+    rng = random.Random(args.seed)
+    descriptions = [rng.choice(room_info)['space_description'] for _ in range(min(args.queries, 50))]
+
+    def timed(client):
+        latencies = []
+        for description in descriptions:
+            started = time.perf_counter()
+            client.from_("Room Info Table").select('room_number').eq('space_description', description).execute()
+            latencies.append((time.perf_counter() - started) * 1e6)
+        return latencies
+
+    report("room lookup, remote", timed(remote))
+    report("room lookup, mirror", timed(mirror.local))
+
+ROOM_KINDS = ['Lab', 'Office', 'Conference Room', 'Classroom', 'Storage', 'Lounge', 'Server Room', 'Study Area',
+              'Mechanical', 'Workshop', 'Reception', 'Auditorium']
+DEPARTMENTS = ['Computer Science', 'Electrical Engineering', 'Mathematics', 'Physics', 'Facilities', 'Admissions']
+CONTACTS = ['Alvarez', 'Brooks', 'Chen', 'Dubois', 'Evans', 'Fischer', 'Garcia', 'Hughes', 'Ito', 'Jensen']
+
+def synthetic_room_info(points, seed):
+    """Room Info rows for the synthetic building's rooms, about 80% of them described"""
+    rng = random.Random(seed)
+    return [{'room_number': row['pointnum'],
+             'space_description': f"{rng.choice(CONTACTS)} {rng.choice(ROOM_KINDS)}" if rng.random() < 0.5
+             else rng.choice(ROOM_KINDS),
+             'department': rng.choice(DEPARTMENTS), 'contact': f"Dr. {rng.choice(CONTACTS)}"}
+            for row in points if row['type'] == 'room' and rng.random() < 0.8]
+
+def bench_search(args):
+    """Room search index vs shipping the tables to the client and filtering them there"""
+    points, _, _ = synthetic_tables(corridors=args.synthetic, seed=args.seed)
+    room_info = synthetic_room_info(points, args.seed)
+    room_ids = [row['pointnum'] for row in points if row['type'] == 'room']
+
+    started = time.perf_counter()
+    index = RoomSearchIndex(room_info, room_ids)
+    print(f"Indexed {len(index)} rooms ({len(room_info)} with Room Info, {len(index.vocabulary)} tokens) "
+          f"in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    # What the page used to download before it could autocomplete anything
+    descriptions = [{'room_number': row['room_number'], 'space_description': row['space_description']}
+                    for row in room_info]
+    nodes = {row['pointnum']: {'x': row['x_position'], 'y': row['y_position'], 'type': row['type'],
+                               'description': f"Node {row['pointnum']}", 'is_decision_point': False}
+             for row in points}
+    shipped = len(json.dumps(descriptions)) + len(json.dumps(nodes))
+
+    rng = random.Random(args.seed)
+    labels = [room['label'] for room in index.rooms]
+    queries = {
+        'prefix': [rng.choice(ROOM_KINDS)[:rng.randint(2, 4)] for _ in range(args.queries)],
+        'number': [rng.choice(room_ids)[:rng.randint(1, 3)] for _ in range(args.queries)],
+        'two words': [f"{rng.choice(CONTACTS)} {rng.choice(ROOM_KINDS)[:3]}" for _ in range(args.queries)],
+        'typo': [rng.choice(['Labratory', 'Ofice', 'Conferance', 'Clasroom', 'Worksop']) for _ in range(args.queries)],
+    }
+    print(f"Page load before: {shipped / 1024:.0f} KiB of room descriptions and nodes")
+    for kind, texts in queries.items():
+        results = [index.search(text, 20) for text in texts]
+        payload = statistics.mean(len(json.dumps({'query': text, 'results': found}))
+                                  for text, found in zip(texts, results))
+        print(f"\n[{kind}] e.g. {texts[0]!r} -> {[room['label'] for room in results[0][:2]]}, "
+              f"{payload / 1024:.1f} KiB per response")
+        report("substring filter", time_calls(
+            lambda text, _: [label for label in labels if text.lower() in label.lower()][:20],
+            [(text, None) for text in texts]))
+        report("search index", time_calls(lambda text, _: index.search(text, 20), [(text, None) for text in texts]))
+        store = RoomSearchStore()
+        store.refresh(room_info, room_ids)
+        for text in texts:
+            store.search(text, 20)
+        report("search index, cached", time_calls(lambda text, _: store.search(text, 20),
+                                                  [(text, None) for text in texts]))
+
+def path_cost(csr, path, has_keycard=False):
+    """(non_hallway_count, distance) of a path, the cost a_star minimizes"""
+    non_hallway, distance = 0, 0.0
+    for a, b in zip(path, path[1:]):
+        weight, hallway = min((weight, not hallway) for j, weight, hallway in
+                              csr.neighbor_indices(csr.index[a], has_keycard) if csr.ids[j] == b)
+        non_hallway, distance = non_hallway + hallway, distance + weight
+    return non_hallway, round(distance, 6)
+
+def bench_floors(args):
+    """Multi-floor routing: vertical heuristic and per-floor partitions vs the whole graph"""
+    points, edges, keycard_edges = synthetic_tables(corridors=args.synthetic, seed=args.seed, floors=args.floors)
+    graph = build_graph(points)
+    routing_graph = RoutingGraph(graph, edges, keycard_edges)
+    csr = routing_graph.csr
+    rooms = {}
+    for node_id, node in graph.nodes.items():
+        if node.type_name == 'room':
+            rooms.setdefault(node.layer, []).append(node_id)
+    print(f"Graph: {len(csr)} nodes on {args.floors} floors, {routing_graph.edge_count} edges")
+
+    rng = random.Random(args.seed)
+    same = [(rng.choice(rooms[layer]), rng.choice(rooms[layer]))
+            for layer in (rng.choice(list(rooms)) for _ in range(args.queries))]
+    cross = []
+    while len(cross) < args.queries:
+        a, b = rng.sample(list(rooms), 2) if len(rooms) > 1 else (1, 1)
+        cross.append((rng.choice(rooms[a]), rng.choice(rooms[b])))
+
+    for label, pairs in (("same floor", same), ("across floors", cross)):
+        print(f"\n[{label}]")
+        expected = [path_cost(csr, a_star(csr, s, e)) for s, e in pairs]
+        assert [path_cost(csr, a_star(csr.floors, s, e)) for s, e in pairs] == expected, "partitions disagree"
+
+        original, pathfinding.MIN_FLOOR_CHANGE_COST = pathfinding.MIN_FLOOR_CHANGE_COST, 0.0
+        try:
+            report("csr, no vertical term", time_calls(lambda s, e: a_star(csr, s, e), pairs))
+        finally:
+            pathfinding.MIN_FLOOR_CHANGE_COST = original
+        report("csr", time_calls(lambda s, e: a_star(csr, s, e), pairs))
+        report("floor partitions", time_calls(lambda s, e: a_star(csr.floors, s, e), pairs))
+
+        loaded = []
+        for s, e in pairs:
+            partitions = FloorPartitions(csr)
+            a_star(partitions, s, e)
+            loaded.append(len(partitions.loaded))
+        print(f"floors built per search, from cold: mean {statistics.mean(loaded):.2f} of {args.floors}")
+
+def bench_hierarchy(args):
+    """Hierarchical routing over cluster portals vs flat A*, from one building to a campus"""
+    for buildings in args.buildings:
+        points, edges, keycard_edges = synthetic_tables(corridors=args.synthetic, seed=args.seed,
+                                                        floors=args.floors, buildings=buildings)
+        graph = build_graph(points)
+        csr = RoutingGraph(graph, edges, keycard_edges).csr
+        rooms = [node_id for node_id, node in graph.nodes.items() if node.type_name == 'room']
+        pairs = sample_pairs(rooms, args.queries, args.seed)
+
+        started = time.perf_counter()
+        hierarchy = ClusterHierarchy(csr, args.cluster_size)
+        portal_graph = hierarchy.portal_graph()
+        built = time.perf_counter() - started
+        print(f"\n[{buildings} building{'s' if buildings > 1 else ''}] {len(csr)} nodes, "
+              f"{hierarchy.cluster_count} clusters, {len(portal_graph.links)} portals, "
+              f"{portal_graph.shortcuts} shortcuts, built in {built * 1000:.0f} ms")
+
+        for has_keycard in (False, True):
+            for s, e in pairs:
+                expected = path_cost(csr, a_star(csr, s, e, has_keycard=has_keycard), has_keycard)
+                got = path_cost(csr, a_star(hierarchy, s, e, has_keycard=has_keycard), has_keycard)
+                assert got[0] == expected[0] and abs(got[1] - expected[1]) < 1e-6, "hierarchical route costs more"
+        hierarchy.portal_graph(has_keycard=True)
+
+        report("flat a_star (csr)", time_calls(lambda s, e: a_star(csr, s, e), pairs))
+        report("hierarchical", time_calls(lambda s, e: a_star(hierarchy, s, e), pairs))
+        report("hierarchical, keycard", time_calls(lambda s, e: a_star(hierarchy, s, e, has_keycard=True), pairs))
+
+def bench_contraction(args):
+    """Contraction hierarchy queries vs A*: preprocessing, artifact size and query latency"""
+    if args.points:
+        graph, routing_graph = load_graph(args)
+    else:
+        points, edges, keycard_edges = synthetic_tables(corridors=args.synthetic, seed=args.seed,
+                                                        floors=args.floors, buildings=args.buildings)
+        graph = build_graph(points)
+        routing_graph = RoutingGraph(graph, edges, keycard_edges)
+    csr = routing_graph.csr
+    pairs = sample_pairs(list(csr.ids), args.queries, args.seed)
+    print(f"Graph: {len(csr)} nodes, {csr.edge_count} adjacency entries")
+
+    started = time.perf_counter()
+    hierarchy = ContractionHierarchy.build(csr)
+    print(f"Preprocessed {len(hierarchy.profiles)} profiles in {time.perf_counter() - started:.1f}s: " +
+          ", ".join(f"{'keycard' if has_keycard else 'public'} {profile.edge_count} upward edges"
+                    for (_, has_keycard), profile in hierarchy.profiles.items()))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'contraction_hierarchy.bin')
+        hierarchy.save(path)
+        started = time.perf_counter()
+        hierarchy = ContractionHierarchy.load(path)
+        print(f"Artifact: {os.path.getsize(path) / 1024:.0f} KiB, loaded in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    for has_keycard in (False, True):
+        for s, e in pairs:
+            expected = path_cost(csr, a_star(csr, s, e, has_keycard=has_keycard), has_keycard)
+            path = hierarchy.lookup(s, e, has_keycard=has_keycard)
+            got = path_cost(csr, path, has_keycard)
+            assert path[0] == s and path[-1] == e, "unpacked route has the wrong ends"
+            assert got[0] == expected[0] and abs(got[1] - expected[1]) < 1e-6, "hierarchy route costs more"
+    print("Every route costs the same as a_star's, with and without a keycard")
+
+    report("a_star (csr)", time_calls(lambda s, e: a_star(csr, s, e), pairs))
+    report("contraction hierarchy", time_calls(lambda s, e: hierarchy.lookup(s, e), pairs))
+    report("  keycard", time_calls(lambda s, e: hierarchy.lookup(s, e, has_keycard=True), pairs))
+    report("  + instructions", time_calls(
+        lambda s, e: get_navigation_instructions(csr, hierarchy.lookup(s, e)), pairs))
+
+def bench_alt(args):
+    """Bidirectional A* and landmark (ALT) bounds vs A*, on fixed representative room pairs"""
+    length, spacing, corridors, floors = 40, 10.0, args.synthetic, args.floors
+    points, edges, keycard_edges = synthetic_tables(corridors=corridors, length=length, spacing=spacing,
+                                                    seed=args.seed, floors=floors, buildings=args.buildings)
+    graph = build_graph(points)
+    csr = RoutingGraph(graph, edges, keycard_edges).csr
+    by_position = {(node.layer, node.x, node.y): node_id
+                   for node_id, node in graph.nodes.items() if node.type_name == 'room'}
+
+    def room(building, layer, c, i, side):
+        """Room beside point i of corridor c; buildings repeat every building plus walkway"""
+        x = building * (length + 10) * spacing + i * spacing
+        return by_position[(layer, x, c * spacing * 4 + side * spacing * 1.5)]
+
+    last, middle, far = corridors - 1, corridors // 2, args.buildings - 1
+    pairs = {
+        "same corridor": [(room(0, 1, c, 2, -1), room(0, 1, c, length - 3, 1)) for c in (0, middle, last)],
+        # Rooms 10 feet apart through a wall, the route around via the corridor ends
+        "through a wall": [(room(0, 1, c, i, 1), room(0, 1, c + 1, i, -1))
+                           for c in (1, middle, last - 2) for i in (length // 4, 3 * length // 4)],
+        "across the building": [(room(0, 1, 0, 0, -1), room(0, 1, last, length - 1, 1)),
+                                (room(0, 1, last, 0, 1), room(0, 1, 0, length - 1, -1))],
+        "across floors": [(room(0, 1, middle, length // 4, 1), room(0, floors, middle, length // 4, 1)),
+                          (room(0, 1, last, length - 1, -1), room(0, floors, 0, 0, 1))],
+        "across buildings": [(room(0, 1, middle, length // 4, 1), room(far, 1, middle, 3 * length // 4, -1)),
+                             (room(0, floors, last, 0, -1), room(far, floors, 0, length - 1, 1))],
+    }
+
+    started = time.perf_counter()
+    landmarks = Landmarks(csr, args.landmarks)
+    for has_keycard in (False, True):
+        landmarks.table(has_keycard)
+    print(f"Graph: {len(csr)} nodes, {args.buildings} building(s) of {floors} floor(s); "
+          f"{len(landmarks.landmarks)} landmarks in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    searches = [
+        ("a_star (csr)", lambda s, e, stats: a_star(csr, s, e, stats=stats)),
+        ("bidirectional", lambda s, e, stats: bidirectional_a_star(csr, s, e, stats=stats)),
+        ("ALT, bidirectional", lambda s, e, stats: a_star(landmarks, s, e, stats=stats)),
+    ]
+    for label, category in pairs.items():
+        for has_keycard in (False, True):
+            for s, e in category:
+                expected = path_cost(csr, a_star(csr, s, e, has_keycard=has_keycard), has_keycard)
+                for route in (bidirectional_a_star(csr, s, e, has_keycard=has_keycard),
+                              a_star(landmarks, s, e, has_keycard=has_keycard)):
+                    got = path_cost(csr, route, has_keycard)
+                    assert got[0] == expected[0] and abs(got[1] - expected[1]) < 1e-6, "route costs more"
+
+        print(f"\n[{label}] {len(category)} pairs")
+        for name, search in searches:
+            stats = SearchStats()
+            latencies = time_calls(lambda s, e: search(s, e, stats), category * 20)
+            report(name, latencies)
+            print(f"{'':<24} expanded {stats.expanded / stats.queries:>8.0f} nodes per query")
+
+# Run in each worker process by bench_startup: import the app and serve one route
+STARTUP_WORKER = """
+import json, sys, time
+spawned = float(sys.argv[1])
+import app
+imported = time.time()
+client = app.app.test_client()
+ids = list(app.graph.nodes)
+response = client.post('/api/route', json={'start': ids[0], 'end': ids[-1]})
+assert response.get_json()['success'], response.get_json()
+print(json.dumps({'import': imported - spawned, 'setup': app.startup_seconds,
+                  'first_route': time.time() - spawned, 'source': app.graph_source}))
+"""
+
+def bench_startup(args):
+    """Time from process spawn to the first served route, for N workers starting at once"""
+    repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    points, edges, keycard_edges = synthetic_tables(corridors=args.synthetic, seed=args.seed)
+    tables = {"Point Table": points, "Edge Table": edges, "Keycard Edge Table": keycard_edges,
+              "Room Info Table": []}
+    print(f"Graph: {len(points)} nodes, {len(edges) + len(keycard_edges)} edges")
+
+    with tempfile.TemporaryDirectory() as directory:
+        table_path = os.path.join(directory, 'tables.db')
+        graph_path = os.path.join(directory, 'graph.bin')
+        mirror = TableMirror({name: LocalTableClient(tables) for name in tables}, table_path)
+        mirror.refresh()
+        graph = build_graph(points, edges, keycard_edges)
+        save_graph_snapshot(graph_path, RoutingGraph(graph, edges, keycard_edges),
+                            {name: mirror.digests[name] for name in ("Point Table", "Edge Table", "Keycard Edge Table")})
+
+        for label, snapshot in (("table rows", ""), ("graph snapshot", graph_path)):
+            env = dict(os.environ, TABLE_SNAPSHOT_PATH=table_path, GRAPH_SNAPSHOT_PATH=snapshot,
+                       TABLE_REFRESH_ON_START="0", PYTHONPATH=os.pathsep.join(
+                           filter(None, [repo_root, os.environ.get('PYTHONPATH')])))
+            for workers in args.workers:
+                results = []
+                for _ in range(args.repeat):
+                    spawned = time.time()
+                    processes = [subprocess.Popen([sys.executable, '-c', STARTUP_WORKER, str(spawned)],
+                                                  cwd=repo_root, env=env, stdout=subprocess.PIPE,
+                                                  stderr=subprocess.DEVNULL, text=True)
+                                 for _ in range(workers)]
+                    results += [json.loads(process.communicate()[0].strip().splitlines()[-1]) for process in processes]
+                assert all(result['source'] == ("snapshot" if snapshot else "tables") for result in results)
+
+                def mean_ms(key):
+                    return statistics.mean(result[key] for result in results) * 1000
+                print(f"{label:<16} {workers:>2} workers   import {mean_ms('import'):>6.0f} ms   "
+                      f"graph setup {mean_ms('setup'):>5.0f} ms   first route {mean_ms('first_route'):>6.0f} ms")
+
+# Run in each worker process by bench_shared_graph: load the snapshot, touch every array, report memory
+SHARED_GRAPH_WORKER = """
+import json, sys
+from navigation_system.models.csr_graph import ARRAY_FIELDS
+from navigation_system.utils.graph_io import read_graph_snapshot
+
+def rss_anon():
+    with open('/proc/self/status') as f:
+        return next(int(line.split()[1]) for line in f if line.startswith('RssAnon:')) * 1024
+
+def mapped_pss(path):
+    pss, inside = 0, False
+    with open('/proc/self/smaps') as f:
+        for line in f:
+            fields = line.split()
+            if '-' in fields[0] and len(fields) >= 5:
+                inside = fields[-1] == path
+            elif inside and fields[0] == 'Pss:':
+                pss += int(fields[1]) * 1024
+    return pss
+
+path, mapped = sys.argv[1], sys.argv[2] == 'mapped'
+before = rss_anon()
+header, csr = read_graph_snapshot(path, mapped)
+del header
+arrays = [getattr(csr, field) for field in ARRAY_FIELDS]
+checksum = sum(sum(values) for values in arrays)
+print('ready', flush=True)
+sys.stdin.readline()
+print(json.dumps({'private': rss_anon() - before, 'shared': mapped_pss(path)}), flush=True)
+sys.stdin.readline()
+"""
+
+def bench_shared_graph(args):
+    """Physical memory for the graph across N workers: private copies vs one memory-mapped file"""
+    repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    graph, routing_graph = load_graph(args)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [repo_root, os.environ.get('PYTHONPATH')])))
+    print(f"Graph: {len(routing_graph)} nodes, {routing_graph.csr.nbytes() / 1024:.0f} KiB of CSR arrays")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.realpath(os.path.join(directory, 'graph.bin'))
+        save_graph_snapshot(path, routing_graph)
+        for mode in ('copied', 'mapped'):
+            for workers in args.workers:
+                processes = [subprocess.Popen([sys.executable, '-c', SHARED_GRAPH_WORKER, path, mode], cwd=repo_root,
+                                              env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+                             for _ in range(workers)]
+                for process in processes:  # every worker holds the graph before any measures
+                    assert process.stdout.readline().strip() == 'ready'
+                for process in processes:
+                    process.stdin.write('measure\n')
+                    process.stdin.flush()
+                # Read every report before any worker exits, so each sees the others' mappings
+                results = [json.loads(process.stdout.readline()) for process in processes]
+                for process in processes:
+                    process.communicate('exit\n')
+                private = sum(result['private'] for result in results)
+                shared = sum(result['shared'] for result in results)
+                print(f"{mode:<7} {workers:>2} workers   private {private / 1024:>8.0f} KiB   "
+                      f"mapped (PSS) {shared / 1024:>6.0f} KiB   total {(private + shared) / 1024:>8.0f} KiB")
+
+def routing_graph_rows(args):
+    """Edge and keycard edge rows named by the shared graph arguments"""
+    if args.points:
+        return read_table_csv(args.edges), read_table_csv(args.keycard_edges) if args.keycard_edges else []
+    _, edges, keycard_edges = synthetic_tables(corridors=args.synthetic, seed=args.seed)
+    return edges, keycard_edges
+
+def main():
+    parser = argparse.ArgumentParser(description='Routing benchmarks')
+    parser.add_argument('--points', default=None, help='Point Table CSV export (default: synthetic building)')
+    parser.add_argument('--edges', default='edge_table.csv', help='Edge Table CSV export')
+    parser.add_argument('--keycard-edges', default=None, help='Keycard Edge Table CSV export')
+    parser.add_argument('--synthetic', type=int, default=10, help='Corridors in the synthetic building')
+    parser.add_argument('--queries', type=int, default=200, help='Number of queries to time')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+
+    subparsers = parser.add_subparsers(dest='command', help='Benchmark to run')
+    subparsers.add_parser('route-table', help='Route table lookup vs live a_star')
+
+    parallel_parser = subparsers.add_parser('parallel', help='Process pool scaling from 1 to N workers')
+    parallel_parser.add_argument('--max-processes', type=int, default=os.cpu_count() or 1,
+                                 help='Largest worker count to measure')
+    parallel_parser.add_argument('--origins', type=int, default=100,
+                                 help='Origins for the distance matrix and route table jobs')
+
+    fingerprint_parser = subparsers.add_parser('fingerprints', help='Strongest-AP fingerprint index vs brute force')
+    fingerprint_parser.add_argument('--reference-points', type=int, default=20000,
+                                    help='Fingerprinted reference points')
+    fingerprint_parser.add_argument('--aps', type=int, default=400, help='Access points in the building')
+    fingerprint_parser.add_argument('--noise', type=float, default=4.0, help='Scan noise in dBm')
+    fingerprint_parser.add_argument('--strongest', type=int, nargs='+', default=[1, 3, 5],
+                                    help='Strongest scan APs to probe the index with')
+    fingerprint_parser.add_argument('--point-aps', type=int, default=8,
+                                    help='Loudest APs each reference point is indexed under')
+
+    tracking_parser = subparsers.add_parser('tracking', help='Particle-filter tracking vs per-scan matching')
+    tracking_parser.add_argument('--walks', type=int, default=20, help='Simulated walks')
+    tracking_parser.add_argument('--aps', type=int, default=60, help='Access points in the building')
+    tracking_parser.add_argument('--noise', type=float, default=6.0, help='Scan noise in dBm')
+    tracking_parser.add_argument('--particles', type=int, default=300, help='Particles per tracker')
+
+    reroute_parser = subparsers.add_parser('reroute', help='Destination tree rerouting and repair')
+    reroute_parser.add_argument('--closures', type=int, default=50, help='Random edge closures to repair')
+
+    instructions_parser = subparsers.add_parser('instructions', help='Vectorized turn instructions vs the loop')
+    instructions_parser.add_argument('--min-length', type=int, default=60, help='Shortest path (in nodes) to time')
+
+    tables_parser = subparsers.add_parser('tables', help='Table mirror snapshot start and reads vs the remote')
+    tables_parser.add_argument('--latency', type=float, default=40.0, help='Simulated remote query latency in ms')
+
+    startup_parser = subparsers.add_parser('startup', help='Spawn-to-first-route time across worker counts')
+    startup_parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4],
+                                help='Worker processes started at once')
+    startup_parser.add_argument('--repeat', type=int, default=3, help='Runs per worker count')
+
+    shared_parser = subparsers.add_parser('shared-graph', help='Graph memory across workers, copied vs mmap')
+    shared_parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8],
+                               help='Worker processes holding the graph at once')
+
+    search_parser = subparsers.add_parser('search', help='Room search index vs client-side filtering')
+
+    floors_parser = subparsers.add_parser('floors', help='Multi-floor routing over per-floor partitions')
+    floors_parser.add_argument('--floors', type=int, default=4, help='Floors in the synthetic building')
+
+    hierarchy_parser = subparsers.add_parser('hierarchy', help='Hierarchical routing vs flat A* across campus sizes')
+    hierarchy_parser.add_argument('--buildings', type=int, nargs='+', default=[1, 5, 10, 20],
+                                  help='Buildings in each synthetic campus')
+    hierarchy_parser.add_argument('--floors', type=int, default=2, help='Floors per building')
+    hierarchy_parser.add_argument('--cluster-size', type=float, default=DEFAULT_CLUSTER_SIZE,
+                                  help='Cluster cell size in feet')
+
+    contraction_parser = subparsers.add_parser('contraction', help='Contraction hierarchy queries vs A*')
+    contraction_parser.add_argument('--floors', type=int, default=1, help='Floors per synthetic building')
+    contraction_parser.add_argument('--buildings', type=int, default=1, help='Buildings in the synthetic campus')
+
+    alt_parser = subparsers.add_parser('alt', help='Bidirectional and landmark A* on representative room pairs')
+    alt_parser.add_argument('--floors', type=int, default=2, help='Floors per synthetic building')
+    alt_parser.add_argument('--buildings', type=int, default=2, help='Buildings in the synthetic campus')
+    alt_parser.add_argument('--landmarks', type=int, default=DEFAULT_LANDMARKS, help='Landmarks to select')
+
+    args = parser.parse_args()
+
+    if args.command == 'route-table':
+        bench_route_table(args)
+    elif args.command == 'parallel':
+        bench_parallel(args)
+    elif args.command == 'fingerprints':
+        bench_fingerprints(args)
+    elif args.command == 'tracking':
+        bench_tracking(args)
+    elif args.command == 'reroute':
+        bench_reroute(args)
+    elif args.command == 'instructions':
+        bench_instructions(args)
+    elif args.command == 'tables':
+        bench_tables(args)
+    elif args.command == 'startup':
+        bench_startup(args)
+    elif args.command == 'shared-graph':
+        bench_shared_graph(args)
+    elif args.command == 'search':
+        bench_search(args)
+    elif args.command == 'floors':
+        bench_floors(args)
+    elif args.command == 'hierarchy':
+        bench_hierarchy(args)
+    elif args.command == 'contraction':
+        bench_contraction(args)
+    elif args.command == 'alt':
+        bench_alt(args)
+    else:
+        parser.print_help()
+
+if __name__ == '__main__':
+    main()
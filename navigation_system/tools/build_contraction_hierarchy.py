@@ -0,0 +1,41 @@
+# tools/build_contraction_hierarchy.py
+import argparse
+import sys
+import os
+import time
+
+# Add repository root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from navigation_system.models.routing_graph import RoutingGraph
+from navigation_system.models.csr_graph import CSRGraph
+from navigation_system.algorithms.contraction_hierarchy import ContractionHierarchy, CH_PROFILES
+from navigation_system.utils.graph_io import read_table_csv, build_graph, convert_ids
+
+def main():
+    parser = argparse.ArgumentParser(description='Preprocess contraction hierarchies for /api/route')
+    parser.add_argument('--points', default='point_table.csv', help='Point Table CSV export')
+    parser.add_argument('--edges', default='edge_table.csv', help='Edge Table CSV export')
+    parser.add_argument('--keycard-edges', default=None, help='Keycard Edge Table CSV export')
+    parser.add_argument('--output', default='contraction_hierarchy.bin', help='Output file path')
+    parser.add_argument('--id-type', choices=('str', 'int'), default='str',
+                        help='Type of pointnum in the live tables; the app ignores hierarchies whose ids differ')
+    args = parser.parse_args()
+
+    convert = int if args.id_type == 'int' else str
+    points = convert_ids(read_table_csv(args.points), convert)
+    edges = convert_ids(read_table_csv(args.edges), convert)
+    keycard_edges = convert_ids(read_table_csv(args.keycard_edges), convert) if args.keycard_edges else []
+
+    graph = build_graph(points)
+    csr = CSRGraph.from_routing_graph(RoutingGraph(graph, edges, keycard_edges))
+
+    print(f"Contracting {len(csr)} nodes for {len(CH_PROFILES)} profiles...")
+    started = time.perf_counter()
+    hierarchy = ContractionHierarchy.build(csr)
+    hierarchy.save(args.output)
+    print(f"Wrote {args.output} ({os.path.getsize(args.output)} bytes, version {hierarchy.version}, {hierarchy.id_type} ids) "
+          f"in {time.perf_counter() - started:.1f}s")
+
+if __name__ == '__main__':
+    main()
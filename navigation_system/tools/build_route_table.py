@@ -0,0 +1,51 @@
+# tools/build_route_table.py
+import argparse
+import sys
+import os
+import time
+
+# Add repository root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from navigation_system.models.routing_graph import RoutingGraph
+from navigation_system.models.csr_graph import CSRGraph
+from navigation_system.algorithms.route_table import PROFILES
+from navigation_system.algorithms.parallel import RouteWorkerPool
+from navigation_system.utils.graph_io import read_table_csv, build_graph, convert_ids
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute a next-hop route table for /api/route')
+    parser.add_argument('--points', default='point_table.csv', help='Point Table CSV export')
+    parser.add_argument('--edges', default='edge_table.csv', help='Edge Table CSV export')
+    parser.add_argument('--keycard-edges', default=None, help='Keycard Edge Table CSV export')
+    parser.add_argument('--output', default='route_table.bin', help='Output file path')
+    parser.add_argument('--target-type', action='append', default=None,
+                        help='Only precompute routes to nodes of this type (e.g. "room"); repeatable')
+    parser.add_argument('--processes', type=int, default=1, help='Worker processes to build with')
+    parser.add_argument('--id-type', choices=('str', 'int'), default='str',
+                        help='Type of pointnum in the live tables; the app ignores a table whose ids differ')
+    args = parser.parse_args()
+
+    convert = int if args.id_type == 'int' else str
+    points = convert_ids(read_table_csv(args.points), convert)
+    edges = convert_ids(read_table_csv(args.edges), convert)
+    keycard_edges = convert_ids(read_table_csv(args.keycard_edges), convert) if args.keycard_edges else []
+
+    graph = build_graph(points)
+    csr = CSRGraph.from_routing_graph(RoutingGraph(graph, edges, keycard_edges))
+
+    target_ids = None
+    if args.target_type:
+        target_ids = [node_id for node_id, node in graph.nodes.items() if node.type_name in args.target_type]
+
+    print(f"Building route table for {len(csr)} nodes, "
+          f"{len(target_ids) if target_ids is not None else len(csr)} destinations, {len(PROFILES)} profiles...")
+    started = time.perf_counter()
+    with RouteWorkerPool(csr, args.processes) as pool:
+        table = pool.build_route_table(target_ids)
+    table.save(args.output)
+    print(f"Wrote {args.output} ({os.path.getsize(args.output)} bytes, version {table.version}, {table.id_type} ids) "
+          f"in {time.perf_counter() - started:.1f}s")
+
+if __name__ == '__main__':
+    main()
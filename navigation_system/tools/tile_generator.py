@@ -0,0 +1,77 @@
+# tools/tile_generator.py
+import argparse
+import sys
+import os
+
+# Add repository root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from navigation_system.utils.map_tiles import generate_tiles, load_manifest, visible_tiles
+
+# Leaflet map bounds used by the templates (home.html is 800x500, wayfinding.html 783x595)
+DEFAULT_TILESETS = ['783x595', '800x500']
+
+def parse_size(value):
+    width, height = value.lower().split('x')
+    return int(width), int(height)
+
+def generate(args):
+    for tileset in args.tileset or DEFAULT_TILESETS:
+        width, height = parse_size(tileset)
+        output_dir = os.path.join(args.output, tileset)
+        print(f"Generating {args.format} tiles for {tileset} into {output_dir}...")
+        manifest = generate_tiles(args.image, output_dir, width, height, args.format,
+                                  args.quality, args.tile_size, args.max_zoom)
+        print(f"  {manifest['tiles']} tiles, zoom 0-{manifest['max_zoom']}, version {manifest['version']}")
+
+def measure(args):
+    """Compare first-paint bytes of the full map image against the tiles Leaflet requests"""
+    full_bytes = os.path.getsize(args.image)
+    viewport_width, viewport_height = parse_size(args.viewport)
+    print(f"Viewport {viewport_width}x{viewport_height}")
+    print(f"{'tileset':<10} {'zoom':>4} {'tiles':>6} {'tile bytes':>12} {'full image':>12} {'saved':>7}")
+
+    for tileset in args.tileset or DEFAULT_TILESETS:
+        manifest = load_manifest(os.path.join(args.output, tileset))
+        if manifest is None:
+            print(f"{tileset:<10} not generated, run the generate command first")
+            continue
+        tiles = visible_tiles(manifest, viewport_width, viewport_height)
+        tile_bytes = sum(
+            os.path.getsize(os.path.join(args.output, tileset, str(z), str(x), f"{y}.{manifest['format']}"))
+            for z, x, y in tiles
+        )
+        zoom = tiles[0][0] if tiles else 0
+        print(f"{tileset:<10} {zoom:>4} {len(tiles):>6} {tile_bytes:>12} {full_bytes:>12} "
+              f"{100 * (1 - tile_bytes / full_bytes):>6.1f}%")
+
+def main():
+    parser = argparse.ArgumentParser(description='Build and measure map tile pyramids for Leaflet')
+    parser.add_argument('--image', default='static/images/map.jpg', help='Source map image')
+    parser.add_argument('--output', default='static/tiles', help='Tile output directory')
+    parser.add_argument('--tileset', action='append', default=None,
+                        help='Map bounds as WIDTHxHEIGHT, repeatable (default: the template map sizes)')
+
+    subparsers = parser.add_subparsers(dest='command', help='Command to run')
+
+    generate_parser = subparsers.add_parser('generate', help='Generate tile pyramids')
+    generate_parser.add_argument('--format', default='webp', choices=['webp', 'jpeg'], help='Tile image format')
+    generate_parser.add_argument('--quality', type=int, default=80, help='Encoder quality')
+    generate_parser.add_argument('--tile-size', type=int, default=256, help='Tile size in pixels')
+    generate_parser.add_argument('--max-zoom', type=int, default=None,
+                                 help='Highest zoom level (default: native resolution of the image)')
+
+    measure_parser = subparsers.add_parser('measure', help='First-paint bytes before and after tiling')
+    measure_parser.add_argument('--viewport', default='390x500', help='Map viewport as WIDTHxHEIGHT')
+
+    args = parser.parse_args()
+
+    if args.command == 'generate':
+        generate(args)
+    elif args.command == 'measure':
+        measure(args)
+    else:
+        parser.print_help()
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,5 @@
 # utils/distance.py
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 def calculate_distance(x1: float, y1: float, x2: float, y2: float) -> float:
     """Calculate Euclidean distance between two points"""
@@ -57,7 +57,8 @@ def estimate_distance_from_rssi(rssi: float, reference_rssi: float = -50,
     
     return distance
 
-def find_nearest_node(x: float, y: float, nodes: Dict) -> Tuple[str, float]:
+def find_nearest_node(x: float, y: float, nodes: Dict, index=None,
+                      type_name: Optional[str] = None) -> Tuple[str, float]:
     """
     Find the node nearest to the given coordinates
     
@@ -65,14 +66,22 @@ def find_nearest_node(x: float, y: float, nodes: Dict) -> Tuple[str, float]:
         x: X coordinate
         y: Y coordinate
         nodes: Dictionary of node objects
+        index: Optional SpatialGrid over the same nodes, used instead of scanning them all
+        type_name: Only consider nodes of this type
         
     Returns:
-        Tuple of (node_id, distance)
+        Tuple of (node_id, distance), or (None, inf) if there is no such node
     """
+    if index is not None:
+        found = index.nearest(x, y, 1, type_name)
+        return found[0] if found else (None, float('inf'))
+
     nearest_id = None
     min_distance = float('inf')
     
     for node_id, node in nodes.items():
+        if type_name is not None and node.type_name != type_name:
+            continue
         dist = calculate_distance(x, y, node.x, node.y)
         if dist < min_distance:
             min_distance = dist
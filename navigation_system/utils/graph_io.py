@@ -0,0 +1,165 @@
+# utils/graph_io.py
+import csv
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+from navigation_system.models.node import NavigationGraph, Node
+from navigation_system.models.routing_graph import RoutingGraph
+from navigation_system.models.csr_graph import CSRGraph, ARRAY_FIELDS, array_layout, typecode
+
+SNAPSHOT_MAGIC = b"NAVGRPH2"
+
+TRUE_VALUES = {"true", "t", "1", "yes", "y"}
+
+def read_table_csv(filename: str) -> List[Dict]:
+    """
+    Read an exported Supabase table (Point, Edge or Keycard Edge Table) from CSV.
+
+    Rows use the same column names as the Supabase tables; the hallway column is
+    converted to a bool so rows can be passed straight to RoutingGraph.
+    """
+    rows = []
+    with open(filename, 'r', newline='') as csvfile:
+        for row in csv.DictReader(csvfile):
+            if 'hallway' in row:
+                row['hallway'] = str(row['hallway']).strip().lower() in TRUE_VALUES
+            rows.append(row)
+    return rows
+
+ID_COLUMNS = ('pointnum', 'pointnum1', 'pointnum2')
+
+def convert_ids(rows: List[Dict], convert) -> List[Dict]:
+    """Rewrite the point id columns of CSV rows (always text) to the type the live tables use"""
+    for row in rows:
+        for column in ID_COLUMNS:
+            if row.get(column) not in (None, ''):
+                row[column] = convert(row[column])
+    return rows
+
+def point_layer(row: Dict) -> int:
+    """Floor of a Point Table row, from its layer column (floor 1 when missing or blank)"""
+    layer = row.get('layer')
+    return int(layer) if layer not in (None, '') else 1
+
+def build_graph(point_rows: Iterable[Dict], edge_rows: Optional[Iterable[Dict]] = None,
+                keycard_edge_rows: Optional[Iterable[Dict]] = None) -> NavigationGraph:
+    """Build a NavigationGraph from Point Table rows and optional edge rows"""
+    graph = NavigationGraph()
+    for data in point_rows:
+        graph.add_node(data['pointnum'], data['type'], point_layer(data), data['x_position'], data['y_position'])
+
+    for rows in (edge_rows or [], keycard_edge_rows or []):
+        for data in rows:
+            try:
+                graph.add_edge(data['pointnum1'], data['pointnum2'])
+            except KeyError:
+                print(f"Warning: Could not add edge between {data['pointnum1']} and {data['pointnum2']} - nodes not found")
+    return graph
+
+def save_graph_snapshot(filename: str, routing_graph: RoutingGraph, tables: Optional[Dict[str, str]] = None) -> None:
+    """
+    Write a routing graph to a binary snapshot: magic, JSON header, then the CSR arrays.
+
+    The header holds the node rows (id, type, layer, x, y) exactly as loaded, the
+    graph version, and `tables`, e.g. digests of the rows the graph was built from so
+    a reader can tell whether the snapshot still matches them. The arrays follow at an
+    8-byte aligned offset in array_layout() order, so the file can be memory-mapped
+    and used in place. It is written to a temporary name and swapped in with
+    os.replace(), so readers never see a partial snapshot.
+    """
+    csr = routing_graph.csr
+    layout, size = array_layout(csr)
+    header = json.dumps({
+        'version': routing_graph.version,
+        'nodes': [[node_id, node.type_name, node.layer, node.x, node.y]
+                  for node_id, node in ((node_id, routing_graph.nodes[node_id]) for node_id in csr.ids)],
+        'layout': layout,
+        'tables': tables or {},
+        'byteorder': sys.byteorder,
+    }).encode()
+    data = bytearray(size)
+    for field, (code, offset, length) in layout.items():
+        values = getattr(csr, field)
+        data[offset:offset + values.itemsize * length] = memoryview(values).cast('B')
+
+    temporary = f"{filename}.{os.getpid()}.tmp"
+    with open(temporary, 'wb') as f:
+        f.write(SNAPSHOT_MAGIC)
+        f.write(struct.pack('<I', len(header)))
+        f.write(header)
+        f.write(bytes(_data_start(len(header)) - f.tell()))
+        f.write(data)
+    os.replace(temporary, filename)
+
+def _data_start(header_length: int) -> int:
+    return -(-(len(SNAPSHOT_MAGIC) + 4 + header_length) // 8) * 8
+
+def read_graph_snapshot(filename: str, mapped: bool = True) -> Optional[Tuple[Dict, CSRGraph]]:
+    """
+    Read the header and CSR arrays of a snapshot written by save_graph_snapshot().
+
+    With mapped, the file is memory-mapped read-only and the arrays are views into it:
+    every process that maps the same file shares one physical copy, and the mapping
+    stays valid after the file is replaced. Otherwise the arrays are private copies.
+
+    Returns:
+        (header, CSRGraph), or None if the file is missing or not a snapshot
+    """
+    if not filename or not os.path.exists(filename):
+        return None
+    try:
+        with open(filename, 'rb') as f:
+            if mapped:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                data = f.read()
+        if data[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            raise ValueError(f"{filename} is not a graph snapshot")
+        header_length, = struct.unpack_from('<I', data, len(SNAPSHOT_MAGIC))
+        start = len(SNAPSHOT_MAGIC) + 4
+        header = json.loads(data[start:start + header_length])
+
+        ids = [row[0] for row in header['nodes']]
+        types = [row[1] for row in header['nodes']]
+        csr = CSRGraph.from_buffer(memoryview(data)[_data_start(header_length):], header['layout'], ids, types,
+                                   version=header['version'])
+        if not mapped or header['byteorder'] != sys.byteorder:
+            # Private arrays; also the only way to fix up a snapshot written on another byte order
+            for field in ARRAY_FIELDS:
+                values = array(typecode(getattr(csr, field)), getattr(csr, field))
+                if header['byteorder'] != sys.byteorder:
+                    values.byteswap()
+                setattr(csr, field, values)
+    except (OSError, ValueError, KeyError, TypeError, struct.error) as e:
+        print(f"Error reading graph snapshot {filename}: {e}")
+        return None
+    return header, csr
+
+def load_graph_snapshot(filename: str, tables: Optional[Dict[str, str]] = None,
+                        mapped: bool = False) -> Optional[Tuple[NavigationGraph, RoutingGraph]]:
+    """
+    Load a snapshot written by save_graph_snapshot() (see read_graph_snapshot for mapped).
+
+    Returns:
+        (NavigationGraph, RoutingGraph with its CSR already attached), or None if the
+        file is missing, unreadable, or was written for different `tables`
+    """
+    snapshot = read_graph_snapshot(filename, mapped)
+    if snapshot is None:
+        return None
+    header, csr = snapshot
+    if tables is not None and any(header['tables'].get(name) != digest for name, digest in tables.items()):
+        return None
+
+    graph = NavigationGraph()
+    graph.nodes = {node_id: Node(node_id, type_name, layer, x, y) for node_id, type_name, layer, x, y in header['nodes']}
+
+    # Connections in the order load_graph_from_csv adds them: regular edges, then keycard ones
+    ids, offsets, targets, weights = csr.ids, csr.offsets, csr.targets, csr.weights
+    for i, node in enumerate(graph.nodes.values()):
+        node.connections = [(ids[targets[k]], weights[k]) for k in range(offsets[i], offsets[i + 1])]
+    return graph, RoutingGraph.from_csr(csr, graph.nodes)
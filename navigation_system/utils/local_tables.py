@@ -0,0 +1,116 @@
+# utils/local_tables.py
+import os
+import threading
+from typing import Dict, List, Optional
+from navigation_system.utils.graph_io import read_table_csv
+
+# Table name -> CSV file name used by from_csv_dir
+TABLE_FILES = {
+    "Point Table": "point_table.csv",
+    "Edge Table": "edge_table.csv",
+    "Keycard Edge Table": "keycard_edge_table.csv",
+    "Room Info Table": "room_info_table.csv",
+}
+
+
+def _sort_key(value):
+    """Numbers before text and in numeric order, like a numeric column would sort"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, value, "")
+    return (1, 0, str(value))
+
+
+class LocalResponse:
+    def __init__(self, data: List[Dict]):
+        self.data = data
+
+
+class LocalQuery:
+    """Subset of the Supabase query builder: select/eq/order/execute plus insert/update/delete"""
+
+    def __init__(self, client: "LocalTableClient", name: str):
+        self.client = client
+        self.name = name
+        self.filters = []
+        self.order_by = None
+        self.action = ('select', None)
+
+    def select(self, *columns) -> "LocalQuery":
+        self.action = ('select', None)
+        return self
+
+    def eq(self, column: str, value) -> "LocalQuery":
+        self.filters.append((column, value))
+        return self
+
+    def order(self, column: str, desc: bool = False) -> "LocalQuery":
+        self.order_by = (column, desc)
+        return self
+
+    def insert(self, row) -> "LocalQuery":
+        self.action = ('insert', row)
+        return self
+
+    def update(self, values: Dict) -> "LocalQuery":
+        self.action = ('update', values)
+        return self
+
+    def delete(self) -> "LocalQuery":
+        self.action = ('delete', None)
+        return self
+
+    def _matches(self, row: Dict) -> bool:
+        return all(str(row.get(column)) == str(value) for column, value in self.filters)
+
+    def execute(self) -> LocalResponse:
+        action, payload = self.action
+        with self.client.lock:
+            rows = self.client.tables.setdefault(self.name, [])
+            if action == 'insert':
+                new_rows = [dict(row) for row in (payload if isinstance(payload, list) else [payload])]
+                rows.extend(new_rows)
+                return LocalResponse([dict(row) for row in new_rows])
+            if action == 'update':
+                matched = [row for row in rows if self._matches(row)]
+                for row in matched:
+                    row.update(payload)
+                return LocalResponse([dict(row) for row in matched])
+            if action == 'delete':
+                matched = [row for row in rows if self._matches(row)]
+                self.client.tables[self.name] = [row for row in rows if not self._matches(row)]
+                return LocalResponse([dict(row) for row in matched])
+
+            matched = [dict(row) for row in rows if self._matches(row)]
+        if self.order_by:
+            column, desc = self.order_by
+            matched.sort(key=lambda row: _sort_key(row.get(column)), reverse=desc)
+        return LocalResponse(matched)
+
+
+class LocalTableClient:
+    """
+    In-process stand-in for the Supabase client's table API.
+
+    Supports the calls this app makes (table/from_ -> select, eq, order, insert, update,
+    delete, execute), so data-loading code can run against local rows in development
+    and tests without network access.
+    """
+
+    def __init__(self, tables: Optional[Dict[str, List[Dict]]] = None):
+        self.tables = {name: [dict(row) for row in rows] for name, rows in (tables or {}).items()}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_csv_dir(cls, directory: str) -> "LocalTableClient":
+        """Load whichever exported table CSVs exist in a directory"""
+        tables = {}
+        for name, filename in TABLE_FILES.items():
+            path = os.path.join(directory, filename)
+            if os.path.exists(path):
+                tables[name] = read_table_csv(path)
+        return cls(tables)
+
+    def table(self, name: str) -> LocalQuery:
+        return LocalQuery(self, name)
+
+    from_ = table
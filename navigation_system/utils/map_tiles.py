@@ -0,0 +1,131 @@
+# utils/map_tiles.py
+import hashlib
+import json
+import math
+import os
+from typing import Dict, List, Optional, Tuple
+
+MANIFEST_NAME = "tiles.json"
+
+def tile_grid(width: int, height: int, zoom: int, tile_size: int = 256) -> Tuple[int, int]:
+    """
+    Number of (columns, rows) of tiles covering a width x height map at a zoom level.
+
+    Maps use Leaflet's CRS.Simple with bounds [[0, 0], [height, width]], so one map unit
+    is 2**zoom pixels. Tiles are aligned to the bottom-left corner of the map.
+    """
+    scale = 2 ** zoom
+    return math.ceil(width * scale / tile_size), math.ceil(height * scale / tile_size)
+
+def native_zoom(image_width: int, width: int) -> int:
+    """Highest zoom level that does not upscale the source image"""
+    return max(0, int(math.floor(math.log2(image_width / width))))
+
+def file_version(filename: str) -> str:
+    """Short content hash used to version tile URLs"""
+    digest = hashlib.sha1()
+    with open(filename, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()[:12]
+
+def generate_tiles(image_path: str, output_dir: str, width: int, height: int,
+                   image_format: str = "webp", quality: int = 80, tile_size: int = 256,
+                   max_zoom: Optional[int] = None) -> Dict:
+    """
+    Cut a map image into a z/x/y tile pyramid for a width x height Leaflet map.
+
+    The image is stretched to the map bounds exactly like L.imageOverlay did. Each zoom
+    level is downsampled from the one above it, and tiles are written to
+    output_dir/{z}/{x}/{y}.{format}, where y counts rows from the top of the grid.
+
+    Returns:
+        The manifest dict, which is also written to output_dir/tiles.json
+    """
+    from PIL import Image
+    Image.MAX_IMAGE_PIXELS = None  # the floor plan is larger than Pillow's bomb limit
+
+    ext = "jpg" if image_format in ("jpeg", "jpg") else image_format
+    pil_format = "JPEG" if ext == "jpg" else image_format.upper()
+
+    source = Image.open(image_path).convert("RGB")
+    if max_zoom is None:
+        max_zoom = native_zoom(source.width, width)
+
+    level = source
+    rows_by_zoom = {}
+    tile_count = 0
+    for zoom in range(max_zoom, -1, -1):
+        scale = 2 ** zoom
+        level = level.resize((width * scale, height * scale), Image.LANCZOS)
+        cols, rows = tile_grid(width, height, zoom, tile_size)
+        rows_by_zoom[zoom] = rows
+
+        # Bottom-align the image on the tile grid so map y=0 falls on a tile edge
+        top = rows * tile_size - level.height
+        for x in range(cols):
+            os.makedirs(os.path.join(output_dir, str(zoom), str(x)), exist_ok=True)
+            for y in range(rows):
+                left, upper = x * tile_size, y * tile_size - top
+                box = (max(left, 0), max(upper, 0),
+                       min(left + tile_size, level.width), min(upper + tile_size, level.height))
+                tile = Image.new("RGB", (tile_size, tile_size), "white")
+                if box[0] < box[2] and box[1] < box[3]:
+                    tile.paste(level.crop(box), (box[0] - left, box[1] - upper))
+                tile.save(os.path.join(output_dir, str(zoom), str(x), f"{y}.{ext}"),
+                          pil_format, quality=quality)
+                tile_count += 1
+
+    manifest = {
+        'width': width,
+        'height': height,
+        'tile_size': tile_size,
+        'min_zoom': 0,
+        'max_zoom': max_zoom,
+        'format': ext,
+        'rows': {str(zoom): rows for zoom, rows in sorted(rows_by_zoom.items())},
+        'tiles': tile_count,
+        'version': file_version(image_path),
+    }
+    with open(os.path.join(output_dir, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def load_manifest(tileset_dir: str) -> Optional[Dict]:
+    """Read a tileset's manifest, or None if the tiles have not been generated"""
+    try:
+        with open(os.path.join(tileset_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def fit_zoom(width: int, height: int, viewport_width: int, viewport_height: int,
+             min_zoom: int = 0) -> int:
+    """Integer zoom Leaflet's fitBounds picks for the whole map in a viewport"""
+    zoom = math.floor(math.log2(min(viewport_width / width, viewport_height / height)))
+    return max(min_zoom, zoom)
+
+def visible_tiles(manifest: Dict, viewport_width: int, viewport_height: int,
+                  zoom: Optional[int] = None) -> List[Tuple[int, int, int]]:
+    """
+    Tiles (z, x, y) on screen after fitBounds in a viewport, centered on the map.
+
+    Leaflet only requests these tiles for the first paint.
+    """
+    width, height, tile_size = manifest['width'], manifest['height'], manifest['tile_size']
+    if zoom is None:
+        zoom = fit_zoom(width, height, viewport_width, viewport_height, manifest['min_zoom'])
+    zoom = min(zoom, manifest['max_zoom'])
+    cols, rows = tile_grid(width, height, zoom, tile_size)
+
+    scale = 2 ** zoom
+    center_x = width * scale / 2
+    center_y = rows * tile_size - height * scale / 2
+    left = max(0, center_x - viewport_width / 2)
+    right = min(width * scale, center_x + viewport_width / 2)
+    top = max(rows * tile_size - height * scale, center_y - viewport_height / 2)
+    bottom = min(rows * tile_size, center_y + viewport_height / 2)
+
+    return [(zoom, x, y)
+            for x in range(int(left // tile_size), min(cols, math.ceil(right / tile_size)))
+            for y in range(int(top // tile_size), min(rows, math.ceil(bottom / tile_size)))]
@@ -0,0 +1,220 @@
+# utils/room_search.py
+import bisect
+import heapq
+import re
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional
+
+from navigation_system.utils.route_cache import RouteCache
+
+# Searchable Room Info columns and how much a match in each counts
+SEARCH_FIELDS = (('room_number', 1.0), ('space_description', 1.0), ('department', 0.6), ('contact', 0.4))
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text) -> str:
+    """Lowercase and reduce to alphanumeric words separated by single spaces"""
+    return " ".join(_TOKEN.findall(str(text).lower())) if text is not None else ""
+
+
+def trigrams(token: str) -> set:
+    """Padded character trigrams, so short tokens and word starts still get some"""
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class RoomSearchIndex:
+    """
+    In-memory search over room numbers, descriptions, departments and contacts.
+
+    Each room is a document of normalized tokens. A query token matches a document
+    token exactly, as a prefix of it (via bisect over the sorted vocabulary), or, for
+    words of 3+ characters, by trigram similarity to tolerate typos. Every query
+    token must match; documents are ranked by the sum of their best match per query
+    token, weighted by field, plus a bonus when a whole field starts with or equals
+    the query. Built once per table version; queries never touch the rows.
+
+    Args:
+        rows: Room Info rows (room_number, space_description, department, contact)
+        room_ids: Room nodes of the graph; when given, exactly these rooms are indexed,
+            with their Room Info row if they have one
+        fuzzy: Minimum trigram similarity (0-1) for a fuzzy token match
+    """
+
+    def __init__(self, rows: Iterable[Dict], room_ids: Optional[Iterable[Hashable]] = None, fuzzy: float = 0.4):
+        self.fuzzy = fuzzy
+        self.rooms: List[Dict] = []
+        self._fields: List[Dict[str, float]] = []  # per document: normalized field text -> weight
+        self._by_number: Dict[str, int] = {}
+        self._by_text: Dict[str, int] = {}  # normalized description or label -> document
+        postings = defaultdict(dict)  # token -> {document: field weight}
+        leads = defaultdict(dict)  # token -> {document: (prefix bonus, whole-field bonus)} of fields it starts
+
+        info = {str(row['room_number']): row for row in rows if row.get('room_number') is not None}
+        for room_number in (info if room_ids is None else map(str, room_ids)):
+            if room_number not in self._by_number:
+                self._add(info.get(room_number, {'room_number': room_number}), postings, leads)
+
+        self.vocabulary = sorted(postings)  # bisect target for prefix lookups
+        self._postings = [postings[token] for token in self.vocabulary]
+        self._leads = [leads.get(token, {}) for token in self.vocabulary]
+        self._trigrams = defaultdict(list)  # trigram -> vocabulary indices
+        self._trigram_counts = []
+        for i, token in enumerate(self.vocabulary):
+            grams = trigrams(token)
+            self._trigram_counts.append(len(grams))
+            for gram in grams:
+                self._trigrams[gram].append(i)
+
+    def __len__(self) -> int:
+        return len(self.rooms)
+
+    def _add(self, row: Dict, postings: Dict, leads: Dict) -> None:
+        document = len(self.rooms)
+        room = {name: (str(row[name]) if row.get(name) is not None else None) for name, _ in SEARCH_FIELDS}
+        room['label'] = f"{room['room_number']} -- {room['space_description']}" \
+            if room['space_description'] else room['room_number']
+        self.rooms.append(room)
+
+        fields = {}
+        for name, weight in SEARCH_FIELDS:
+            text = normalize(room[name])
+            if not text:
+                continue
+            fields[text] = max(weight, fields.get(text, 0.0))
+            tokens = text.split()
+            if name == 'room_number' and len(tokens) > 1:
+                tokens.append("".join(tokens))  # "B-105A" is also found as "b105a"
+            for token in tokens:
+                postings[token][document] = max(weight, postings[token].get(document, 0.0))
+        self._fields.append(fields)
+        # Single-word queries get the whole-field bonus from here instead of comparing every field
+        for text, weight in fields.items():
+            first = text.split()[0]
+            prefix, whole = leads[first].get(document, (0.0, 0.0))
+            leads[first][document] = (prefix + 0.5 * weight, whole + (0.5 * weight if first == text else 0.0))
+        self._by_number[room['room_number']] = document
+        for text in (normalize(room['space_description']), normalize(room['label'])):
+            if text:
+                self._by_text.setdefault(text, document)
+
+    def _token_matches(self, query_token: str) -> Dict[int, float]:
+        """Vocabulary index -> match strength (1 exact, <1 prefix or fuzzy) for one query token"""
+        matches = {}
+        vocabulary = self.vocabulary
+        i = bisect.bisect_left(vocabulary, query_token)
+        while i < len(vocabulary) and vocabulary[i].startswith(query_token):
+            # Prefixes covering more of the token rank higher
+            matches[i] = 1.0 if vocabulary[i] == query_token else 0.5 + 0.4 * len(query_token) / len(vocabulary[i])
+            i += 1
+
+        # A mistyped number is a different room, so only words get fuzzy matches
+        if len(query_token) >= 3 and not query_token.isdigit():
+            grams = trigrams(query_token)
+            shared = defaultdict(int)
+            for gram in grams:
+                for j in self._trigrams.get(gram, ()):
+                    shared[j] += 1
+            for j, count in shared.items():
+                similarity = count / (len(grams) + self._trigram_counts[j] - count)
+                if similarity >= self.fuzzy and j not in matches:
+                    matches[j] = 0.6 * similarity
+        return matches
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """
+        Rooms matching query, best first.
+
+        Returns:
+            Room dicts (room_number, space_description, department, contact, label)
+            with their score
+        """
+        text = normalize(query)
+        if not text or limit <= 0:
+            return []
+        query_tokens = text.split()
+
+        scores = None
+        for query_token in query_tokens:
+            token_scores = {}
+            for i, strength in self._token_matches(query_token).items():
+                for document, weight in self._postings[i].items():
+                    score = strength * weight
+                    if score > token_scores.get(document, 0.0):
+                        token_scores[document] = score
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {document: score + token_scores[document]
+                          for document, score in scores.items() if document in token_scores}
+            if not scores:
+                return []
+
+        # Bonus for fields that start with, or are, the whole query
+        if len(query_tokens) == 1:
+            vocabulary, i = self.vocabulary, bisect.bisect_left(self.vocabulary, text)
+            while i < len(vocabulary) and vocabulary[i].startswith(text):
+                exact = vocabulary[i] == text
+                for document, (prefix, whole) in self._leads[i].items():
+                    scores[document] += prefix + whole if exact else prefix
+                i += 1
+        else:
+            for document in scores:
+                for field, weight in self._fields[document].items():
+                    if field == text:
+                        scores[document] += weight
+                    elif field.startswith(text):
+                        scores[document] += 0.5 * weight
+
+        rooms = self.rooms
+        best = heapq.nsmallest(limit, ((-score, rooms[document]['label'], document)
+                                       for document, score in scores.items()))
+        return [dict(rooms[document], score=round(-score, 3)) for score, _, document in best]
+
+    def resolve(self, text: str) -> Optional[Dict]:
+        """
+        The room text names exactly: a room number, description or "number -- description"
+        label (None otherwise). Fuzzy ranking is left to search(), so a destination is never
+        silently swapped for a merely similar room.
+        """
+        if text is None:
+            return None
+        document = self._by_number.get(str(text).strip())
+        if document is None:
+            document = self._by_text.get(normalize(text))
+        return self.rooms[document] if document is not None else None
+
+
+class RoomSearchStore:
+    """
+    Current RoomSearchIndex plus a cache of its results.
+
+    refresh() swaps in a new index so queries never see a partial one. Autocomplete
+    traffic repeats the same few prefixes ("l", "la", "lab"), so results are cached
+    per normalized query, stamped with the index generation they came from.
+    """
+
+    def __init__(self, fuzzy: float = 0.4, cache_size: int = 4096):
+        self.fuzzy = fuzzy
+        self.cache = RouteCache(maxsize=cache_size)
+        self._state = (RoomSearchIndex([], fuzzy=fuzzy), 0)  # (index, generation), swapped together
+
+    @property
+    def current(self) -> RoomSearchIndex:
+        return self._state[0]
+
+    def refresh(self, rows: Iterable[Dict], room_ids: Optional[Iterable[Hashable]] = None) -> RoomSearchIndex:
+        index = RoomSearchIndex(rows, room_ids, self.fuzzy)
+        self._state = (index, self._state[1] + 1)
+        return index
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """RoomSearchIndex.search on the current index, cached. Treat the result as read-only."""
+        index, generation = self._state
+        key = (normalize(query), limit)
+        results = self.cache.get(key, generation)
+        if results is None:
+            results = index.search(query, limit)
+            self.cache.put(key, generation, results)
+        return results
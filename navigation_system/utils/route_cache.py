@@ -0,0 +1,101 @@
+# utils/route_cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, Optional
+
+
+class RouteCache:
+    """
+    Bounded LRU cache of route responses with an optional TTL.
+
+    Each entry is stamped with the graph version it was computed against; a lookup
+    under a different version is a miss and drops the stale entry. Entries also
+    remember the nodes on their path so changes can invalidate just those routes.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (version, payload, created, nodes)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, version: Optional[str]) -> Optional[Dict]:
+        """Get a cached payload for key computed against version, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_version, payload, created, _ = entry
+                expired = self.ttl is not None and time.monotonic() - created > self.ttl
+                if entry_version == version and not expired:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return payload
+                del self._entries[key]
+                self.invalidations += 1
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, version: Optional[str], payload: Dict,
+            nodes: Iterable = ()) -> None:
+        """Store a payload, evicting the least recently used entries past maxsize"""
+        with self._lock:
+            self._entries[key] = (version, payload, time.monotonic(), frozenset(nodes))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, nodes: Optional[Iterable] = None) -> int:
+        """Drop every entry, or only entries whose path touches one of nodes. Returns the count dropped."""
+        with self._lock:
+            if nodes is None:
+                dropped = list(self._entries)
+            else:
+                nodes = set(nodes)
+                dropped = [key for key, entry in self._entries.items() if not entry[3].isdisjoint(nodes)]
+            for key in dropped:
+                del self._entries[key]
+            self.invalidations += len(dropped)
+            return len(dropped)
+
+    def revalidate(self, old_version: Optional[str], new_version: Optional[str], nodes: Iterable) -> int:
+        """
+        Carry entries over to a new graph version, dropping those whose path touches nodes.
+
+        Only valid when the change cannot make any other route shorter (e.g. edges or
+        nodes were removed). Returns the count dropped.
+        """
+        nodes = set(nodes)
+        with self._lock:
+            dropped = 0
+            for key, (version, payload, created, path_nodes) in list(self._entries.items()):
+                if version != old_version or not path_nodes.isdisjoint(nodes):
+                    del self._entries[key]
+                    dropped += 1
+                else:
+                    self._entries[key] = (new_version, payload, created, path_nodes)
+            self.invalidations += dropped
+            return dropped
+
+    def stats(self) -> Dict:
+        """Hit/miss/eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
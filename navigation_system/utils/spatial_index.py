@@ -0,0 +1,196 @@
+# utils/spatial_index.py
+import heapq
+import math
+import threading
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+class SpatialGrid:
+    """
+    Uniform grid index over node coordinates.
+
+    Nodes are bucketed into square cells of cell_size map units, once for all nodes and
+    once per node type, so type-filtered queries ("nearest room") only visit cells that
+    hold that type. Queries return (node_id, distance) sorted by distance, nearest first.
+    """
+
+    def __init__(self, cell_size: float = 25.0):
+        self.cell_size = float(cell_size)
+        self._points = {}  # node_id -> (x, y, type_name)
+        self._cells = {None: defaultdict(dict)}  # type_name (None = any) -> cell -> {node_id: (x, y)}
+        self._extents = {}  # type_name -> occupied cell bounds, recomputed after changes
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __contains__(self, node_id) -> bool:
+        return node_id in self._points
+
+    @classmethod
+    def from_nodes(cls, nodes: Dict, cell_size: Optional[float] = None) -> "SpatialGrid":
+        """
+        Index a dict of Node objects.
+
+        Without a cell_size, cells are sized to hold about two nodes each on average.
+        """
+        if cell_size is None:
+            cell_size = cls.suggest_cell_size([(float(node.x), float(node.y)) for node in nodes.values()])
+        index = cls(cell_size)
+        # Bulk load: same bookkeeping as insert() without the per-node lock and discard
+        size = index.cell_size
+        for node_id, node in nodes.items():
+            x, y = float(node.x), float(node.y)
+            cell = (math.floor(x / size), math.floor(y / size))
+            index._points[node_id] = (x, y, node.type_name)
+            index._cells[None][cell][node_id] = (x, y)
+            cells = index._cells.get(node.type_name)
+            if cells is None:
+                cells = index._cells[node.type_name] = defaultdict(dict)
+            cells[cell][node_id] = (x, y)
+        return index
+
+    @staticmethod
+    def suggest_cell_size(points: List[Tuple[float, float]], per_cell: float = 2.0) -> float:
+        if len(points) < 2:
+            return 25.0
+        xs, ys = [p[0] for p in points], [p[1] for p in points]
+        area = max(max(xs) - min(xs), 1.0) * max(max(ys) - min(ys), 1.0)
+        return max(math.sqrt(area * per_cell / len(points)), 1.0)
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+
+    def insert(self, node_id: Hashable, x: float, y: float, type_name: Optional[str] = None) -> None:
+        """Add a node, or move it if it is already indexed"""
+        x, y = float(x), float(y)
+        with self._lock:
+            self._discard(node_id)
+            cell = self._cell(x, y)
+            self._points[node_id] = (x, y, type_name)
+            self._cells[None][cell][node_id] = (x, y)
+            self._cells.setdefault(type_name, defaultdict(dict))[cell][node_id] = (x, y)
+            self._extents.clear()
+
+    def remove(self, node_id: Hashable) -> None:
+        with self._lock:
+            self._discard(node_id)
+
+    def _discard(self, node_id: Hashable) -> None:
+        point = self._points.pop(node_id, None)
+        if point is None:
+            return
+        x, y, type_name = point
+        cell = self._cell(x, y)
+        self._extents.clear()
+        for key in (None, type_name):
+            cells = self._cells[key]
+            del cells[cell][node_id]
+            if not cells[cell]:
+                del cells[cell]
+
+    def sync(self, nodes: Dict, node_ids: Iterable) -> None:
+        """Re-index node_ids from the current nodes dict (removing those no longer in it)"""
+        for node_id in node_ids:
+            node = nodes.get(node_id)
+            if node is None:
+                self.remove(node_id)
+            else:
+                self.insert(node_id, node.x, node.y, node.type_name)
+
+    def nearest(self, x: float, y: float, k: int = 1, type_name: Optional[str] = None,
+                max_distance: Optional[float] = None) -> List[Tuple[Hashable, float]]:
+        """
+        The k nodes nearest to (x, y), optionally of one type and within max_distance.
+
+        Searches rings of cells outward from the query cell and stops once no unvisited
+        cell can hold anything closer than the k-th best found so far.
+        """
+        x, y = float(x), float(y)
+        limit = math.inf if max_distance is None else max_distance
+        with self._lock:
+            cells = self._cells.get(type_name)
+            if not cells or k <= 0:
+                return []
+            cx, cy = self._cell(x, y)
+            # Rings past the occupied extent can't add anything
+            if type_name not in self._extents:
+                self._extents[type_name] = self._extent(cells)
+            max_ring = max(max(abs(cell[0] - cx), abs(cell[1] - cy)) for cell in self._extents[type_name])
+
+            best = []  # max-heap of (-distance, node_id) holding the k nearest
+            ring = 0
+            while ring <= max_ring:
+                for cell in self._ring(cx, cy, ring):
+                    for node_id, (px, py) in cells.get(cell, {}).items():
+                        distance = math.hypot(px - x, py - y)
+                        if distance > limit:
+                            continue
+                        if len(best) < k:
+                            heapq.heappush(best, (-distance, node_id))
+                        elif distance < -best[0][0]:
+                            heapq.heapreplace(best, (-distance, node_id))
+
+                # Anything outside the rings searched so far is at least this far away
+                reach = min(x - (cx - ring) * self.cell_size, (cx + ring + 1) * self.cell_size - x,
+                            y - (cy - ring) * self.cell_size, (cy + ring + 1) * self.cell_size - y)
+                bound = -best[0][0] if len(best) == k else limit
+                if reach >= bound:
+                    break
+                ring += 1
+
+        return sorted(((node_id, -negative) for negative, node_id in best), key=lambda item: item[1])
+
+    def within_radius(self, x: float, y: float, radius: float,
+                      type_name: Optional[str] = None) -> List[Tuple[Hashable, float]]:
+        """Every node within radius of (x, y), nearest first"""
+        x, y = float(x), float(y)
+        found = []
+        for node_id, (px, py) in self._scan_box(x - radius, y - radius, x + radius, y + radius, type_name):
+            distance = math.hypot(px - x, py - y)
+            if distance <= radius:
+                found.append((node_id, distance))
+        found.sort(key=lambda item: item[1])
+        return found
+
+    def in_bbox(self, min_x: float, min_y: float, max_x: float, max_y: float,
+                type_name: Optional[str] = None) -> List[Hashable]:
+        """Ids of the nodes inside a bounding box (edges inclusive)"""
+        return [node_id for node_id, (px, py) in self._scan_box(min_x, min_y, max_x, max_y, type_name)
+                if min_x <= px <= max_x and min_y <= py <= max_y]
+
+    def _scan_box(self, min_x: float, min_y: float, max_x: float, max_y: float,
+                  type_name: Optional[str]) -> List[Tuple[Hashable, Tuple[float, float]]]:
+        """Candidates from every cell overlapping the box"""
+        with self._lock:
+            cells = self._cells.get(type_name)
+            if not cells:
+                return []
+            low_x, low_y = self._cell(float(min_x), float(min_y))
+            high_x, high_y = self._cell(float(max_x), float(max_y))
+            if (high_x - low_x + 1) * (high_y - low_y + 1) > len(cells):
+                # Box covers more cells than are occupied; walk the occupied ones instead
+                return [item for cell, members in cells.items()
+                        if low_x <= cell[0] <= high_x and low_y <= cell[1] <= high_y
+                        for item in members.items()]
+            return [item for cx in range(low_x, high_x + 1) for cy in range(low_y, high_y + 1)
+                    for item in cells.get((cx, cy), {}).items()]
+
+    @staticmethod
+    def _extent(cells: Dict) -> List[Tuple[int, int]]:
+        xs = [cell[0] for cell in cells]
+        ys = [cell[1] for cell in cells]
+        return [(min(xs), min(ys)), (max(xs), max(ys))]
+
+    @staticmethod
+    def _ring(cx: int, cy: int, ring: int):
+        if ring == 0:
+            yield cx, cy
+            return
+        for dx in range(-ring, ring + 1):
+            yield cx + dx, cy - ring
+            yield cx + dx, cy + ring
+        for dy in range(-ring + 1, ring):
+            yield cx - ring, cy + dy
+            yield cx + ring, cy + dy
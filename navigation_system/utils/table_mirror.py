@@ -0,0 +1,185 @@
+# utils/table_mirror.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from navigation_system.utils.local_tables import LocalTableClient
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+class LazyClient:
+    """
+    Stand-in for a database client that is only created on first use.
+
+    The factory runs (once, thread-safe) the first time any attribute is accessed, so
+    importing and connecting the client library stays off the startup path when reads
+    are served from a snapshot.
+    """
+
+    def __init__(self, factory: Callable[[], object]):
+        self._factory = factory
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def created(self) -> bool:
+        return self._client is not None
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._factory()
+        return getattr(self._client, name)
+
+
+class TableMirror:
+    """
+    In-memory copy of Supabase tables, persisted to a local SQLite snapshot.
+
+    Reads are served from memory through `local`, a LocalTableClient with the same
+    table API as the Supabase client, so request handlers never wait on the network.
+    The snapshot lets the app start without network access; the tables are then
+    refetched in the background, every interval seconds and whenever
+    request_refresh() is called (e.g. from a database webhook).
+
+    Args:
+        sources: {table name: client to fetch it from} (Supabase or LocalTableClient)
+        path: SQLite snapshot file, or None to keep the mirror in memory only
+        interval: Seconds between background refreshes, 0 to refresh only on request
+    """
+
+    def __init__(self, sources: Dict[str, object], path: Optional[str] = None, interval: float = 0.0):
+        self.sources = dict(sources)
+        self.path = path
+        self.interval = interval
+        self.local = LocalTableClient()
+        self.fetched_at: Dict[str, float] = {}  # table -> time.time() of the rows held
+        self.digests: Dict[str, str] = {}  # table -> sha1 of the rows held, to tie derived caches to them
+        self.listeners: List[Callable[[List[str]], None]] = []
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._refresh_lock = threading.Lock()
+        self._thread = None
+
+    def __contains__(self, table: str) -> bool:
+        return table in self.fetched_at
+
+    def rows(self, table: str) -> List[Dict]:
+        """Current rows of a table. Treat as read-only; a refresh swaps in a new list."""
+        return self.local.tables.get(table, [])
+
+    def load(self) -> bool:
+        """
+        Fill the mirror from the snapshot file.
+
+        Returns:
+            True if every mirrored table was in the snapshot
+        """
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            connection = sqlite3.connect(self.path)
+            try:
+                stored = connection.execute("SELECT name, fetched_at, rows FROM tables").fetchall()
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            print(f"Error reading table snapshot {self.path}: {e}")
+            return False
+
+        for name, fetched_at, rows in stored:
+            if name in self.sources:
+                self._store(name, json.loads(rows), fetched_at, _digest(rows))
+        return all(table in self for table in self.sources)
+
+    def save(self) -> None:
+        """Write every mirrored table to the snapshot file (atomically replaced)"""
+        if not self.path:
+            return
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        with sqlite3.connect(temporary) as connection:
+            connection.execute("CREATE TABLE tables (name TEXT PRIMARY KEY, fetched_at REAL, rows TEXT)")
+            connection.executemany(
+                "INSERT INTO tables VALUES (?, ?, ?)",
+                [(name, self.fetched_at[name], json.dumps(self.rows(name))) for name in self.fetched_at])
+        connection.close()
+        os.replace(temporary, self.path)
+
+    def refresh(self, tables: Optional[Iterable[str]] = None, notify: bool = True) -> List[str]:
+        """
+        Refetch tables (all by default) and save the snapshot if anything changed.
+
+        Returns:
+            Names of the tables whose rows changed; listeners are called with them
+            unless notify is False
+        """
+        with self._refresh_lock:
+            changed = []
+            for name in (self.sources if tables is None else tables):
+                rows = self.sources[name].table(name).select("*").execute().data
+                if rows != self.local.tables.get(name):
+                    changed.append(name)
+                    self._store(name, rows, time.time(), _digest(json.dumps(rows)))
+                else:
+                    self.fetched_at[name] = time.time()
+            if changed:
+                self.save()
+
+        if changed and notify:
+            for listener in self.listeners:
+                listener(changed)
+        return changed
+
+    def _store(self, name: str, rows: List[Dict], fetched_at: float, digest: str) -> None:
+        with self.local.lock:
+            self.local.tables[name] = rows
+        self.fetched_at[name] = fetched_at
+        self.digests[name] = digest
+
+    def request_refresh(self, tables: Optional[Iterable[str]] = None) -> None:
+        """Ask the background thread to refetch tables (all by default) as soon as it can"""
+        with self._pending_lock:
+            self._pending.update(self.sources if tables is None else [t for t in tables if t in self.sources])
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.interval or None)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            with self._pending_lock:
+                tables, self._pending = (self._pending or set(self.sources)), set()
+            try:
+                changed = self.refresh(tables)
+                if changed:
+                    print(f"Refreshed tables: {', '.join(changed)}")
+            except Exception as e:
+                print(f"Error refreshing tables: {e}")
+
+    def start(self) -> None:
+        """Refresh in a background daemon thread, on the interval and on request_refresh()"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="table-mirror", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,29 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from navigation_system.algorithms.batch import normalize_pairs
+
+
+def test_normalize_pairs_accepts_lists_and_objects():
+    assert normalize_pairs([['1', '2'], ('3', 4), {'start': '5', 'end': '6'}]) == [('1', '2'), ('3', 4), ('5', '6')]
+
+
+@pytest.mark.parametrize("pair", [
+    ['1'],
+    ['1', '2', '3'],
+    '12',
+    7,
+    None,
+    {'start': '1'},
+    {'end': '2'},
+    [None, '2'],
+    [['1'], '2'],
+    {'start': {'id': '1'}, 'end': '2'},
+])
+def test_normalize_pairs_rejects_malformed_pairs(pair):
+    with pytest.raises(ValueError):
+        normalize_pairs([['1', '2'], pair])
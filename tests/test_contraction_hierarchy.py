@@ -0,0 +1,30 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from navigation_system.algorithms.contraction_hierarchy import ContractionHierarchy
+from navigation_system.models.routing_graph import RoutingGraph
+from navigation_system.utils.graph_io import build_graph, convert_ids
+
+
+def csr(convert=str):
+    points = [{'pointnum': str(i), 'type': 'point', 'x_position': 10 * i, 'y_position': 0} for i in range(1, 5)]
+    edges = [{'pointnum1': str(i), 'pointnum2': str(i + 1), 'hallway': True} for i in range(1, 4)]
+    return RoutingGraph(build_graph(convert_ids(points, convert)), convert_ids(edges, convert)).csr
+
+
+def test_saved_hierarchy_keeps_its_id_type(tmp_path):
+    filename = str(tmp_path / "contraction_hierarchy.bin")
+    ContractionHierarchy.build(csr(int)).save(filename)
+    hierarchy = ContractionHierarchy.load(filename)
+    assert hierarchy.id_type == 'int'
+    assert hierarchy.lookup(1, 4) == [1, 2, 3, 4]
+
+
+def test_hierarchy_only_matches_a_graph_with_the_same_id_type():
+    text_graph, int_graph = csr(str), csr(int)
+    assert text_graph.version == int_graph.version
+    hierarchy = ContractionHierarchy.build(text_graph)
+    assert hierarchy.matches(text_graph)
+    assert not hierarchy.matches(int_graph)
@@ -0,0 +1,64 @@
+import os
+import sys
+import threading
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from navigation_system.models.fingerprint_index import StrongestAPIndex
+from navigation_system.models.fingerprint_store import FingerprintStore
+
+
+def fingerprint(i):
+    # Every point hears a shared AP plus two of its own, so each add grows both axes
+    return {'ap:shared': -50.0 - i % 10, f'ap:{i}:a': -40.0, f'ap:{i}:b': -60.0}
+
+
+def test_held_matrix_is_unchanged_by_later_writes():
+    store = FingerprintStore.from_fingerprints({i: fingerprint(i) for i in range(3)})
+    matrix = store.current
+    rssi = matrix.rssi.copy()
+    store.add(1, {'ap:shared': -30.0})
+    store.add(3, fingerprint(3))
+    store.remove(0)
+    assert len(matrix) == 3 and matrix.node_ids == [0, 1, 2]
+    assert np.array_equal(matrix.rssi, rssi)
+    assert store.node_ids == [1, 2, 3]
+    assert store.scores({'ap:shared': -30.0}, store.rows([1]), missing=-95.0)[0] < 40.0
+
+
+def test_readers_never_see_a_half_written_store():
+    store = FingerprintStore.from_fingerprints({i: fingerprint(i) for i in range(5)})
+    index = StrongestAPIndex(store)
+    errors = []
+    done = threading.Event()
+
+    def read():
+        try:
+            while not done.is_set():
+                scan = fingerprint(3)
+                assert store.scores_batch([scan]).shape[1] >= 5
+                assert store.locate(scan, threshold=float('inf'), index=index) is not None
+                matrix = store.current
+                assert np.isfinite(matrix.scores(scan, matrix.rows([3]), missing=-95.0)).all()
+        except Exception as e:  # reported by the main thread
+            errors.append(e)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    expected = set(range(5))
+    for i in range(5, 300):
+        store.add(i, fingerprint(i))
+        expected.add(i)
+        if i % 7 == 0:
+            store.remove(i - 1)
+            expected.discard(i - 1)
+    done.set()
+    for reader in readers:
+        reader.join()
+
+    assert errors == []
+    assert set(store.node_ids) == expected
+    assert store.rssi.shape == (len(store), len(store.bssid_index))
@@ -0,0 +1,92 @@
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from navigation_system.algorithms.pathfinding import a_star
+from navigation_system.models.graph_updates import GraphUpdater, EDGE_TABLE, KEYCARD_EDGE_TABLE, POINT_TABLE
+from navigation_system.models.routing_graph import RoutingGraphStore
+from navigation_system.utils.graph_io import build_graph
+
+POINTS = [{'pointnum': str(i), 'type': 'point', 'x_position': 10 * i, 'y_position': 0} for i in range(1, 4)]
+
+
+def updater(edges, keycard_edges=()):
+    graph = build_graph(POINTS, edges, keycard_edges)
+    store = RoutingGraphStore(graph)
+    store.refresh(edges, keycard_edges)
+    return GraphUpdater(graph, store, None, POINTS, edges, keycard_edges)
+
+
+def connections(graph, a, b):
+    return [neighbor_id for neighbor_id, _ in graph.nodes[a].connections if neighbor_id == b]
+
+
+def test_deleting_an_edge_row_keeps_the_keycard_connection():
+    edge = {'pointnum1': '1', 'pointnum2': '2', 'hallway': True}
+    keycard_edge = {'pointnum1': '1', 'pointnum2': '2', 'hallway': False}
+    graph_updater = updater([edge], [keycard_edge])
+
+    graph_updater.sync({EDGE_TABLE: []})
+    assert connections(graph_updater.graph, '1', '2')
+    assert graph_updater.store.current.edge('1', '2', has_keycard=True) is not None
+    assert graph_updater.store.current.edge('1', '2') is None
+
+    graph_updater.sync({KEYCARD_EDGE_TABLE: []})
+    assert not connections(graph_updater.graph, '1', '2')
+
+
+def test_inserting_a_row_for_a_connected_pair_adds_no_second_connection():
+    graph_updater = updater([{'pointnum1': '1', 'pointnum2': '2', 'hallway': True}])
+    graph_updater.sync({KEYCARD_EDGE_TABLE: [{'pointnum1': '2', 'pointnum2': '1', 'hallway': False}]})
+    assert len(connections(graph_updater.graph, '1', '2')) == 1
+
+
+def test_concurrent_syncs_apply_a_change_once():
+    graph_updater = updater([{'pointnum1': '1', 'pointnum2': '2', 'hallway': True}])
+    tables = {
+        POINT_TABLE: POINTS,
+        EDGE_TABLE: [{'pointnum1': '1', 'pointnum2': '2', 'hallway': True},
+                     {'pointnum1': '2', 'pointnum2': '3', 'hallway': True}],
+    }
+    applied = []
+    start = threading.Barrier(8)
+
+    def sync():
+        start.wait()
+        applied.append(len(graph_updater.sync(tables)))
+
+    threads = [threading.Thread(target=sync) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(applied) == [0] * 7 + [1]
+    assert len(connections(graph_updater.graph, '2', '3')) == 1
+    assert graph_updater.sync(tables) == []
+
+
+def test_snapshot_is_published_before_the_live_nodes_change():
+    edges = [{'pointnum1': '1', 'pointnum2': '2', 'hallway': True},
+             {'pointnum1': '2', 'pointnum2': '3', 'hallway': True}]
+    graph_updater = updater(edges)
+    old = graph_updater.store.current
+    published = []
+    publish = graph_updater.store.publish
+
+    def record(routing_graph):
+        # A request that already sees the new nodes must find a snapshot that has them
+        published.append('3' in graph_updater.graph.nodes)
+        publish(routing_graph)
+
+    graph_updater.store.publish = record
+    graph_updater.sync({POINT_TABLE: POINTS[:2]})
+    assert published == [True]
+    assert '3' not in graph_updater.graph.nodes and '3' not in graph_updater.store.current
+
+    # A request still holding the old snapshot routes and describes its path from it alone
+    path = a_star(graph_updater.store.router(old), '1', '3')
+    assert path == ['1', '2', '3']
+    assert [old.nodes[node_id].x for node_id in path] == [10, 20, 30]
@@ -0,0 +1,189 @@
+import heapq
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from navigation_system.algorithms.pathfinding import a_star, bidirectional_a_star
+from navigation_system.models.cluster_hierarchy import ClusterHierarchy
+from navigation_system.models.landmarks import Landmarks
+from navigation_system.models.node import FLOOR_CHANGE_COSTS
+from navigation_system.models.routing_graph import RoutingGraph
+from navigation_system.utils.graph_io import build_graph
+
+PROFILES = [(True, False), (True, True), (False, False), (False, True)]  # (prefer_hallways, has_keycard)
+BACKENDS = ["graph", "csr", "floors", "hierarchical", "bidirectional", "alt"]
+
+
+def routing_graph(points, edges, keycard_edges=()):
+    return RoutingGraph(build_graph(points), edges, list(keycard_edges))
+
+
+def search(backend, graph, cluster_size=100.0):
+    """A route function over one backend: (start_id, goal_id, prefer_hallways, has_keycard) -> path"""
+    csr = graph.csr
+    router = {
+        "graph": graph,
+        "csr": csr,
+        "floors": csr.floors,
+        "hierarchical": ClusterHierarchy(csr, cluster_size),
+        "alt": Landmarks(csr, 4),
+    }.get(backend)
+    if backend == "bidirectional":
+        return lambda s, e, prefer_hallways, has_keycard: bidirectional_a_star(
+            csr, s, e, prefer_hallways=prefer_hallways, has_keycard=has_keycard)
+    return lambda s, e, prefer_hallways, has_keycard: a_star(
+        router, s, e, prefer_hallways=prefer_hallways, has_keycard=has_keycard)
+
+
+def reference_route_cost(graph, start_id, goal_id, prefer_hallways, has_keycard):
+    """Textbook Dijkstra over RoutingGraph adjacency, sharing no code with the searches"""
+    best = {start_id: (0, 0.0)}
+    settled = set()
+    heap = [((0, 0.0), start_id)]
+    while heap:
+        cost, node_id = heapq.heappop(heap)
+        if node_id in settled:
+            continue
+        settled.add(node_id)
+        if node_id == goal_id:
+            return cost
+        for neighbor_id, weight, hallway in graph.neighbors(node_id, has_keycard):
+            new_cost = (cost[0] + (1 if prefer_hallways and not hallway else 0), cost[1] + weight)
+            if neighbor_id not in settled and (neighbor_id not in best or new_cost < best[neighbor_id]):
+                best[neighbor_id] = new_cost
+                heapq.heappush(heap, (new_cost, neighbor_id))
+    return None
+
+
+def route_cost(graph, path, prefer_hallways, has_keycard):
+    """(non_hallway_count, distance) of a path; fails if consecutive nodes are not joined by a usable edge"""
+    non_hallway, distance = 0, 0.0
+    for a, b in zip(path, path[1:]):
+        edge = graph.edge(a, b, has_keycard)
+        assert edge is not None, f"no usable edge {a} -> {b}"
+        weight, hallway = edge
+        non_hallway += 1 if prefer_hallways and not hallway else 0
+        distance += weight
+    return non_hallway, distance
+
+
+def random_tables(rng, points=80, floors=2, size=400.0):
+    """
+    Point/Edge/Keycard Edge rows of a random graph.
+
+    Points (some stairs and elevators) are scattered over the floors and joined to
+    some of their nearest neighbours on the same floor, as hallways or not, a few
+    through keycard doors and a few to a point on another floor, so the graph has
+    dead ends, detours, floor changes and usually some unreachable points.
+    """
+    rows = [{'pointnum': str(i), 'type': rng.choice(['room', 'point', 'point', 'stairs', 'elevator']),
+             'x_position': rng.uniform(0, size), 'y_position': rng.uniform(0, size * 2 / 3),
+             'layer': rng.randint(1, floors)} for i in range(points)]
+    edges, keycard_edges, joined = [], [], set()
+
+    def join(i, j, hallway):
+        if i != j and (min(i, j), max(i, j)) not in joined:
+            joined.add((min(i, j), max(i, j)))
+            table = keycard_edges if rng.random() < 0.15 else edges
+            table.append({'pointnum1': str(i), 'pointnum2': str(j), 'hallway': hallway})
+
+    for i, row in enumerate(rows):
+        nearest = sorted((j for j, other in enumerate(rows) if other['layer'] == row['layer'] and j != i),
+                         key=lambda j: (rows[j]['x_position'] - row['x_position']) ** 2 +
+                                       (rows[j]['y_position'] - row['y_position']) ** 2)
+        for j in nearest[:rng.randint(0, 3)]:
+            join(i, j, rng.random() < 0.5)
+        if rng.random() < 0.08:
+            join(i, rng.randrange(points), True)
+    return rows, edges, keycard_edges
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_routes_match_reference_dijkstra(seed):
+    rng = random.Random(seed)
+    graph = routing_graph(*random_tables(rng, floors=rng.randint(1, 3)))
+    searches = {backend: search(backend, graph, rng.choice([50.0, 100.0, 200.0])) for backend in BACKENDS}
+    node_ids = list(graph.nodes)
+    for _ in range(60):
+        start_id = rng.choice(node_ids)
+        goal_id = start_id if rng.random() < 0.05 else rng.choice(node_ids)
+        for prefer_hallways, has_keycard in PROFILES:
+            expected = reference_route_cost(graph, start_id, goal_id, prefer_hallways, has_keycard)
+            for backend, route in searches.items():
+                path = route(start_id, goal_id, prefer_hallways, has_keycard)
+                context = (backend, start_id, goal_id, prefer_hallways, has_keycard)
+                if expected is None:
+                    assert path == [], context
+                    continue
+                assert path[0] == start_id and path[-1] == goal_id, context
+                non_hallway, distance = route_cost(graph, path, prefer_hallways, has_keycard)
+                assert non_hallway == expected[0], context
+                assert distance == pytest.approx(expected[1], abs=1e-6), context
+
+
+# A corridor (hallway edges 1-2-3-4) and a shortcut through room 5 (non-hallway edges 1-5-4)
+DETOUR_POINTS = [
+    {'pointnum': '1', 'type': 'point', 'x_position': 0, 'y_position': 0},
+    {'pointnum': '2', 'type': 'point', 'x_position': 0, 'y_position': 30},
+    {'pointnum': '3', 'type': 'point', 'x_position': 40, 'y_position': 30},
+    {'pointnum': '4', 'type': 'point', 'x_position': 40, 'y_position': 0},
+    {'pointnum': '5', 'type': 'room', 'x_position': 20, 'y_position': 0},
+]
+DETOUR_EDGES = [
+    {'pointnum1': '1', 'pointnum2': '2', 'hallway': True},
+    {'pointnum1': '2', 'pointnum2': '3', 'hallway': True},
+    {'pointnum1': '3', 'pointnum2': '4', 'hallway': True},
+]
+SHORTCUT = [
+    {'pointnum1': '1', 'pointnum2': '5', 'hallway': False},
+    {'pointnum1': '5', 'pointnum2': '4', 'hallway': False},
+]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_prefer_hallways_is_lexicographic(backend):
+    graph = routing_graph(DETOUR_POINTS, DETOUR_EDGES + SHORTCUT)
+    route = search(backend, graph)
+    # Fewest non-hallway edges first, however much longer the walk ...
+    assert route('1', '4', True, False) == ['1', '2', '3', '4']
+    # ... and plain distance when hallways are not preferred
+    assert route('1', '4', False, False) == ['1', '5', '4']
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_keycard_edges_need_a_keycard(backend):
+    graph = routing_graph(DETOUR_POINTS, DETOUR_EDGES, SHORTCUT)
+    route = search(backend, graph)
+    assert route('1', '4', False, False) == ['1', '2', '3', '4']
+    assert route('1', '4', False, True) == ['1', '5', '4']
+    # Room 5 opens only through keycard doors
+    assert route('1', '5', True, False) == []
+    assert route('1', '5', True, True) == ['1', '5']
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_floor_changes_cost_their_connector(backend):
+    # Two floors joined by stairs at x=0 and an elevator at x=15; the goal is above the elevator
+    points, edges = [], []
+    for layer in (1, 2):
+        for pointnum, type_name, x in ((f'{layer}0', 'stairs', 0), (f'{layer}1', 'elevator', 15)):
+            points.append({'pointnum': pointnum, 'type': type_name, 'x_position': x, 'y_position': 0,
+                           'layer': layer})
+        edges.append({'pointnum1': f'{layer}0', 'pointnum2': f'{layer}1', 'hallway': True})
+    edges += [{'pointnum1': '10', 'pointnum2': '20', 'hallway': True},
+              {'pointnum1': '11', 'pointnum2': '21', 'hallway': True}]
+    graph = routing_graph(points, edges)
+    route = search(backend, graph)
+
+    # Stairs and a 15 ft walk upstairs beat walking to the elevator
+    path = route('10', '21', True, False)
+    assert path == ['10', '20', '21']
+    assert route_cost(graph, path, True, False)[1] == pytest.approx(FLOOR_CHANGE_COSTS['stairs'] + 15)
+    # From the elevator, walking over to the stairs costs more than the ride
+    path = route('11', '21', True, False)
+    assert path == ['11', '21']
+    assert route_cost(graph, path, True, False)[1] == pytest.approx(FLOOR_CHANGE_COSTS['elevator'])
@@ -0,0 +1,53 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from navigation_system.models.fingerprint_store import FingerprintStore
+from navigation_system.models.position_tracker import PositionTracker
+from navigation_system.models.routing_graph import RoutingGraphStore
+from navigation_system.utils.graph_io import build_graph
+
+POINTS = [{'pointnum': str(i), 'type': 'point', 'x_position': 10 * i, 'y_position': 0} for i in range(1, 5)]
+EDGES = [{'pointnum1': str(i), 'pointnum2': str(i + 1), 'hallway': True} for i in range(1, 4)]
+BSSIDS = [f"ap:{i:02d}" for i in range(60)]
+
+
+def tracker(fingerprints):
+    store = RoutingGraphStore(build_graph(POINTS))
+    store.refresh(EDGES)
+    return PositionTracker(FingerprintStore.from_fingerprints(fingerprints), store, seed=0)
+
+
+def fingerprint(level):
+    return {bssid: level - i % 7 for i, bssid in enumerate(BSSIDS)}
+
+
+def test_likelihood_scales_the_best_finite_score_to_one():
+    position_tracker = tracker({'1': fingerprint(-40.0)})
+    likelihood = position_tracker._likelihood(fingerprint(-75.0), np.array([35.0, 36.0, np.inf]))
+    assert likelihood[0] == 1.0
+    assert 0.0 <= likelihood[1] < 1.0
+    assert likelihood[2] == 0.0
+
+
+def test_update_locates_a_scan_far_from_every_fingerprint():
+    # 60 APs about 35 dB off every fingerprint: exp(-0.5 * 60 * (35 / 6) ** 2) underflows
+    position_tracker = tracker({'1': fingerprint(-30.0), '4': fingerprint(-20.0)})
+    estimate = position_tracker.update(fingerprint(-65.0))
+    assert estimate is not None
+    assert estimate['node_id'] == '1'
+
+    # Still lost on the next scans: the relocation path restarts instead of giving up
+    for _ in range(3):
+        estimate = position_tracker.update(fingerprint(-65.0))
+        assert estimate is not None
+
+
+def test_update_follows_a_matching_scan():
+    position_tracker = tracker({'1': fingerprint(-40.0), '4': fingerprint(-80.0)})
+    estimate = position_tracker.update(fingerprint(-81.0))
+    assert estimate['node_id'] == '4'
+    assert estimate['scans'] == 1
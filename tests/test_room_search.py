@@ -0,0 +1,26 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from navigation_system.utils.room_search import RoomSearchIndex
+
+ROWS = [
+    {'room_number': '101', 'space_description': 'Chemistry Lab', 'department': 'Chemistry', 'contact': 'Ada'},
+    {'room_number': '102', 'space_description': 'Lecture Hall', 'department': 'Physics', 'contact': 'Bo'},
+]
+
+
+def test_resolve_accepts_exact_numbers_descriptions_and_labels():
+    index = RoomSearchIndex(ROWS)
+    assert index.resolve('101')['room_number'] == '101'
+    assert index.resolve('  lecture HALL ')['room_number'] == '102'
+    assert index.resolve('101 -- Chemistry Lab')['room_number'] == '101'
+
+
+def test_resolve_leaves_near_misses_to_search():
+    index = RoomSearchIndex(ROWS)
+    for text in ('Chemstry Lab', 'lab', 'Physics', 'something else entirely', '', None):
+        assert index.resolve(text) is None, text
+    # The typo still ranks the lab first in autocomplete
+    assert index.search('Chemstry Lab')[0]['room_number'] == '101'
@@ -0,0 +1,53 @@
+import json
+import os
+import struct
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from navigation_system.algorithms.route_table import MAGIC, RouteTable
+from navigation_system.models.routing_graph import RoutingGraph
+from navigation_system.utils.graph_io import build_graph
+
+
+def csr(convert=str):
+    points = [{'pointnum': convert(i), 'type': 'point', 'x_position': 10 * i, 'y_position': 0} for i in range(1, 4)]
+    edges = [{'pointnum1': convert(i), 'pointnum2': convert(i + 1), 'hallway': True} for i in range(1, 3)]
+    return RoutingGraph(build_graph(points), edges).csr
+
+
+def test_saved_table_keeps_its_id_type(tmp_path):
+    filename = str(tmp_path / "route_table.bin")
+    RouteTable.build(csr(int)).save(filename)
+    table = RouteTable.load(filename)
+    assert table.id_type == 'int'
+    assert table.lookup(1, 3) == [1, 2, 3]
+
+
+def test_table_only_matches_a_graph_with_the_same_id_type():
+    text_graph, int_graph = csr(str), csr(int)
+    # Versions compare ids as text, so they cannot tell the two graphs apart ...
+    assert text_graph.version == int_graph.version
+    table = RouteTable.build(text_graph)
+    assert table.matches(text_graph)
+    # ... but the table's ids never find the other graph's nodes
+    assert table.lookup(1, 3) is None
+    assert not table.matches(int_graph)
+
+
+def test_load_rejects_a_header_that_disagrees_with_its_ids(tmp_path):
+    filename = str(tmp_path / "route_table.bin")
+    RouteTable.build(csr(str)).save(filename)
+    with open(filename, 'rb') as f:
+        data = f.read()
+    header_length, = struct.unpack_from('<I', data, len(MAGIC))
+    start = len(MAGIC) + 4
+    header = json.loads(data[start:start + header_length])
+    header['id_type'] = 'int'
+    patched = json.dumps(header).encode()
+    with open(filename, 'wb') as f:
+        f.write(MAGIC + struct.pack('<I', len(patched)) + patched + data[start + header_length:])
+    with pytest.raises(ValueError):
+        RouteTable.load(filename)